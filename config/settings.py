@@ -12,6 +12,7 @@ class AzureOpenAIConfig:
     API_VERSION = os.getenv("AZURE_OPENAI_API_VERSION", "2024-05-01-preview")
     ENDPOINT = os.getenv("AZURE_OPENAI_ENDPOINT")
     DEPLOYMENT = os.getenv("AZURE_OPENAI_DEPLOYMENT", "gpt-4o")
+    DEPLOYMENTS = os.getenv("AZURE_OPENAI_DEPLOYMENTS", "")  # JSON list (or file) of deployments to balance across
     
     @classmethod
     def validate(cls):
@@ -30,12 +31,139 @@ class AzureOpenAIConfig:
 class AppConfig:
     """Application configuration."""
     
+    # Extraction settings
+    EXTRACTION_MODE = os.getenv("EXTRACTION_MODE", "document")  # "document" or "page"
+    EXTRACTION_PREFLIGHT = os.getenv("EXTRACTION_PREFLIGHT", "true").lower() == "true"  # probe PDFs before extracting
+    UNSTRUCTURED_STRATEGY = os.getenv("UNSTRUCTURED_STRATEGY", "auto")  # "auto", "fast", "hi_res" or "ocr_only"
+    UNSTRUCTURED_WORKERS = int(os.getenv("UNSTRUCTURED_WORKERS", os.cpu_count() or 1))  # 1 disables the process pool
+    UNSTRUCTURED_PAGES_PER_RANGE = int(os.getenv("UNSTRUCTURED_PAGES_PER_RANGE", "20"))  # pages per pool task
+    
+    # Extraction cache
+    EXTRACTION_CACHE_ENABLED = os.getenv("EXTRACTION_CACHE_ENABLED", "true").lower() == "true"
+    EXTRACTION_CACHE_DIR = os.getenv(
+        "EXTRACTION_CACHE_DIR",
+        os.path.join(os.path.expanduser("~"), ".cache", "doc_summarizer", "extraction"),
+    )
+    EXTRACTION_CACHE_MAX_MB = int(os.getenv("EXTRACTION_CACHE_MAX_MB", "1024"))
+    
     # OCR settings
     OCR_MIN_TEXT_LENGTH = 500
+    OCR_MIN_PAGE_TEXT_LENGTH = int(os.getenv("OCR_MIN_PAGE_TEXT_LENGTH", "100"))  # "page" mode only
+    OCR_WORKERS = int(os.getenv("OCR_WORKERS", os.cpu_count() or 1))  # 1 disables the process pool
+    OCR_PAGE_FAILURE_POLICY = os.getenv("OCR_PAGE_FAILURE_POLICY", "skip")  # "skip" or "fail"
+    OCR_LANGUAGE = os.getenv("OCR_LANGUAGE", "eng")  # tesseract language codes, e.g. "eng+fra"
+    OCR_BACKEND = os.getenv("OCR_BACKEND", "auto")  # "auto", "tesserocr" or "pytesseract"
+    OCR_DPI = int(os.getenv("OCR_DPI", "150"))
+    OCR_GRAYSCALE = os.getenv("OCR_GRAYSCALE", "true").lower() == "true"
+    OCR_MAX_MEMORY_MB = int(os.getenv("OCR_MAX_MEMORY_MB", "512"))  # budget for rendered pages held at once
+    OCR_PREPROCESS = os.getenv("OCR_PREPROCESS", "true").lower() == "true"  # false OCRs pages as rendered
+    OCR_DESKEW = os.getenv("OCR_DESKEW", "true").lower() == "true"
+    OCR_BINARIZE = os.getenv("OCR_BINARIZE", "true").lower() == "true"
+    OCR_CROP_MARGINS = os.getenv("OCR_CROP_MARGINS", "true").lower() == "true"
+    OCR_BLANK_INK_RATIO = float(os.getenv("OCR_BLANK_INK_RATIO", "0.0005"))  # 0 never skips blank pages
+    OCR_MIN_CONFIDENCE = float(os.getenv("OCR_MIN_CONFIDENCE", "60"))  # re-render below this; 0 disables
+    OCR_RETRY_DPI = int(os.getenv("OCR_RETRY_DPI", "300"))  # DPI for re-rendering low-confidence pages
     
     # Summarization settings
     SUMMARY_TEMPERATURE = 0.5
     SUMMARY_MAX_TOKENS = 1500
+    SUMMARY_MODE = os.getenv("SUMMARY_MODE", "auto")  # "auto", "single" or "chunked"
+    SUMMARY_MAX_INPUT_TOKENS = int(os.getenv("SUMMARY_MAX_INPUT_TOKENS", "100000"))  # "auto" chunks above this
+    SUMMARY_CHUNK_TOKENS = int(os.getenv("SUMMARY_CHUNK_TOKENS", "8000"))
+    SUMMARY_CHUNK_MAX_TOKENS = int(os.getenv("SUMMARY_CHUNK_MAX_TOKENS", "600"))  # output budget per chunk summary
+    SUMMARY_CHUNK_CONCURRENCY = int(os.getenv("SUMMARY_CHUNK_CONCURRENCY", "4"))
+    SUMMARY_STREAM = os.getenv("SUMMARY_STREAM", "false").lower() == "true"  # print summaries as they are generated
+    
+    # Text normalization before summarizing
+    TEXT_NORMALIZATION = os.getenv("TEXT_NORMALIZATION", "true").lower() == "true"
+    NORMALIZE_MIN_REPEATS = int(os.getenv("NORMALIZE_MIN_REPEATS", "3"))  # repeats that make a line boilerplate
+    NORMALIZE_DEDUPE_SIMILARITY = float(os.getenv("NORMALIZE_DEDUPE_SIMILARITY", "0.9"))  # 1 drops exact repeats only
+    
+    # Incremental summarization (summary tree)
+    SUMMARY_INCREMENTAL = os.getenv("SUMMARY_INCREMENTAL", "false").lower() == "true"  # like --incremental
+    SUMMARY_TREE_PATH = os.getenv(
+        "SUMMARY_TREE_PATH",
+        os.path.join(os.path.expanduser("~"), ".cache", "doc_summarizer", "summary_tree.sqlite3"),
+    )
+    SUMMARY_SECTION_MIN_TOKENS = int(os.getenv("SUMMARY_SECTION_MIN_TOKENS", "2000"))  # sections end past this size
+    SUMMARY_TREE_MAX_AGE_DAYS = int(os.getenv("SUMMARY_TREE_MAX_AGE_DAYS", "180"))  # unused pages/summaries expire
+    
+    # Preview mode (--preview)
+    PREVIEW_MAX_SECONDS = float(os.getenv("PREVIEW_MAX_SECONDS", "30"))  # wall-clock budget; 0 = none
+    PREVIEW_MAX_TOKENS = int(os.getenv("PREVIEW_MAX_TOKENS", "20000"))  # budget for the excerpts; 0 = none
+    PREVIEW_EXTRACTION_SHARE = float(os.getenv("PREVIEW_EXTRACTION_SHARE", "0.6"))  # the rest is left for the LLM
+    PREVIEW_FRONT_PAGES = int(os.getenv("PREVIEW_FRONT_PAGES", "3"))  # always read first
+    PREVIEW_TABLE_MIN_RECTS = int(os.getenv("PREVIEW_TABLE_MIN_RECTS", "100"))  # rectangles that make a table page
+    PREVIEW_OCR_PAGE_TOKENS = int(os.getenv("PREVIEW_OCR_PAGE_TOKENS", "500"))  # estimate for pages needing OCR
+    PREVIEW_BATCH_PAGES = int(os.getenv("PREVIEW_BATCH_PAGES", "8"))  # pages extracted between budget checks
+    
+    # Rate limiting and retries (0 disables a limit)
+    RATE_LIMIT_REQUESTS_PER_MINUTE = int(os.getenv("RATE_LIMIT_REQUESTS_PER_MINUTE", "0"))
+    RATE_LIMIT_TOKENS_PER_MINUTE = int(os.getenv("RATE_LIMIT_TOKENS_PER_MINUTE", "0"))
+    RATE_LIMIT_STATE_PATH = os.getenv("RATE_LIMIT_STATE_PATH", "")  # SQLite file to share the budget across processes
+    SUMMARY_MAX_ATTEMPTS = int(os.getenv("SUMMARY_MAX_ATTEMPTS", "6"))
+    SUMMARY_RETRY_BASE_DELAY = float(os.getenv("SUMMARY_RETRY_BASE_DELAY", "1.0"))
+    SUMMARY_RETRY_MAX_DELAY = float(os.getenv("SUMMARY_RETRY_MAX_DELAY", "60"))
+    
+    # Deployment pool (AZURE_OPENAI_DEPLOYMENTS)
+    LLM_POOL_FAILURE_THRESHOLD = int(os.getenv("LLM_POOL_FAILURE_THRESHOLD", "3"))  # failures in a row that eject
+    LLM_POOL_COOLDOWN_SECONDS = float(os.getenv("LLM_POOL_COOLDOWN_SECONDS", "30"))  # time ejected deployments rest
+    LLM_POOL_LATENCY_DECAY = float(os.getenv("LLM_POOL_LATENCY_DECAY", "0.2"))  # weight of the newest observation
+    LLM_MAX_CONNECTIONS = int(os.getenv("LLM_MAX_CONNECTIONS", "100"))  # per endpoint, shared by every summarizer
+    
+    # LLM response cache
+    LLM_CACHE_ENABLED = os.getenv("LLM_CACHE_ENABLED", "true").lower() == "true"
+    LLM_CACHE_PATH = os.getenv(
+        "LLM_CACHE_PATH",
+        os.path.join(os.path.expanduser("~"), ".cache", "doc_summarizer", "llm_responses.sqlite3"),
+    )
+    LLM_CACHE_TTL_SECONDS = int(os.getenv("LLM_CACHE_TTL_SECONDS", str(7 * 24 * 3600)))
+    LLM_CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "10000"))
+    LLM_CACHE_MAX_TEMPERATURE = float(os.getenv("LLM_CACHE_MAX_TEMPERATURE", "0.5"))  # hotter requests are never cached
+    
+    # Batch mode
+    BATCH_EXTRACTION_WORKERS = int(os.getenv("BATCH_EXTRACTION_WORKERS", os.cpu_count() or 1))
+    BATCH_SUMMARY_CONCURRENCY = int(os.getenv("BATCH_SUMMARY_CONCURRENCY", "8"))
+    BATCH_QUEUE_SIZE = int(os.getenv("BATCH_QUEUE_SIZE", "16"))  # extracted texts / summaries waiting between stages
+    BATCH_RESULTS_PATH = os.getenv("BATCH_RESULTS_PATH", "batch_results.json")
+    
+    # Watch mode
+    WATCH_INDEX_PATH = os.getenv(
+        "WATCH_INDEX_PATH",
+        os.path.join(os.path.expanduser("~"), ".cache", "doc_summarizer", "manifest.sqlite3"),
+    )
+    WATCH_BACKEND = os.getenv("WATCH_BACKEND", "auto")  # "auto" (inotify on Linux), "inotify" or "poll"
+    WATCH_POLL_INTERVAL = float(os.getenv("WATCH_POLL_INTERVAL", "5"))  # seconds between polling scans
+    WATCH_RESCAN_INTERVAL = float(os.getenv("WATCH_RESCAN_INTERVAL", "600"))  # full rescans to catch missed events
+    WATCH_SETTLE_SECONDS = float(os.getenv("WATCH_SETTLE_SECONDS", "2"))  # files modified more recently wait
+    
+    # Distributed job queue
+    JOB_QUEUE_BACKEND = os.getenv("JOB_QUEUE_BACKEND", "sqlite")
+    JOB_QUEUE_PATH = os.getenv("JOB_QUEUE_PATH", "job_queue.sqlite3")  # on a filesystem shared by every node
+    JOB_LEASE_SECONDS = float(os.getenv("JOB_LEASE_SECONDS", "300"))  # jobs whose lease is not renewed are reclaimed
+    JOB_HEARTBEAT_INTERVAL = float(os.getenv("JOB_HEARTBEAT_INTERVAL", "60"))
+    JOB_MAX_ATTEMPTS = int(os.getenv("JOB_MAX_ATTEMPTS", "3"))
+    JOB_RETRY_DELAY = float(os.getenv("JOB_RETRY_DELAY", "30"))  # seconds before a failed job is leased again
+    JOB_LEASE_BATCH = int(os.getenv("JOB_LEASE_BATCH", "0"))  # jobs leased at a time; 0 = one per extraction worker
+    JOB_POLL_INTERVAL = float(os.getenv("JOB_POLL_INTERVAL", "5"))  # seconds between polls of an empty queue
+    
+    # Server mode
+    SERVER_HOST = os.getenv("SERVER_HOST", "127.0.0.1")
+    SERVER_PORT = int(os.getenv("SERVER_PORT", "8080"))
+    SERVER_JOB_WORKERS = int(os.getenv("SERVER_JOB_WORKERS", "8"))  # jobs processed concurrently
+    SERVER_EXTRACTION_WORKERS = int(os.getenv("SERVER_EXTRACTION_WORKERS", os.cpu_count() or 1))
+    SERVER_MAX_FINISHED_JOBS = int(os.getenv("SERVER_MAX_FINISHED_JOBS", "1000"))  # older results are forgotten
+    SERVER_MAX_UPLOAD_MB = int(os.getenv("SERVER_MAX_UPLOAD_MB", "100"))
+    SERVER_UPLOAD_DIR = os.getenv(
+        "SERVER_UPLOAD_DIR",
+        os.path.join(os.path.expanduser("~"), ".cache", "doc_summarizer", "uploads"),
+    )
+    SERVER_INPUT_ROOT = os.getenv("SERVER_INPUT_ROOT", "")  # directory JSON "path" jobs may read; "" disables them
+    
+    # Metrics export ("" disables a file)
+    METRICS_JSON_PATH = os.getenv("METRICS_JSON_PATH", "")  # JSON run report with per-stage timings
+    METRICS_PROMETHEUS_PATH = os.getenv("METRICS_PROMETHEUS_PATH", "")  # node_exporter textfile, e.g. *.prom
+    METRICS_MAX_SPANS = int(os.getenv("METRICS_MAX_SPANS", "10000"))  # individual spans kept for the report
     
     # Logging
     LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
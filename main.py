@@ -6,83 +6,363 @@ This script extracts text from documents and generates summaries using Azure Ope
 It supports text extraction via unstructured library with OCR fallback.
 """
 
+import argparse
 import sys
 from pathlib import Path
+from typing import List
 
 # Add src to path for imports
 sys.path.append(str(Path(__file__).parent / "src"))
 
 from config.settings import AppConfig, AzureOpenAIConfig
-from src.extractors.text_extractor import UnstructuredTextExtractor
-from src.extractors.ocr_extractor import OCRExtractor
 from src.extractors.base import ExtractionError
-from src.summarizers.azure_openai_summarizer import AzureOpenAISummarizer
-from src.utils.file_utils import validate_file_path, generate_output_path, save_text_to_file
+from src.pipeline.batch import BatchSummarizer, collect_input_files, is_batch_request
+from src.pipeline.extraction import extract_text_from_document
+from src.pipeline.job_queue import JOB_STATUSES, create_job_queue
+from src.pipeline.manifest import ManifestIndex
+from src.pipeline.preview import summarize_preview
+from src.pipeline.queue_worker import QueueWorker
+from src.pipeline.server import serve
+from src.pipeline.service import SummarizationService
+from src.pipeline.watch import FolderWatcher
+from src.summarizers.base import SummarizationError
+from src.summarizers.registry import create_summarizer
+from src.utils.file_utils import validate_file_path, generate_output_path, open_atomic, save_text_to_file
 from src.utils.logger import setup_logger
+from src.utils.metrics import increment, span, write_metrics
 
 
-def extract_text_from_document(file_path: Path) -> str:
-    """Extract text from document using multiple extraction methods.
+def parse_args(argv: List[str]) -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(add_help=True, usage="python main.py [options] \"<path_to_document>\" [...]")
+    parser.add_argument("documents", nargs="*",
+                        help="Document to summarize, or several files, directories or glob patterns for batch mode")
+    parser.add_argument("--no-cache", action="store_true", help="Bypass the extraction and LLM response caches")
+    parser.add_argument("--stream", action="store_true", default=AppConfig.SUMMARY_STREAM,
+                        help="Print and save the summary as it is generated")
+    parser.add_argument("--incremental", action="store_true", default=AppConfig.SUMMARY_INCREMENTAL,
+                        help="Summarize as a cached summary tree, so revised documents only pay for what changed")
+    parser.add_argument("--metrics-json", default=AppConfig.METRICS_JSON_PATH,
+                        help="Write a JSON run report with per-stage timings and counters")
+    parser.add_argument("--metrics-prom", default=AppConfig.METRICS_PROMETHEUS_PATH,
+                        help="Write metrics to a Prometheus textfile (node_exporter textfile collector)")
+    
+    preview = parser.add_argument_group("preview mode")
+    preview.add_argument("--preview", action="store_true",
+                         help="Summarize a representative subset of the pages within a time and token budget")
+    preview.add_argument("--max-seconds", type=float, default=AppConfig.PREVIEW_MAX_SECONDS,
+                         help="Wall-clock budget of a preview (0 for none)")
+    preview.add_argument("--max-tokens", type=int, default=AppConfig.PREVIEW_MAX_TOKENS,
+                         help="Token budget for the excerpts a preview is summarized from (0 for none)")
+    
+    batch = parser.add_argument_group("batch mode")
+    batch.add_argument("--manifest", help="File listing inputs (one per line, or a JSON list)")
+    batch.add_argument("--workers", type=int, help="Number of extraction worker processes (batch and server mode)")
+    batch.add_argument("--concurrency", type=int, help="Maximum concurrent summarization requests")
+    batch.add_argument("--results", default=AppConfig.BATCH_RESULTS_PATH,
+                       help="Where to write the per-file JSON result manifest")
+    
+    watch = parser.add_argument_group("watch mode")
+    watch.add_argument("--watch", action="store_true",
+                       help="Summarize new or changed documents in the given folders, then keep watching them")
+    watch.add_argument("--once", action="store_true",
+                       help="Exit when there is no work left: after one scan with --watch, "
+                            "once the queue is empty with --queue-worker")
+    watch.add_argument("--index", default=AppConfig.WATCH_INDEX_PATH,
+                       help="SQLite manifest index of processed documents")
+    
+    queue = parser.add_argument_group("distributed queue mode")
+    queue.add_argument("--enqueue", action="store_true",
+                       help="Add the documents matched by the inputs to the job queue and exit")
+    queue.add_argument("--queue-worker", action="store_true", help="Summarize documents from the job queue")
+    queue.add_argument("--queue-status", action="store_true", help="Print the number of jobs in each state")
+    queue.add_argument("--queue", default=AppConfig.JOB_QUEUE_PATH,
+                       help="Job queue location, on storage shared by every worker")
+    
+    server = parser.add_argument_group("server mode")
+    server.add_argument("--serve", action="store_true", help="Run the HTTP summarization service")
+    server.add_argument("--host", default=AppConfig.SERVER_HOST, help="Interface to bind")
+    server.add_argument("--port", type=int, default=AppConfig.SERVER_PORT, help="Port to bind")
+    server.add_argument("--job-workers", type=int, help="Number of jobs processed concurrently")
+    return parser.parse_args(argv)
+
+
+def run_batch(args: argparse.Namespace) -> int:
+    """Summarize every document matched by the command line inputs.
     
-    Args:
-        file_path: Path to the document
-        
     Returns:
-        Extracted text
-        
-    Raises:
-        ExtractionError: If all extraction methods fail
+        Process exit code: 0 if every document succeeded, 1 otherwise
+    """
+    logger = setup_logger(__name__)
+    
+    manifest_path = Path(args.manifest) if args.manifest else None
+    paths = collect_input_files(args.documents, manifest_path)
+    if not paths:
+        logger.error("No supported documents found in the given inputs.")
+        return 1
+    
+    batch_summarizer = BatchSummarizer(
+        extraction_workers=args.workers,
+        summary_concurrency=args.concurrency,
+        use_cache=not args.no_cache,
+        incremental=args.incremental,
+    )
+    results = batch_summarizer.run(paths, Path(args.results))
+    
+    failed = [result for result in results if result.status != "ok"]
+    print(f"\nProcessed {len(results)} documents: {len(results) - len(failed)} succeeded, {len(failed)} failed")
+    print(f"Results saved to: {args.results}")
+    return 1 if failed else 0
+
+
+def run_watch(args: argparse.Namespace) -> int:
+    """Process new or changed documents in the given folders, then keep watching them.
+    
+    Returns:
+        Process exit code
+    """
+    logger = setup_logger(__name__)
+    if not args.documents:
+        logger.error("Watch mode needs at least one folder.")
+        return 1
+    
+    batch_summarizer = BatchSummarizer(
+        extraction_workers=args.workers,
+        summary_concurrency=args.concurrency,
+        use_cache=not args.no_cache,
+        incremental=args.incremental,
+    )
+    watcher = FolderWatcher(args.documents, ManifestIndex(args.index), batch_summarizer)
+    watcher.run(once=args.once)
+    return 0
+
+
+def run_queue(args: argparse.Namespace) -> int:
+    """Enqueue documents, work on the job queue or report its status.
+    
+    Returns:
+        Process exit code
     """
     logger = setup_logger(__name__)
+    job_queue = create_job_queue(args.queue)
+    
+    if args.enqueue:
+        manifest_path = Path(args.manifest) if args.manifest else None
+        paths = collect_input_files(args.documents, manifest_path)
+        if not paths:
+            logger.error("No supported documents found in the given inputs.")
+            return 1
+        queued = job_queue.enqueue(str(path) for path in paths)
+        print(f"Queued {queued} of {len(paths)} documents ({len(paths) - queued} already queued or done)")
+    
+    if args.queue_worker:
+        batch_summarizer = BatchSummarizer(
+            extraction_workers=args.workers,
+            summary_concurrency=args.concurrency,
+            use_cache=not args.no_cache,
+            incremental=args.incremental,
+        )
+        QueueWorker(job_queue, batch_summarizer).run(exit_when_empty=args.once)
+    
+    if args.queue_status or args.queue_worker:
+        counts = job_queue.counts()
+        print(", ".join(f"{status}: {counts.get(status, 0)}" for status in JOB_STATUSES))
+        for job in job_queue.failures():
+            print(f"  failed after {job.attempts} attempts: {job.path}: {job.error}")
+    return 0
+
+
+def run_incremental(document_path_str: str, use_cache: bool) -> int:
+    """Summarize one document incrementally, reusing the unchanged pages and sections of earlier revisions.
     
-    # Try unstructured first
-    text_extractor = UnstructuredTextExtractor()
+    Returns:
+        Process exit code
+    """
+    # Imported here so the summary tree and its tokenizer only load when incremental mode runs
+    from src.pipeline.incremental import summarize_document_incremental
+    
+    logger = setup_logger(__name__)
     try:
-        extracted_text = text_extractor.extract(file_path)
+        document_path = validate_file_path(document_path_str)
+        logger.info(f"Processing document incrementally: {document_path}")
         
-        # Check if extracted text is sufficient
-        if len(extracted_text.strip()) >= AppConfig.OCR_MIN_TEXT_LENGTH:
-            logger.info("Successfully extracted text using unstructured library")
-            return extracted_text
-        else:
-            logger.warning(f"Extracted text too short ({len(extracted_text)} chars). Trying OCR...")
+        summarizer = create_summarizer()
+        if not summarizer.is_available():
+            logger.error("Azure OpenAI summarizer is not available. Check your configuration.")
+            return 1
+        
+        summary, report = summarize_document_incremental(document_path, summarizer, use_cache=use_cache)
+        output_path = generate_output_path(document_path)
+        with span("write_output"):
+            save_text_to_file(summary, output_path)
+    except FileNotFoundError as e:
+        logger.error(f"File error: {e}")
+        return 1
+    except ValueError as e:
+        logger.error(f"Configuration error: {e}")
+        return 1
+    except ExtractionError as e:
+        logger.error(f"Text extraction error: {e}")
+        return 1
+    except SummarizationError as e:
+        logger.error(f"Summarization error: {e}")
+        return 1
     
-    except ExtractionError:
-        logger.warning("Unstructured extraction failed. Trying OCR...")
+    print("\n" + "="*50)
+    print("DOCUMENT SUMMARY")
+    print("="*50)
+    print(summary)
+    print("="*50)
+    print(f"\nExtracted {report.units_extracted} of {report.units} pages or blocks; summarized "
+          f"{report.sections_summarized} of {report.sections} sections and {report.groups_summarized} of "
+          f"{report.groups} groups ({report.llm_requests} LLM requests), reused the rest")
+    print(f"Summary saved to: {output_path}")
+    return 0
+
+
+def run_preview(document_path_str: str, max_seconds: float, max_tokens: int, use_cache: bool) -> int:
+    """Summarize a representative subset of one document within a time and token budget.
     
-    # Fallback to OCR
-    ocr_extractor = OCRExtractor()
-    if ocr_extractor.can_extract(file_path):
-        try:
-            extracted_text = ocr_extractor.extract(file_path)
-            logger.info("Successfully extracted text using OCR")
-            return extracted_text
-        except ExtractionError:
-            logger.error("OCR extraction also failed")
+    Returns:
+        Process exit code
+    """
+    logger = setup_logger(__name__)
+    try:
+        document_path = validate_file_path(document_path_str)
+        logger.info(f"Previewing document: {document_path} (budget: {max_seconds:g}s, {max_tokens} tokens)")
+        
+        summarizer = create_summarizer()
+        if not summarizer.is_available():
+            logger.error("Azure OpenAI summarizer is not available. Check your configuration.")
+            return 1
+        
+        summary, coverage = summarize_preview(document_path, max_seconds, max_tokens, summarizer, use_cache=use_cache)
+        output_path = generate_output_path(document_path)
+        with span("write_output"):
+            # The coverage is part of the output, so readers of the file know what was skipped
+            save_text_to_file(f"{summary}\n\n---\n{coverage.describe()}\n", output_path)
+    except FileNotFoundError as e:
+        logger.error(f"File error: {e}")
+        return 1
+    except ValueError as e:
+        logger.error(f"Configuration error: {e}")
+        return 1
+    except ExtractionError as e:
+        logger.error(f"Text extraction error: {e}")
+        return 1
+    except SummarizationError as e:
+        logger.error(f"Summarization error: {e}")
+        return 1
+    
+    print("\n" + "="*50)
+    print("DOCUMENT PREVIEW SUMMARY")
+    print("="*50)
+    print(summary)
+    print("="*50)
+    print(f"\n{coverage.describe()}")
+    print(f"Summary saved to: {output_path}")
+    return 0
+
+
+def stream_summary(summarizer, extracted_text: str, output_path: Path, use_cache: bool) -> None:
+    """Print and save a summary incrementally as it is generated."""
+    stream = summarizer.summarize_stream(extracted_text, use_cache=use_cache)
+    
+    print("\n" + "="*50)
+    print("DOCUMENT SUMMARY")
+    print("="*50)
+    # The summary only replaces the output once the stream completes, so an interrupted run leaves no partial file
+    with span("write_output"), open_atomic(output_path) as f:
+        for delta in stream:
+            print(delta, end="", flush=True)
+            f.write(delta)
+            f.flush()
+    print("\n" + "="*50)
     
-    raise ExtractionError("All extraction methods failed")
+    stats = stream.stats
+    print(f"\nFirst token after {stats.time_to_first_token or 0.0:.2f}s, "
+          f"{stats.completion_tokens} tokens at {stats.tokens_per_second:.1f} tokens/s")
+    print(f"Summary saved to: {output_path}")
+
+
+def run_server(args: argparse.Namespace) -> int:
+    """Run the summarization service until interrupted.
+    
+    Returns:
+        Process exit code
+    """
+    service = SummarizationService(job_workers=args.job_workers, extraction_workers=args.workers)
+    service.start()
+    serve(args.host, args.port, service)
+    return 0
 
 
 def main():
     """Main function."""
+    args = parse_args(sys.argv[1:])
+    try:
+        run(args)
+    finally:
+        write_metrics(args.metrics_json, args.metrics_prom, extra={"argv": sys.argv[1:]})
+
+
+def run(args: argparse.Namespace):
+    """Run the mode selected on the command line, exiting with its status code."""
     logger = setup_logger(__name__)
     
+    if args.serve:
+        try:
+            sys.exit(run_server(args))
+        except ValueError as e:
+            logger.error(f"Configuration error: {e}")
+            sys.exit(1)
+    
+    if args.watch:
+        try:
+            sys.exit(run_watch(args))
+        except ValueError as e:
+            logger.error(f"Configuration error: {e}")
+            sys.exit(1)
+    
+    if args.enqueue or args.queue_worker or args.queue_status:
+        try:
+            sys.exit(run_queue(args))
+        except ValueError as e:
+            logger.error(f"Configuration error: {e}")
+            sys.exit(1)
+    
     # Check command line arguments
-    if len(sys.argv) < 2:
+    if not args.documents and not args.manifest:
         print("Usage: python main.py \"<path_to_document>\"")
         print("\nSupported file types:", ", ".join(AppConfig.SUPPORTED_EXTENSIONS))
         sys.exit(1)
     
-    document_path_str = sys.argv[1]
+    if is_batch_request(args.documents, args.manifest):
+        try:
+            sys.exit(run_batch(args))
+        except ValueError as e:
+            logger.error(f"Configuration error: {e}")
+            sys.exit(1)
+    
+    document_path_str = args.documents[0]
+    
+    if args.preview:
+        sys.exit(run_preview(document_path_str, args.max_seconds, args.max_tokens, use_cache=not args.no_cache))
+    
+    if args.incremental:
+        sys.exit(run_incremental(document_path_str, use_cache=not args.no_cache))
     
     try:
         # Validate input file
-        document_path = validate_file_path(document_path_str)
+        with span("validate"):
+            document_path = validate_file_path(document_path_str)
         logger.info(f"Processing document: {document_path}")
         
         # Extract text
         logger.info("Starting text extraction...")
-        extracted_text = extract_text_from_document(document_path)
+        with span("extract", file=document_path.name):
+            extracted_text = extract_text_from_document(document_path, use_cache=not args.no_cache)
+        increment("extracted_chars", len(extracted_text))
         
         if not extracted_text.strip():
             logger.error("The document appears empty or contains no extractable text.")
@@ -92,27 +372,35 @@ def main():
         
         # Initialize summarizer
         logger.info("Initializing Azure OpenAI summarizer...")
-        summarizer = AzureOpenAISummarizer()
+        summarizer = create_summarizer()
         
         if not summarizer.is_available():
             logger.error("Azure OpenAI summarizer is not available. Check your configuration.")
             sys.exit(1)
         
-        # Generate summary
-        logger.info("Generating summary...")
-        summary = summarizer.summarize(extracted_text)
-        
-        # Save summary
         output_path = generate_output_path(document_path)
-        save_text_to_file(summary, output_path)
         
-        # Display results
-        print("\n" + "="*50)
-        print("DOCUMENT SUMMARY")
-        print("="*50)
-        print(summary)
-        print("="*50)
-        print(f"\nSummary saved to: {output_path}")
+        if args.stream:
+            logger.info("Streaming summary...")
+            with span("summarize", stream=True):
+                stream_summary(summarizer, extracted_text, output_path, use_cache=not args.no_cache)
+        else:
+            # Generate summary
+            logger.info("Generating summary...")
+            with span("summarize"):
+                summary = summarizer.summarize(extracted_text, use_cache=not args.no_cache)
+            
+            # Save summary
+            with span("write_output"):
+                save_text_to_file(summary, output_path)
+            
+            # Display results
+            print("\n" + "="*50)
+            print("DOCUMENT SUMMARY")
+            print("="*50)
+            print(summary)
+            print("="*50)
+            print(f"\nSummary saved to: {output_path}")
         
         logger.info("Document summarization completed successfully")
         
@@ -125,6 +413,9 @@ def main():
     except ExtractionError as e:
         logger.error(f"Text extraction error: {e}")
         sys.exit(1)
+    except SummarizationError as e:
+        logger.error(f"Summarization error: {e}")
+        sys.exit(1)
     except Exception as e:
         logger.error(f"Unexpected error: {e}")
         sys.exit(1)
@@ -0,0 +1,305 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite over the bundled resources with a mock LLM.
+
+Runs the extraction paths (unstructured, OCR, page-level hybrid and the
+routed pipeline) and the summarization paths (single call and map-reduce)
+over the PDFs in resources/. Summaries are requested from a local mock Azure
+OpenAI server with configurable latency, so runs are reproducible and cost
+nothing. Caches are disabled. Each scenario runs in a fresh interpreter, so
+peak RSS and import costs are measured per scenario.
+
+Usage:
+    python scripts/benchmark.py [--scenarios extract_ocr summarize] [--repeat 3] [--latency-ms 500]
+    python scripts/benchmark.py --save-baseline            # record benchmarks/baseline.json
+    python scripts/benchmark.py --compare                  # fail on regressions against it
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from mock_azure_openai import start_mock_server  # noqa: E402
+
+
+DEFAULT_RESOURCES_DIR = PROJECT_ROOT / "resources"
+DEFAULT_BASELINE_PATH = PROJECT_ROOT / "benchmarks" / "baseline.json"
+
+# Scenario -> what it measures
+SCENARIOS = {
+    "extract_unstructured": "unstructured partitioning of every page",
+    "extract_ocr": "rasterize and OCR every page",
+    "extract_mixed": "page-level hybrid: text layer, OCR only for sparse pages",
+    "extract_pipeline": "routed extraction as used by main.py (preflight, fallbacks)",
+    "summarize": "single-call summarization against the mock endpoint",
+    "summarize_chunked": "map-reduce summarization against the mock endpoint",
+}
+
+# Relative increase over the baseline that counts as a regression
+DEFAULT_THRESHOLDS = {
+    "wall_seconds": 0.15,
+    "peak_rss_mb": 0.20,
+    "total_tokens": 0.05,
+}
+
+
+def _pdf_documents(resources_dir: Path) -> List[Path]:
+    return sorted(resources_dir.glob("*.pdf"))
+
+
+def _page_count(path: Path) -> int:
+    from pypdf import PdfReader
+    
+    return len(PdfReader(str(path)).pages)
+
+
+def _pdf_text(path: Path) -> str:
+    """Text layer of a PDF, used as a fixed summarization input independent of the extractors."""
+    from pypdf import PdfReader
+    
+    return "\n\n".join(page.extract_text() or "" for page in PdfReader(str(path)).pages)
+
+
+def _peak_rss_mb() -> Dict[str, Optional[float]]:
+    """Peak resident set size of this process and of its largest child (e.g. an OCR worker)."""
+    try:
+        import resource
+    except ImportError:  # Windows
+        try:
+            import psutil
+        except ImportError:
+            return {"peak_rss_mb": None, "peak_child_rss_mb": None}
+        return {"peak_rss_mb": psutil.Process().memory_info().peak_wset / 2**20, "peak_child_rss_mb": None}
+    
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS
+    unit = 1 if sys.platform == "darwin" else 1024
+    return {
+        "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * unit / 2**20,
+        "peak_child_rss_mb": resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss * unit / 2**20,
+    }
+
+
+def _extract_documents(extract: Callable[[Path], str], documents: List[Path]) -> Dict[str, Any]:
+    chars = 0
+    for path in documents:
+        chars += len(extract(path))
+    return {"chars": chars}
+
+
+def _summarize_documents(documents: List[Path], mode: str) -> Dict[str, Any]:
+    from config.settings import AppConfig
+    from src.summarizers.registry import create_summarizer
+    
+    AppConfig.SUMMARY_MODE = mode
+    texts = [_pdf_text(path) for path in documents]
+    summarizer = create_summarizer()
+    
+    started = time.perf_counter()
+    chars = sum(len(summarizer.summarize(text, use_cache=False)) for text in texts)
+    return {"chars": chars, "measured_seconds": time.perf_counter() - started}
+
+
+def run_scenario(name: str, documents: List[Path]) -> Dict[str, Any]:
+    """Run one scenario in this process and return its measurements."""
+    from src.extractors.registry import create_extractor
+    from src.pipeline.extraction import extract_text_from_document
+    from src.utils.metrics import metrics
+    
+    if name == "extract_unstructured":
+        run = lambda: _extract_documents(create_extractor("unstructured").extract, documents)  # noqa: E731
+    elif name == "extract_ocr":
+        run = lambda: _extract_documents(create_extractor("ocr").extract, documents)  # noqa: E731
+    elif name == "extract_mixed":
+        run = lambda: _extract_documents(create_extractor("hybrid").extract, documents)  # noqa: E731
+    elif name == "extract_pipeline":
+        run = lambda: _extract_documents(  # noqa: E731
+            lambda path: extract_text_from_document(path, use_cache=False), documents
+        )
+    elif name == "summarize":
+        run = lambda: _summarize_documents(documents, "single")  # noqa: E731
+    elif name == "summarize_chunked":
+        run = lambda: _summarize_documents(documents, "chunked")  # noqa: E731
+    else:
+        raise ValueError(f"Unknown scenario '{name}'")
+    
+    metrics.reset()
+    started = time.perf_counter()
+    outcome = run()
+    wall_seconds = outcome.pop("measured_seconds", time.perf_counter() - started)
+    
+    counters = metrics.export_state()["counters"]
+    pages = sum(_page_count(path) for path in documents)
+    prompt_tokens = int(counters.get("llm.prompt_tokens", 0))
+    completion_tokens = int(counters.get("llm.completion_tokens", 0))
+    return {
+        "status": "ok",
+        "documents": len(documents),
+        "pages": pages,
+        "wall_seconds": wall_seconds,
+        "pages_per_second": pages / wall_seconds if wall_seconds > 0 else 0.0,
+        "prompt_tokens": prompt_tokens,
+        "completion_tokens": completion_tokens,
+        "total_tokens": prompt_tokens + completion_tokens,
+        "llm_requests": int(counters.get("llm.requests", 0)),
+        **outcome,
+        **_peak_rss_mb(),
+    }
+
+
+def measure_scenario(name: str, resources_dir: Path, repeat: int, env: Dict[str, str]) -> Dict[str, Any]:
+    """Run a scenario ``repeat`` times in fresh interpreters and aggregate the runs.
+    
+    Wall time and throughput are medians; peak RSS is the maximum.
+    """
+    runs = []
+    for _ in range(max(1, repeat)):
+        with tempfile.TemporaryDirectory(prefix="benchmark_") as tmp_dir:
+            result_path = Path(tmp_dir) / "result.json"
+            completed = subprocess.run(
+                [sys.executable, __file__, "--run-scenario", name,
+                 "--resources", str(resources_dir), "--result-file", str(result_path)],
+                cwd=PROJECT_ROOT, env=env, capture_output=True, text=True,
+            )
+            if completed.returncode != 0 or not result_path.exists():
+                error = (completed.stderr or completed.stdout).strip().splitlines()
+                return {"status": "failed", "error": error[-1] if error else "no output"}
+            runs.append(json.loads(result_path.read_text(encoding="utf-8")))
+    
+    result = dict(runs[-1])
+    result["runs"] = len(runs)
+    for key in ("wall_seconds", "pages_per_second"):
+        result[key] = statistics.median(run[key] for run in runs)
+    for key in ("peak_rss_mb", "peak_child_rss_mb"):
+        values = [run[key] for run in runs if run.get(key) is not None]
+        result[key] = max(values) if values else None
+    return result
+
+
+def compare_to_baseline(results: Dict[str, Dict[str, Any]], baseline: Dict[str, Any],
+                        thresholds: Dict[str, float]) -> List[str]:
+    """Return a description of every regression against the baseline."""
+    regressions = []
+    for name, result in results.items():
+        reference = baseline.get("scenarios", {}).get(name)
+        if reference is None or reference.get("status") != "ok":
+            continue
+        if result.get("status") != "ok":
+            regressions.append(f"{name}: passed in the baseline but now fails ({result.get('error')})")
+            continue
+        for metric, threshold in thresholds.items():
+            before, after = reference.get(metric), result.get(metric)
+            if not before or after is None:
+                continue
+            change = (after - before) / before
+            if change > threshold:
+                regressions.append(
+                    f"{name}: {metric} {before:.2f} -> {after:.2f} (+{change:.0%}, threshold {threshold:.0%})"
+                )
+    return regressions
+
+
+def _format_row(name: str, result: Dict[str, Any]) -> str:
+    if result.get("status") != "ok":
+        return f"{name:<22} FAILED: {result.get('error')}"
+    rss = f"{result['peak_rss_mb']:.0f}" if result.get("peak_rss_mb") is not None else "n/a"
+    return (
+        f"{name:<22} {result['wall_seconds']:>9.2f} {result['pages_per_second']:>9.2f} {rss:>9} "
+        f"{result['total_tokens']:>9} {result['llm_requests']:>6}"
+    )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--scenarios", nargs="+", choices=list(SCENARIOS), default=list(SCENARIOS))
+    parser.add_argument("--resources", default=str(DEFAULT_RESOURCES_DIR), help="Directory of PDFs to process")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per scenario (median wall time)")
+    parser.add_argument("--latency-ms", type=float, default=500.0, help="Mock LLM response latency")
+    parser.add_argument("--baseline", default=str(DEFAULT_BASELINE_PATH), help="Baseline results file")
+    parser.add_argument("--save-baseline", action="store_true", help="Store these results as the baseline")
+    parser.add_argument("--compare", action="store_true", help="Exit 1 on regressions against the baseline")
+    parser.add_argument("--output", help="Also write the results as JSON to this path")
+    for metric, threshold in DEFAULT_THRESHOLDS.items():
+        parser.add_argument(f"--max-{metric.replace('_', '-')}-increase", type=float, default=threshold,
+                            dest=f"threshold_{metric}", help=f"Allowed relative increase (default {threshold})")
+    parser.add_argument("--run-scenario", help=argparse.SUPPRESS)
+    parser.add_argument("--result-file", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    
+    resources_dir = Path(args.resources)
+    documents = _pdf_documents(resources_dir)
+    
+    if args.run_scenario:
+        result = run_scenario(args.run_scenario, documents)
+        Path(args.result_file).write_text(json.dumps(result), encoding="utf-8")
+        return 0
+    
+    if not documents:
+        print(f"No PDFs found in {resources_dir}")
+        return 1
+    
+    mock_server = start_mock_server(latency_seconds=args.latency_ms / 1000)
+    env = {
+        **os.environ,
+        "AZURE_OPENAI_ENDPOINT": mock_server.endpoint,
+        "AZURE_OPENAI_API_KEY": "benchmark",
+        "EXTRACTION_CACHE_ENABLED": "false",
+        "LLM_CACHE_ENABLED": "false",
+        "LOG_LEVEL": "WARNING",
+    }
+    
+    print(f"Benchmarking {len(documents)} documents from {resources_dir} "
+          f"(mock LLM latency {args.latency_ms:.0f} ms, {args.repeat} runs per scenario)\n")
+    print(f"{'scenario':<22} {'wall s':>9} {'pages/s':>9} {'rss MB':>9} {'tokens':>9} {'reqs':>6}")
+    results = {}
+    for name in args.scenarios:
+        results[name] = measure_scenario(name, resources_dir, args.repeat, env)
+        print(_format_row(name, results[name]))
+    
+    report = {
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": sys.version.split()[0],
+        "platform": sys.platform,
+        "cpu_count": os.cpu_count(),
+        "latency_ms": args.latency_ms,
+        "documents": [path.name for path in documents],
+        "scenarios": results,
+    }
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2), encoding="utf-8")
+    
+    baseline_path = Path(args.baseline)
+    exit_code = 0
+    if args.compare:
+        if not baseline_path.exists():
+            print(f"\nNo baseline at {baseline_path}; run with --save-baseline first")
+            return 1
+        baseline = json.loads(baseline_path.read_text(encoding="utf-8"))
+        thresholds = {metric: getattr(args, f"threshold_{metric}") for metric in DEFAULT_THRESHOLDS}
+        regressions = compare_to_baseline(results, baseline, thresholds)
+        if regressions:
+            print("\nRegressions against the baseline:")
+            for regression in regressions:
+                print(f"  {regression}")
+            exit_code = 1
+        else:
+            print(f"\nNo regressions against {baseline_path}")
+    
+    if args.save_baseline:
+        baseline_path.parent.mkdir(parents=True, exist_ok=True)
+        baseline_path.write_text(json.dumps(report, indent=2), encoding="utf-8")
+        print(f"\nBaseline saved to {baseline_path}")
+    return exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
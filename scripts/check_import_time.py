@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Import-time budget check for the CLI entry point.
+
+Imports ``main`` in a fresh interpreter with ``-X importtime`` and fails if
+the import takes longer than the budget or pulls in a heavy dependency that
+should only load when an extractor or summarizer actually runs.
+
+Usage: python scripts/check_import_time.py [--budget-ms 250] [--runs 5]
+"""
+
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+# Dependencies that must not be imported just to start the CLI
+HEAVY_MODULES = ["unstructured", "pdf2image", "pytesseract", "PIL", "numpy", "pypdf", "openai", "tiktoken"]
+
+IMPORTTIME_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+
+def measure_import(module: str) -> Tuple[float, Dict[str, int]]:
+    """Import a module in a fresh interpreter.
+    
+    Returns:
+        Tuple of (cumulative import time of the module in ms, mapping of every
+        imported module to its cumulative import time in microseconds)
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=PROJECT_ROOT,
+        capture_output=True,
+        text=True,
+        env={**os.environ, "PYTHONDONTWRITEBYTECODE": "1"},
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Importing '{module}' failed:\n{result.stderr[-2000:]}")
+    
+    modules = {}
+    for line in result.stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match:
+            modules[match.group(4)] = int(match.group(2))
+    return modules.get(module, 0) / 1000, modules
+
+
+def find_heavy_imports(modules: Dict[str, int]) -> List[str]:
+    """Return the heavy top-level packages found among imported modules."""
+    imported = {name.split(".")[0] for name in modules}
+    return [name for name in HEAVY_MODULES if name in imported]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--module", default="main", help="Module to import (default: main)")
+    parser.add_argument("--budget-ms", type=float, default=250.0, help="Maximum median import time")
+    parser.add_argument("--runs", type=int, default=5, help="Number of fresh interpreters to measure")
+    parser.add_argument("--top", type=int, default=10, help="Number of slowest imports to show")
+    args = parser.parse_args()
+    
+    timings = []
+    modules = {}
+    for _ in range(max(1, args.runs)):
+        elapsed_ms, modules = measure_import(args.module)
+        timings.append(elapsed_ms)
+    median_ms = statistics.median(timings)
+    
+    print(f"'import {args.module}': median {median_ms:.1f} ms over {len(timings)} runs "
+          f"(budget {args.budget_ms:.0f} ms)")
+    print("Slowest imports (cumulative):")
+    for name, micros in sorted(modules.items(), key=lambda item: item[1], reverse=True)[:args.top]:
+        print(f"  {micros / 1000:8.1f} ms  {name}")
+    
+    failed = False
+    heavy = find_heavy_imports(modules)
+    if heavy:
+        print(f"FAIL: heavy dependencies imported at startup: {', '.join(heavy)}")
+        failed = True
+    if median_ms > args.budget_ms:
+        print(f"FAIL: import time exceeds the budget by {median_ms - args.budget_ms:.1f} ms")
+        failed = True
+    
+    if not failed:
+        print("OK")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
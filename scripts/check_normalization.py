@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Regression check for the text normalization that runs before summarization.
+
+Normalizes synthetic fund documents and fails if any figure is lost or if
+running headers, footers and page numbers are left in. Extraction puts
+every element in a block of its own, and the samples are laid out the
+same way.
+
+Usage: python scripts/check_normalization.py [--funds 4]
+"""
+
+import argparse
+import sys
+from pathlib import Path
+from typing import List
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.utils.text_normalization import normalize_pages, normalize_text  # noqa: E402
+
+
+def fund_page(index: int) -> List[str]:
+    """Blocks of one fund's tear sheet: KPI rows that recur on every page with other values."""
+    return [
+        f"Fund {chr(ord('A') + index)} Overview",
+        f"The fund invests in senior secured loans to lower middle market companies, vintage {2015 + index}.",
+        f"Net IRR {8.1 + index:.1f}%",
+        f"Net TVPI {1.4 + index / 10:.1f}x",
+        f"Commitment ${25 + 5 * index} million",
+        "Net IRR",
+        f"{42 + 3 * index}",
+        f"Performance of fund {chr(ord('A') + index)} has been in line with its underwriting case.",
+    ]
+
+
+def check_kpi_rows(funds: int) -> List[str]:
+    """Every KPI row must survive, whether the document comes as one text or as pages."""
+    pages = ["\n\n".join(fund_page(index)) for index in range(funds)]
+    figures = [block for index in range(funds) for block in fund_page(index)[2:7]]
+    problems = []
+    for name, normalized in (
+        ("one text", normalize_text("\n\n".join(pages))[0]),
+        ("pages", "\n\n".join(normalize_pages(pages)[0])),
+    ):
+        blocks = normalized.split("\n\n")
+        lost = [figure for figure in figures if figure not in blocks]
+        if lost:
+            problems.append(f"{name}: {len(lost)} of {len(figures)} KPI rows removed, e.g. {lost[:3]}")
+        print(f"  KPI rows ({name}): {len(figures) - len(lost)}/{len(figures)} kept")
+    return problems
+
+
+def check_running_headers(funds: int) -> List[str]:
+    """A running header with the page number, a verbatim footer and page numbers must be removed."""
+    pages = [
+        "\n\n".join([f"Twin Brook Fund Review | Page {index + 2}", *fund_page(index),
+                     "Confidential and proprietary information", str(index + 2)])
+        for index in range(funds)
+    ]
+    normalized = "\n\n".join(normalize_pages(pages)[0])
+    problems = []
+    headers = sum(line.startswith("Twin Brook Fund Review") for line in normalized.split("\n"))
+    footers = normalized.count("Confidential and proprietary information")
+    if headers != 1 or footers != 1:
+        problems.append(f"running header kept {headers} times and footer {footers} times, expected once each")
+    if any(line == str(index + 2) for index in range(funds) for line in normalized.split("\n")):
+        problems.append("page numbers left in the text")
+    print(f"  running headers: header kept {headers}x, footer kept {footers}x")
+    return problems
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--funds", type=int, default=4, help="Fund pages in the synthetic document")
+    args = parser.parse_args()
+    
+    problems = check_kpi_rows(args.funds) + check_running_headers(args.funds)
+    for problem in problems:
+        print(f"FAIL: {problem}")
+    if not problems:
+        print("OK")
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
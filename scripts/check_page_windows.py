@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Check that rendered page windows map every page number to its own image.
+
+Puts stub ``pdfinfo`` and ``pdftoppm`` executables first on the PATH. The
+stub renderer writes each page's number into its output file, so the
+check needs neither poppler nor a real PDF. Windows are rendered with
+several poppler processes, which write their chunks under different
+random prefixes, and the check fails if any page is labelled with another
+page's image.
+
+Usage: python scripts/check_page_windows.py [--pages 20] [--window-size 8] [--threads 4]
+"""
+
+import argparse
+import os
+import stat
+import sys
+import tempfile
+from pathlib import Path
+from typing import List
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.utils.pdf_utils import iter_pdf_page_windows  # noqa: E402
+
+
+PDFINFO_STUB = """#!/bin/sh
+echo "Pages:          {pages}"
+"""
+
+# Writes <prefix>-<page>.ppm for pages -f..-l, zero-padded like pdftoppm, containing the page number
+PDFTOPPM_STUB = """#!{python}
+import sys
+args = sys.argv[1:]
+if "-v" in args:
+    sys.stderr.write("pdftoppm version 22.02.0\\n")
+    sys.exit(0)
+first = int(args[args.index("-f") + 1])
+last = int(args[args.index("-l") + 1])
+prefix = args[-1]
+for page in range(first, last + 1):
+    with open(f"{{prefix}}-{{page:0{width}d}}.ppm", "w") as f:
+        f.write(str(page))
+"""
+
+
+def install_stubs(bin_dir: Path, pages: int):
+    """Write the stub poppler executables into ``bin_dir``."""
+    stubs = {
+        "pdfinfo": PDFINFO_STUB.format(pages=pages),
+        "pdftoppm": PDFTOPPM_STUB.format(python=sys.executable, width=len(str(pages))),
+    }
+    for name, script in stubs.items():
+        path = bin_dir / name
+        path.write_text(script, encoding="utf-8")
+        path.chmod(path.stat().st_mode | stat.S_IEXEC)
+
+
+def check_windows(pdf_path: Path, pages: int, window_size: int, threads: int) -> List[str]:
+    """Render every page in windows and return the pages that got another page's image."""
+    problems = []
+    seen = []
+    for window in iter_pdf_page_windows(pdf_path, window_size, first_page=1, last_page=pages,
+                                        thread_count=threads):
+        for page_number, image_path in window:
+            rendered = int(image_path.read_text(encoding="utf-8"))
+            seen.append(page_number)
+            if rendered != page_number:
+                problems.append(f"page {page_number} was given the image of page {rendered}")
+    if seen != list(range(1, pages + 1)):
+        problems.append(f"pages yielded out of order or missing: {seen}")
+    return problems
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--pages", type=int, default=20, help="Pages of the stub document")
+    parser.add_argument("--window-size", type=int, default=8, help="Pages rendered per window")
+    parser.add_argument("--threads", type=int, default=4, help="Poppler processes per window")
+    args = parser.parse_args()
+    
+    with tempfile.TemporaryDirectory(prefix="check_page_windows_") as work_dir:
+        bin_dir = Path(work_dir)
+        install_stubs(bin_dir, args.pages)
+        os.environ["PATH"] = f"{bin_dir}{os.pathsep}{os.environ.get('PATH', '')}"
+        pdf_path = bin_dir / "stub.pdf"
+        pdf_path.write_bytes(b"%PDF-1.4\n")
+        
+        problems = []
+        for threads in sorted({1, args.threads}):
+            window_problems = check_windows(pdf_path, args.pages, args.window_size, threads)
+            print(f"  {threads} poppler processes per window: "
+                  f"{'ok' if not window_problems else f'{len(window_problems)} problems'}")
+            problems.extend(f"{threads} processes: {problem}" for problem in window_problems)
+    
+    for problem in problems:
+        print(f"FAIL: {problem}")
+    if not problems:
+        print("OK")
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
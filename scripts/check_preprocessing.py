@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Sanity check for the OCR page preprocessing.
+
+Draws synthetic pages of text lines, rotates them by a known angle and
+fails if ``preprocess_page`` does not straighten and crop them. Both a
+grayscale scan and a bilevel (pure black and white) scan are checked,
+since Otsu's threshold is 0 on the latter.
+
+Usage: python scripts/check_preprocessing.py [--angle 3]
+"""
+
+import argparse
+import sys
+from pathlib import Path
+from typing import List
+
+import numpy as np
+from PIL import Image
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.utils.image_preprocessing import (  # noqa: E402
+    PreprocessOptions, estimate_skew, otsu_threshold, preprocess_page,
+)
+
+
+PAGE_SIZE = (1240, 1754)  # A4 at 150 DPI
+MARGIN = 150
+
+
+def make_page(angle: float, bilevel: bool) -> Image.Image:
+    """Draw a page of dashed text lines inside wide margins, rotated by ``angle`` degrees."""
+    width, height = PAGE_SIZE
+    pixels = np.full((height, width), 255, dtype=np.uint8)
+    ink = 0 if bilevel else 40
+    for top in range(MARGIN, height - MARGIN, 40):
+        for left in range(MARGIN, width - MARGIN - 60, 70):
+            pixels[top:top + 14, left:left + 55] = ink
+    page = Image.fromarray(pixels).rotate(angle, resample=Image.NEAREST if bilevel else Image.BILINEAR,
+                                          expand=False, fillcolor=255)
+    if bilevel:
+        page = page.point(lambda value: 255 if value > 127 else 0)
+    else:
+        # Paper is not perfectly white on a grayscale scan
+        page = Image.fromarray(np.clip(np.asarray(page), 0, 235).astype(np.uint8))
+    return page
+
+
+def check_page(name: str, angle: float, bilevel: bool) -> List[str]:
+    """Preprocess one synthetic page and return what went wrong."""
+    page = make_page(angle, bilevel)
+    gray = np.asarray(page)
+    threshold = otsu_threshold(gray)
+    estimated = estimate_skew(gray <= threshold)
+    
+    cleaned = preprocess_page(page, PreprocessOptions(binarize=True, deskew=True, crop_margins=True))
+    problems = []
+    if cleaned is None:
+        return [f"{name}: page reported as blank"]
+    # Rotating the page by the estimate must undo the rotation it was drawn with
+    if abs(estimated + angle) > 0.5:
+        problems.append(f"{name}: skew estimated as {estimated:.2f} degrees, expected {-angle:.2f}")
+    residual = estimate_skew(np.asarray(cleaned) == 0)
+    if abs(residual) > 0.5:
+        problems.append(f"{name}: {residual:.2f} degrees of skew left after preprocessing")
+    if cleaned.width >= PAGE_SIZE[0] - MARGIN or cleaned.height >= PAGE_SIZE[1] - MARGIN:
+        problems.append(f"{name}: margins not cropped ({cleaned.width}x{cleaned.height})")
+    print(f"  {name}: threshold {threshold}, skew {estimated:+.2f}, cropped to {cleaned.width}x{cleaned.height}")
+    return problems
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--angle", type=float, default=3.0, help="Rotation of the synthetic pages in degrees")
+    args = parser.parse_args()
+    
+    problems = []
+    for name, bilevel in (("grayscale", False), ("bilevel", True)):
+        problems.extend(check_page(name, args.angle, bilevel))
+    
+    for problem in problems:
+        print(f"FAIL: {problem}")
+    if not problems:
+        print("OK")
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+Local mock of the Azure OpenAI chat completions endpoint.
+
+Answers every chat completion with a short canned summary after a
+configurable delay (streamed word by word for ``stream=True`` requests), so
+the summarizer, batch mode and server mode can be exercised without network
+access or tokens:
+
+    python scripts/mock_azure_openai.py --port 8999 --latency-ms 500
+    AZURE_OPENAI_ENDPOINT=http://127.0.0.1:8999 AZURE_OPENAI_API_KEY=mock python main.py --serve
+
+Usage: python scripts/mock_azure_openai.py [--host 127.0.0.1] [--port 8999] [--latency-ms 0] [--token-delay-ms 0] [--throttle-every 0]
+"""
+
+import argparse
+import json
+import re
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Optional
+
+
+COMPLETIONS_PATH = re.compile(r"^/openai/deployments/([^/]+)/chat/completions")
+
+# Same rough ratio as src/utils/token_utils.py, good enough for usage numbers
+CHARS_PER_TOKEN = 4
+
+
+class MockAzureOpenAIHandler(BaseHTTPRequestHandler):
+    """Serves chat completions for any deployment."""
+    
+    protocol_version = "HTTP/1.1"
+    
+    def log_message(self, format: str, *args):
+        if not self.server.quiet:
+            super().log_message(format, *args)
+    
+    def do_POST(self):
+        match = COMPLETIONS_PATH.match(self.path)
+        body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        if not match:
+            self._send_json(404, {"error": {"code": "404", "message": "Resource not found"}})
+            return
+        
+        if self.server.should_throttle():
+            self._send_json(429, {"error": {"code": "429", "message": "Rate limit is exceeded (mock)."}},
+                            headers={"retry-after-ms": "200"})
+            return
+        
+        request = json.loads(body or b"{}")
+        time.sleep(self.server.latency_seconds)
+        completion = self.server.make_completion(match.group(1), request)
+        if request.get("stream"):
+            self._send_stream(completion)
+        else:
+            self._send_json(200, completion)
+    
+    def _send_stream(self, completion: Dict[str, Any]):
+        """Send a completion as server-sent events, one word per chunk."""
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        self.close_connection = True
+        
+        content = completion["choices"][0]["message"]["content"]
+        words = re.findall(r"\S+\s*", content)
+        deltas = [{"role": "assistant", "content": ""}] + [{"content": word} for word in words] + [{}]
+        for i, delta in enumerate(deltas):
+            chunk = {
+                "id": completion["id"],
+                "object": "chat.completion.chunk",
+                "created": completion["created"],
+                "model": completion["model"],
+                "choices": [{
+                    "index": 0,
+                    "delta": delta,
+                    "finish_reason": "stop" if i == len(deltas) - 1 else None,
+                }],
+            }
+            self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode("utf-8"))
+            self.wfile.flush()
+            if 0 < i < len(deltas) - 1:
+                time.sleep(self.server.token_delay_seconds)
+        self.wfile.write(b"data: [DONE]\n\n")
+        self.wfile.flush()
+    
+    def _send_json(self, status: int, payload: Dict[str, Any], headers: Optional[Dict[str, str]] = None):
+        encoded = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(encoded)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(encoded)
+
+
+class MockAzureOpenAIServer(ThreadingHTTPServer):
+    """Threaded mock server that counts the requests and tokens it served."""
+    
+    daemon_threads = True
+    
+    def __init__(self, address, latency_seconds: float = 0.0, throttle_every: int = 0, quiet: bool = False,
+                 token_delay_seconds: float = 0.0):
+        super().__init__(address, MockAzureOpenAIHandler)
+        self.latency_seconds = latency_seconds
+        self.token_delay_seconds = token_delay_seconds
+        self.throttle_every = throttle_every
+        self.quiet = quiet
+        self.request_count = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self._lock = threading.Lock()
+    
+    @property
+    def endpoint(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+    
+    def should_throttle(self) -> bool:
+        """Count a request and decide whether to answer it with a 429."""
+        with self._lock:
+            self.request_count += 1
+            return self.throttle_every > 0 and self.request_count % self.throttle_every == 0
+    
+    def make_completion(self, deployment: str, request: Dict[str, Any]) -> Dict[str, Any]:
+        """Build a chat completion response for a request."""
+        prompt_chars = sum(len(message.get("content") or "") for message in request.get("messages", []))
+        content = (
+            f"Mock summary of a {prompt_chars}-character prompt.\n\n"
+            "- The document was received and processed by the mock endpoint.\n"
+            "- No real model was called."
+        )
+        prompt_tokens = prompt_chars // CHARS_PER_TOKEN
+        completion_tokens = len(content) // CHARS_PER_TOKEN
+        with self._lock:
+            self.prompt_tokens += prompt_tokens
+            self.completion_tokens += completion_tokens
+        
+        return {
+            "id": f"chatcmpl-{uuid.uuid4().hex}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": deployment,
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": content},
+                "finish_reason": "stop",
+            }],
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens,
+            },
+        }
+
+
+def start_mock_server(host: str = "127.0.0.1", port: int = 0, latency_seconds: float = 0.0,
+                      throttle_every: int = 0, quiet: bool = True,
+                      token_delay_seconds: float = 0.0) -> MockAzureOpenAIServer:
+    """Start a mock server on a background thread (port 0 picks a free port)."""
+    server = MockAzureOpenAIServer((host, port), latency_seconds, throttle_every, quiet, token_delay_seconds)
+    threading.Thread(target=server.serve_forever, name="mock-azure-openai", daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8999)
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Delay before each response")
+    parser.add_argument("--token-delay-ms", type=float, default=0.0,
+                        help="Delay between streamed words for stream=True requests")
+    parser.add_argument("--throttle-every", type=int, default=0,
+                        help="Answer every Nth request with 429 and retry-after-ms (0 disables)")
+    args = parser.parse_args()
+    
+    server = MockAzureOpenAIServer((args.host, args.port), args.latency_ms / 1000, args.throttle_every,
+                                   token_delay_seconds=args.token_delay_ms / 1000)
+    print(f"Mock Azure OpenAI endpoint on {server.endpoint}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,16 @@
 """Base classes for text extractors."""
 from abc import ABC, abstractmethod
 from pathlib import Path
-from typing import Optional
+from typing import Any, Dict, Optional
 
 
 class BaseExtractor(ABC):
     """Abstract base class for text extractors."""
     
+    # Identify the extractor in cache keys; bump version when output changes
+    name = "base"
+    version = "1"
+    
     def __init__(self):
         self.logger = None
     
@@ -35,6 +39,22 @@ class BaseExtractor(ABC):
             True if this extractor can handle the file type
         """
         return True
+    
+    def warm_up(self) -> None:
+        """Import the extractor's dependencies ahead of the first document.
+        
+        Long-running processes call this at startup so the first request does
+        not pay for slow imports. Raises ImportError if a dependency is missing.
+        """
+        pass
+    
+    def get_settings(self) -> Dict[str, Any]:
+        """Return the settings that influence this extractor's output.
+        
+        Returns:
+            JSON-serializable mapping used to key cached extraction results
+        """
+        return {}
 
 
 class ExtractionError(Exception):
@@ -0,0 +1,118 @@
+"""Page-level hybrid extraction combining the text layer with OCR."""
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from config.settings import AppConfig
+from .base import BaseExtractor, ExtractionError
+from .registry import create_extractor
+from ..utils.logger import setup_logger
+from ..utils.metrics import increment
+from ..utils.pdf_utils import get_pdf_page_count
+
+
+class HybridPageExtractor(BaseExtractor):
+    """Extractor that OCRs only the pages whose text layer is too sparse.
+    
+    Every page is first extracted with the unstructured library. Pages whose
+    text is shorter than ``AppConfig.OCR_MIN_PAGE_TEXT_LENGTH`` (typically
+    scanned exhibits in an otherwise digital PDF) are sent to OCR, and the
+    results are merged back in page order.
+    """
+    
+    name = "hybrid"
+    version = "1"
+    
+    def __init__(self, min_page_text_length: Optional[int] = None):
+        super().__init__()
+        self.logger = setup_logger(__name__)
+        self.min_page_text_length = (
+            min_page_text_length if min_page_text_length is not None
+            else AppConfig.OCR_MIN_PAGE_TEXT_LENGTH
+        )
+        self.text_extractor = create_extractor("unstructured")
+        self.ocr_extractor = create_extractor("ocr")
+    
+    def extract(self, file_path: Path) -> str:
+        """Extract text page by page, using OCR only for sparse pages.
+        
+        Args:
+            file_path: Path to the PDF to extract text from
+        
+        Returns:
+            Extracted text as string
+        
+        Raises:
+            ExtractionError: If extraction fails
+        """
+        pages = self.extract_pages(file_path)
+        return "\n\n".join(text for text in pages.values() if text.strip())
+    
+    def extract_pages(self, file_path: Path, page_numbers: Optional[List[int]] = None) -> Dict[int, str]:
+        """Extract text per page, using OCR only for sparse pages.
+        
+        Args:
+            file_path: Path to the PDF to extract text from
+            page_numbers: Pages to extract (default: all)
+        
+        Returns:
+            Mapping of page number to page text, in page order
+        
+        Raises:
+            ExtractionError: If extraction fails, or OCR fails and no page has any text
+        """
+        try:
+            total_pages = get_pdf_page_count(file_path)
+        except Exception as e:
+            raise ExtractionError(f"Could not read page count of '{file_path}': {e}") from e
+        
+        if page_numbers is None:
+            page_numbers = list(range(1, total_pages + 1))
+        
+        try:
+            text_pages = self.text_extractor.extract_pages(file_path, page_numbers)
+        except ExtractionError:
+            self.logger.warning("Unstructured extraction failed. Treating every page as sparse...")
+            text_pages = {}
+        
+        pages = {
+            page_number: text_pages.get(page_number, "")
+            for page_number in sorted(page_numbers) if 1 <= page_number <= total_pages
+        }
+        sparse_pages = [
+            page_number for page_number, text in pages.items()
+            if len(text.strip()) < self.min_page_text_length
+        ]
+        
+        self.logger.info(
+            f"{len(pages) - len(sparse_pages)}/{len(pages)} pages have a usable text layer; "
+            f"OCR needed on {len(sparse_pages)} pages"
+        )
+        
+        if sparse_pages:
+            try:
+                ocr_pages = self.ocr_extractor.extract_pages(file_path, sparse_pages)
+            except ExtractionError as e:
+                if not any(text.strip() for text in pages.values()):
+                    raise
+                # The text-layer pages are still worth summarizing; sparse pages keep what their text layer had
+                increment("hybrid.ocr_failures")
+                self.logger.warning(f"OCR failed on pages {sparse_pages} ({e}). Keeping their text layer...")
+                ocr_pages = {}
+            for page_number, ocr_text in ocr_pages.items():
+                # Keep whichever source recovered more text for the page
+                if len(ocr_text.strip()) > len(pages[page_number].strip()):
+                    pages[page_number] = ocr_text
+        
+        return pages
+    
+    def get_settings(self) -> Dict[str, Any]:
+        """Return the settings that influence hybrid extraction output."""
+        return {
+            "min_page_text_length": self.min_page_text_length,
+            self.text_extractor.name: self.text_extractor.get_settings(),
+            self.ocr_extractor.name: self.ocr_extractor.get_settings(),
+        }
+    
+    def can_extract(self, file_path: Path) -> bool:
+        """Check if hybrid extraction can handle this file type."""
+        return file_path.suffix.lower() == '.pdf'
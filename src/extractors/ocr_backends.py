@@ -0,0 +1,128 @@
+"""Tesseract OCR backends.
+
+``pytesseract`` starts a ``tesseract`` process for every image and reloads
+the language model each time. ``tesserocr`` binds libtesseract directly, so
+one engine can be created per worker process (and thread) and reused for
+every page, with images passed in memory.
+"""
+import threading
+import time
+from typing import TYPE_CHECKING, Dict, Optional, Tuple, Union
+
+from config.settings import AppConfig
+from ..utils.logger import setup_logger
+from ..utils.metrics import metrics
+
+if TYPE_CHECKING:
+    from PIL import Image
+
+
+OCR_BACKENDS = ("auto", "tesserocr", "pytesseract")
+
+# Engines of the current thread, keyed by (backend, language). Tesseract engines
+# are not thread-safe, and pool workers reuse their engines across tasks.
+_engines = threading.local()
+
+
+class PytesseractBackend:
+    """Runs the ``tesseract`` binary once per image."""
+    
+    name = "pytesseract"
+    
+    def __init__(self, lang: str = "eng"):
+        import pytesseract
+        
+        self._pytesseract = pytesseract
+        self.lang = lang
+    
+    def image_to_string(self, image: Union[str, "Image.Image"]) -> str:
+        """OCR an image given as a PIL image or an image file path."""
+        return self._pytesseract.image_to_string(image, lang=self.lang)
+    
+    def recognize(self, image: Union[str, "Image.Image"]) -> Tuple[str, Optional[float]]:
+        """OCR an image and return its text with the mean word confidence (0-100, None without words).
+        
+        Both come from a single tesseract run.
+        """
+        text, tsv = self._pytesseract.run_and_get_multiple_output(image, ["txt", "tsv"], lang=self.lang)
+        confidences = []
+        for line in tsv.splitlines()[1:]:
+            fields = line.split("\t")
+            # level, page, block, paragraph, line, word, left, top, width, height, conf, text
+            if len(fields) == 12 and fields[11].strip() and float(fields[10]) >= 0:
+                confidences.append(float(fields[10]))
+        return text, (sum(confidences) / len(confidences) if confidences else None)
+
+
+class TesserocrBackend:
+    """Keeps one libtesseract engine loaded and feeds it images in memory."""
+    
+    name = "tesserocr"
+    
+    def __init__(self, lang: str = "eng"):
+        import tesserocr
+        
+        self.lang = lang
+        self._api = tesserocr.PyTessBaseAPI(lang=lang)
+    
+    def image_to_string(self, image: Union[str, "Image.Image"]) -> str:
+        """OCR an image given as a PIL image or an image file path."""
+        if isinstance(image, str):
+            self._api.SetImageFile(image)
+        else:
+            self._api.SetImage(image)
+        return self._api.GetUTF8Text()
+    
+    def recognize(self, image: Union[str, "Image.Image"]) -> Tuple[str, Optional[float]]:
+        """OCR an image and return its text with the mean word confidence (0-100, None without words)."""
+        text = self.image_to_string(image)
+        return text, (float(self._api.MeanTextConf()) if text.strip() else None)
+
+
+def resolve_ocr_backend(name: str) -> str:
+    """Return the backend that ``name`` selects here.
+    
+    ``auto`` prefers tesserocr when its bindings are installed. An explicit
+    ``tesserocr`` falls back to pytesseract (with a warning) when they are not.
+    
+    Raises:
+        ValueError: If the backend name is unknown
+    """
+    if name not in OCR_BACKENDS:
+        raise ValueError(f"Invalid OCR backend '{name}'. Expected one of: {', '.join(OCR_BACKENDS)}")
+    if name == "pytesseract":
+        return name
+    
+    try:
+        import tesserocr  # noqa: F401
+    except ImportError:
+        if name == "tesserocr":
+            setup_logger(__name__).warning("tesserocr is not installed, falling back to pytesseract")
+        return "pytesseract"
+    return "tesserocr"
+
+
+def get_ocr_backend(name: Optional[str] = None,
+                    lang: Optional[str] = None) -> Union[TesserocrBackend, PytesseractBackend]:
+    """Return this thread's OCR engine for a backend and language, creating it on first use.
+    
+    Args:
+        name: Backend name (default: ``AppConfig.OCR_BACKEND``)
+        lang: Tesseract language(s) (default: ``AppConfig.OCR_LANGUAGE``)
+    """
+    backend = resolve_ocr_backend(name or AppConfig.OCR_BACKEND)
+    lang = lang or AppConfig.OCR_LANGUAGE
+    engines: Dict[Tuple[str, str], object] = _engines.__dict__.setdefault("engines", {})
+    
+    engine = engines.get((backend, lang))
+    if engine is None:
+        started = time.perf_counter()
+        try:
+            engine = TesserocrBackend(lang) if backend == "tesserocr" else PytesseractBackend(lang)
+        except RuntimeError as e:
+            # tesserocr raises RuntimeError when the language data cannot be loaded
+            setup_logger(__name__).warning(f"Could not start tesserocr ({e}), falling back to pytesseract")
+            engine = PytesseractBackend(lang)
+        metrics.record_span("ocr.engine_init", time.perf_counter() - started, backend=engine.name)
+        engines[(backend, lang)] = engine
+    return engine
@@ -1,39 +1,213 @@
 """OCR-based text extraction."""
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field, replace
 from pathlib import Path
-from typing import List
-from pdf2image import convert_from_path
-import pytesseract
-from PIL import Image
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple, Union
 
+from config.settings import AppConfig
 from .base import BaseExtractor, ExtractionError
+from .ocr_backends import get_ocr_backend, resolve_ocr_backend
 from ..utils.logger import setup_logger
+from ..utils.metrics import increment, metrics, span
+from ..utils.pdf_utils import (
+    get_pdf_page_count,
+    group_page_ranges,
+    iter_pdf_page_windows,
+    pages_within_memory,
+    render_pdf_page,
+)
+
+if TYPE_CHECKING:
+    from PIL import Image
+    from ..utils.image_preprocessing import PreprocessOptions
+
+
+PAGE_FAILURE_POLICIES = ("skip", "fail")
+
+
+@dataclass(frozen=True)
+class PageOCRSettings:
+    """How to OCR a page; sent to pool workers along with each page."""
+    
+    lang: str = "eng"
+    backend: str = "auto"
+    preprocess: Optional["PreprocessOptions"] = None  # None OCRs pages as rendered
+    dpi: int = field(default_factory=lambda: AppConfig.OCR_DPI)  # resolution the page was rendered at
+    grayscale: bool = True
+    min_confidence: float = 0  # re-render pages below this mean word confidence; 0 disables
+    retry_dpi: int = 0
+    pdf_path: Optional[str] = None  # source PDF, needed to re-render a page
+
+
+class PageOCRResult(NamedTuple):
+    """Outcome of OCR on one page."""
+    
+    page_number: int
+    text: str
+    error: Optional[str]
+    seconds: float
+    blank: bool = False
+    confidence: Optional[float] = None
+    rerendered: bool = False
+
+
+def _recognize_image(image: Union[str, "Image.Image"],
+                     settings: PageOCRSettings) -> Tuple[str, Optional[float], bool]:
+    """Preprocess and OCR one image.
+    
+    Returns:
+        Tuple of (text, mean word confidence or None, whether the page is blank)
+    """
+    if settings.preprocess is not None:
+        from PIL import Image
+        from ..utils.image_preprocessing import preprocess_page
+        
+        if isinstance(image, str):
+            with Image.open(image) as page:
+                image = preprocess_page(page, settings.preprocess)
+        else:
+            image = preprocess_page(image, settings.preprocess)
+        if image is None:
+            return "", None, True
+    
+    engine = get_ocr_backend(settings.backend, settings.lang)
+    if settings.min_confidence > 0:
+        text, confidence = engine.recognize(image)
+        return text, confidence, False
+    return engine.image_to_string(image), None, False
+
+
+def _ocr_page(page_number: int, image: Union[str, "Image.Image"],
+              settings: PageOCRSettings = PageOCRSettings()) -> PageOCRResult:
+    """OCR a single page image, given either as a PIL image or an image file path.
+    
+    Runs either in-process or inside a pool worker, so it must stay a
+    module-level function and must never raise: failures are returned as
+    an error message and handled by the page failure policy in the parent.
+    The OCR engine is created once per process and reused for later pages.
+    Blank pages are detected during preprocessing and never OCR'd. Pages
+    recognized with low confidence are re-rendered at ``settings.retry_dpi``
+    and OCR'd again, keeping the more confident result.
+    """
+    started = time.perf_counter()
+    try:
+        text, confidence, blank = _recognize_image(image, settings)
+        rerendered = False
+        if (confidence is not None and confidence < settings.min_confidence
+                and settings.pdf_path and settings.retry_dpi > settings.dpi):
+            sharper = render_pdf_page(Path(settings.pdf_path), page_number, settings.retry_dpi, settings.grayscale)
+            retry_text, retry_confidence, _ = _recognize_image(sharper, settings)
+            rerendered = True
+            if retry_confidence is not None and retry_confidence > confidence:
+                text, confidence = retry_text, retry_confidence
+        return PageOCRResult(page_number, text, None, time.perf_counter() - started,
+                             blank, confidence, rerendered)
+    except Exception as e:
+        return PageOCRResult(page_number, "", str(e), time.perf_counter() - started)
 
 
 class OCRExtractor(BaseExtractor):
     """OCR-based text extractor for PDFs and images."""
     
-    def __init__(self):
+    name = "ocr"
+    version = "1"
+    
+    def __init__(self, workers: Optional[int] = None, page_failure_policy: Optional[str] = None):
         super().__init__()
         self.logger = setup_logger(__name__)
+        self.workers = max(1, workers if workers is not None else AppConfig.OCR_WORKERS)
+        self.page_failure_policy = page_failure_policy or AppConfig.OCR_PAGE_FAILURE_POLICY
+        self.dpi = AppConfig.OCR_DPI
+        self.grayscale = AppConfig.OCR_GRAYSCALE
+        self.max_memory_mb = AppConfig.OCR_MAX_MEMORY_MB
+        self.language = AppConfig.OCR_LANGUAGE
+        self.backend = resolve_ocr_backend(AppConfig.OCR_BACKEND)
+        self.page_settings = PageOCRSettings(
+            lang=self.language,
+            backend=self.backend,
+            preprocess=self._preprocess_options() if AppConfig.OCR_PREPROCESS else None,
+            dpi=self.dpi,
+            grayscale=self.grayscale,
+            min_confidence=AppConfig.OCR_MIN_CONFIDENCE,
+            retry_dpi=AppConfig.OCR_RETRY_DPI,
+        )
+        
+        if self.page_failure_policy not in PAGE_FAILURE_POLICIES:
+            raise ValueError(
+                f"Invalid OCR page failure policy '{self.page_failure_policy}'. "
+                f"Expected one of: {', '.join(PAGE_FAILURE_POLICIES)}"
+            )
+    
+    @staticmethod
+    def _preprocess_options() -> "PreprocessOptions":
+        from ..utils.image_preprocessing import PreprocessOptions
+        
+        return PreprocessOptions(
+            binarize=AppConfig.OCR_BINARIZE,
+            deskew=AppConfig.OCR_DESKEW,
+            crop_margins=AppConfig.OCR_CROP_MARGINS,
+            blank_ink_ratio=AppConfig.OCR_BLANK_INK_RATIO,
+        )
     
     def extract(self, file_path: Path) -> str:
         """Extract text using OCR.
         
         Args:
             file_path: Path to the file to extract text from
-            
+        
         Returns:
             Extracted text as string
+        
+        Raises:
+            ExtractionError: If OCR extraction fails
+        """
+        try:
+            with span("ocr.extract", file=file_path.name) as attributes:
+                if file_path.suffix.lower() == '.pdf':
+                    text = self._extract_from_pdf(file_path)
+                else:
+                    text = self._extract_from_image(file_path)
+                attributes["chars"] = len(text)
+            increment("ocr.chars", len(text))
+            return text
+        
+        except ExtractionError:
+            raise
+        except Exception as e:
+            error_msg = f"OCR extraction failed for '{file_path}': {e}"
+            self.logger.error(error_msg)
+            raise ExtractionError(error_msg) from e
+    
+    def extract_pages(self, file_path: Path, page_numbers: Optional[List[int]] = None) -> Dict[int, str]:
+        """OCR selected pages of a PDF.
+        
+        Only the requested pages are rendered, which lets callers OCR just
+        the pages that have no usable text layer.
+        
+        Args:
+            file_path: Path to the PDF
+            page_numbers: 1-based page numbers to OCR, defaults to every page
+            
+        Returns:
+            Mapping of page number to OCR text, in page order
             
         Raises:
             ExtractionError: If OCR extraction fails
         """
         try:
-            if file_path.suffix.lower() == '.pdf':
-                return self._extract_from_pdf(file_path)
-            else:
-                return self._extract_from_image(file_path)
-                
+            if page_numbers is None:
+                page_numbers = list(range(1, get_pdf_page_count(file_path) + 1))
+            
+            self.logger.info(f"Running OCR on {len(page_numbers)} pages of '{file_path}'...")
+            with span("ocr.extract_pages", file=file_path.name, pages=len(page_numbers)):
+                results = self._ocr_pdf_pages(file_path, sorted(set(page_numbers)))
+                pages = self._collect_page_results(results, len(page_numbers))
+            increment("ocr.chars", sum(len(text) for text in pages.values()))
+            return pages
+        
+        except ExtractionError:
+            raise
         except Exception as e:
             error_msg = f"OCR extraction failed for '{file_path}': {e}"
             self.logger.error(error_msg)
@@ -43,30 +217,132 @@ class OCRExtractor(BaseExtractor):
         """Extract text from PDF using OCR."""
         self.logger.info(f"Running OCR on PDF '{file_path}'...")
         
-        images = convert_from_path(str(file_path))
-        ocr_text = []
-        
-        total_pages = len(images)
-        for i, img in enumerate(images, start=1):
-            self.logger.info(f"OCR on page {i}/{total_pages}...")
-            text = pytesseract.image_to_string(img)
-            ocr_text.append(text)
+        total_pages = get_pdf_page_count(file_path)
+        results = self._ocr_pdf_pages(file_path, list(range(1, total_pages + 1)))
+        ocr_text = self._collect_page_results(results, total_pages)
         
-        result = "\n\n".join(ocr_text)
+        result = "\n\n".join(ocr_text.values())
         self.logger.info(f"OCR completed. Extracted {len(result)} characters from {total_pages} pages")
         return result
     
+    def _ocr_pdf_pages(self, file_path: Path, page_numbers: List[int]) -> Iterator[PageOCRResult]:
+        """Render and OCR PDF pages window by window, yielding results in page order.
+        
+        Only one window of rendered pages exists at a time, and it is sized so
+        that the pages fit in ``AppConfig.OCR_MAX_MEMORY_MB``. With more than one
+        worker, the pages of each window are OCR'd concurrently in a process pool
+        that is reused across windows.
+        """
+        window_size = pages_within_memory(self.max_memory_mb, self.dpi, self.grayscale)
+        settings = replace(self.page_settings, pdf_path=str(file_path))
+        workers = min(self.workers, window_size, len(page_numbers))
+        self.logger.info(
+            f"Rendering {len(page_numbers)} pages at {self.dpi} DPI in windows of {window_size} pages"
+        )
+        
+        if workers <= 1:
+            for window in self._iter_windows(file_path, page_numbers, window_size, workers):
+                for page_number, image_path in window:
+                    yield _ocr_page(page_number, str(image_path), settings)
+            return
+        
+        self.logger.info(f"Running OCR with {workers} worker processes ({self.backend})")
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            for window in self._iter_windows(file_path, page_numbers, window_size, workers):
+                window_pages = [page_number for page_number, _ in window]
+                image_paths = [str(image_path) for _, image_path in window]
+                # map() yields results in submission order, so pages stay in sequence
+                yield from executor.map(_ocr_page, window_pages, image_paths, [settings] * len(window_pages))
+    
+    def _iter_windows(self, file_path: Path, page_numbers: List[int], window_size: int,
+                      thread_count: int) -> Iterator[List[Tuple[int, Path]]]:
+        """Render windows over each contiguous run of the requested pages."""
+        for first_page, last_page in group_page_ranges(page_numbers):
+            yield from iter_pdf_page_windows(
+                file_path,
+                window_size=window_size,
+                dpi=self.dpi,
+                grayscale=self.grayscale,
+                first_page=first_page,
+                last_page=last_page,
+                thread_count=max(1, thread_count),
+            )
+    
+    def _collect_page_results(self, results: Iterable[PageOCRResult], total_pages: int) -> Dict[int, str]:
+        """Apply the page failure policy to per-page OCR results."""
+        ocr_text = {}
+        failed_pages = []
+        blank_pages = []
+        
+        for page_number, text, error, seconds, blank, confidence, rerendered in results:
+            # Pages may be OCR'd in pool workers, so they are timed there and recorded here
+            metrics.record_span("ocr.page", seconds, page=page_number, chars=len(text), failed=error is not None,
+                                blank=blank, confidence=confidence, rerendered=rerendered)
+            increment("ocr.pages")
+            if blank:
+                increment("ocr.blank_pages")
+                blank_pages.append(page_number)
+            if rerendered:
+                increment("ocr.rerendered_pages")
+                increment("pages_rasterized")
+            if error is None:
+                self.logger.info(f"OCR on page {page_number}/{total_pages} complete")
+                ocr_text[page_number] = text
+                continue
+            
+            if self.page_failure_policy == "fail":
+                raise ExtractionError(f"OCR failed on page {page_number}/{total_pages}: {error}")
+            
+            increment("ocr.page_failures")
+            self.logger.warning(f"OCR failed on page {page_number}/{total_pages}, skipping: {error}")
+            failed_pages.append(page_number)
+            ocr_text[page_number] = ""
+        
+        if total_pages and len(failed_pages) == total_pages:
+            raise ExtractionError(f"OCR failed on all {total_pages} pages")
+        
+        if failed_pages:
+            self.logger.warning(f"OCR skipped {len(failed_pages)} failed pages: {failed_pages}")
+        if blank_pages:
+            self.logger.info(f"Skipped {len(blank_pages)} blank pages: {blank_pages}")
+        
+        return ocr_text
+    
     def _extract_from_image(self, file_path: Path) -> str:
         """Extract text from image using OCR."""
+        from PIL import Image
+        
         self.logger.info(f"Running OCR on image '{file_path}'...")
         
-        img = Image.open(file_path)
-        text = pytesseract.image_to_string(img)
+        with Image.open(file_path) as img:
+            text, _, blank = _recognize_image(img, self.page_settings)
+        if blank:
+            self.logger.info("Image is blank, skipped")
         
         self.logger.info(f"OCR completed. Extracted {len(text)} characters")
         return text
     
+    def warm_up(self) -> None:
+        """Import the OCR and PDF rendering libraries and load the OCR engine."""
+        import pdf2image  # noqa: F401
+        from PIL import Image  # noqa: F401
+        
+        get_ocr_backend(self.backend, self.language)
+    
+    def get_settings(self) -> Dict[str, Any]:
+        """Return the settings that influence OCR output."""
+        return {
+            "dpi": self.dpi,
+            "grayscale": self.grayscale,
+            "language": self.language,
+            "backend": self.backend,
+            "preprocess": repr(self.page_settings.preprocess),
+            "min_confidence": self.page_settings.min_confidence,
+            "retry_dpi": self.page_settings.retry_dpi,
+            "page_failure_policy": self.page_failure_policy,
+        }
+    
     def can_extract(self, file_path: Path) -> bool:
         """Check if OCR can handle this file type."""
-        ocr_extensions = [ '.png', '.jpg', '.jpeg', '.tiff', '.bmp']
+        ocr_extensions = ['.pdf', '.png', '.jpg', '.jpeg', '.tiff', '.bmp']
         return file_path.suffix.lower() in ocr_extensions
\ No newline at end of file
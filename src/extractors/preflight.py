@@ -0,0 +1,159 @@
+"""Cheap PDF text-layer probe used to route documents to an extractor."""
+import re
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import List, Tuple
+
+from config.settings import AppConfig
+from ..utils.logger import setup_logger
+
+
+# Document routes
+ROUTE_TEXT = "text"      # every page has a text layer: unstructured only
+ROUTE_OCR = "ocr"        # no page has a text layer and the document has too little text: OCR only
+ROUTE_HYBRID = "hybrid"  # mixed: only the pages without a text layer need OCR
+
+_TEXT_BLOCK = re.compile(rb"\bBT\b(.*?)\bET\b", re.S)
+_TEXT_STRING = re.compile(rb"\((?:\\.|[^\\)])*\)|<[0-9A-Fa-f\s]*>")
+_WHITESPACE = re.compile(rb"\s")
+# Rectangle operators: table cells, rulings and chart bars
+_RECTANGLE = re.compile(rb"(?<![A-Za-z])re(?![A-Za-z])")
+
+# Form XObjects can nest; real documents rarely go deeper than this
+_MAX_FORM_DEPTH = 3
+
+
+@dataclass
+class PageProfile:
+    """Text-layer statistics of a single PDF page."""
+    
+    page_number: int
+    text_chars: int
+    font_count: int
+    image_count: int
+    rect_count: int = 0
+    
+    def has_text_layer(self) -> bool:
+        """Whether the page draws text with a font, however little (e.g. a title or divider page)."""
+        return self.font_count > 0 and self.text_chars > 0
+
+
+@dataclass
+class PreflightResult:
+    """Outcome of probing a PDF before extraction."""
+    
+    route: str
+    pages: List[PageProfile] = field(default_factory=list)
+    elapsed_seconds: float = 0.0
+    
+    @property
+    def text_pages(self) -> List[int]:
+        return [p.page_number for p in self.pages if p.has_text_layer()]
+    
+    @property
+    def sparse_pages(self) -> List[int]:
+        return [p.page_number for p in self.pages if not p.has_text_layer()]
+    
+    @property
+    def text_chars(self) -> int:
+        return sum(p.text_chars for p in self.pages)
+
+
+def _count_text_chars(content: bytes) -> int:
+    """Approximate the number of glyphs drawn by text-showing operators.
+    
+    Literal strings count one character per byte and hex strings one per
+    four hex digits (two-byte CIDs, the common case for embedded fonts).
+    This avoids decoding fonts, which is what makes full text extraction slow.
+    """
+    chars = 0
+    for block in _TEXT_BLOCK.findall(content):
+        for match in _TEXT_STRING.finditer(block):
+            token = match.group(0)
+            if token.startswith(b"("):
+                chars += len(token) - 2
+            else:
+                chars += len(_WHITESPACE.sub(b"", token[1:-1])) // 4
+    return chars
+
+
+def _scan_resources(resources, depth: int = 0) -> Tuple[int, int, int]:
+    """Count fonts, images and text characters of Form XObjects in a resource dictionary."""
+    if resources is None or depth > _MAX_FORM_DEPTH:
+        return 0, 0, 0
+    
+    resources = resources.get_object()
+    fonts = resources.get("/Font")
+    font_count = len(fonts.get_object()) if fonts is not None else 0
+    image_count = 0
+    text_chars = 0
+    
+    xobjects = resources.get("/XObject")
+    if xobjects is not None:
+        for xobject in xobjects.get_object().values():
+            xobject = xobject.get_object()
+            subtype = xobject.get("/Subtype")
+            if subtype == "/Image":
+                image_count += 1
+            elif subtype == "/Form":
+                text_chars += _count_text_chars(xobject.get_data())
+                nested = _scan_resources(xobject.get("/Resources"), depth + 1)
+                font_count += nested[0]
+                image_count += nested[1]
+                text_chars += nested[2]
+    
+    return font_count, image_count, text_chars
+
+
+def profile_page(page, page_number: int) -> PageProfile:
+    """Build the text-layer profile of a pypdf page without extracting its text."""
+    contents = page.get_contents()
+    data = contents.get_data() if contents is not None else b""
+    text_chars = _count_text_chars(data)
+    
+    font_count, image_count, form_chars = _scan_resources(page.get("/Resources"))
+    return PageProfile(
+        page_number=page_number,
+        text_chars=text_chars + form_chars,
+        font_count=font_count,
+        image_count=image_count,
+        rect_count=len(_RECTANGLE.findall(data)),
+    )
+
+
+def probe_pdf(file_path: Path) -> PreflightResult:
+    """Inspect a PDF's text layer and decide which extractor should handle it.
+    
+    Args:
+        file_path: Path to the PDF
+    
+    Returns:
+        PreflightResult with the chosen route and per-page profiles
+    
+    Raises:
+        Exception: If the PDF cannot be parsed
+    """
+    from pypdf import PdfReader
+    
+    logger = setup_logger(__name__)
+    started = time.perf_counter()
+    
+    reader = PdfReader(str(file_path))
+    pages = [profile_page(page, i) for i, page in enumerate(reader.pages, start=1)]
+    result = PreflightResult(route=ROUTE_TEXT, pages=pages)
+    
+    sparse_count = len(result.sparse_pages)
+    # Like the unstructured-first fallback, only skip unstructured when the whole document is too short
+    if pages and sparse_count == len(pages) and result.text_chars < AppConfig.OCR_MIN_TEXT_LENGTH:
+        result.route = ROUTE_OCR
+    elif sparse_count:
+        result.route = ROUTE_HYBRID
+    
+    result.elapsed_seconds = time.perf_counter() - started
+    logger.info(
+        f"Preflight: route={result.route} for '{file_path.name}' "
+        f"({len(pages) - sparse_count}/{len(pages)} pages with a text layer, "
+        f"{sum(p.image_count for p in pages)} images) in {result.elapsed_seconds * 1000:.0f} ms"
+    )
+    return result
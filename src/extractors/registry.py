@@ -0,0 +1,47 @@
+"""Lazy registry of text extractors."""
+import importlib
+from typing import Dict, Tuple, Type
+
+from .base import BaseExtractor
+
+
+# Extractor name -> (module, class). Modules are imported on first use, so a
+# run that never OCRs never pays for importing the OCR stack.
+EXTRACTORS: Dict[str, Tuple[str, str]] = {
+    "unstructured": (".text_extractor", "UnstructuredTextExtractor"),
+    "ocr": (".ocr_extractor", "OCRExtractor"),
+    "hybrid": (".hybrid_extractor", "HybridPageExtractor"),
+}
+
+_classes: Dict[str, Type[BaseExtractor]] = {}
+
+
+def register_extractor(name: str, module: str, class_name: str):
+    """Register an extractor class by import path without importing it.
+    
+    Args:
+        name: Name the extractor is created by
+        module: Module path, absolute or relative to this package
+        class_name: Name of the extractor class in the module
+    """
+    EXTRACTORS[name] = (module, class_name)
+    _classes.pop(name, None)
+
+
+def get_extractor_class(name: str) -> Type[BaseExtractor]:
+    """Import and return the extractor class registered under a name.
+    
+    Raises:
+        ValueError: If no extractor is registered under the name
+    """
+    if name not in _classes:
+        if name not in EXTRACTORS:
+            raise ValueError(f"Unknown extractor '{name}'. Available: {', '.join(EXTRACTORS)}")
+        module, class_name = EXTRACTORS[name]
+        _classes[name] = getattr(importlib.import_module(module, __package__), class_name)
+    return _classes[name]
+
+
+def create_extractor(name: str, **kwargs) -> BaseExtractor:
+    """Create an instance of the extractor registered under a name."""
+    return get_extractor_class(name)(**kwargs)
@@ -1,18 +1,78 @@
 """Text extraction using unstructured library."""
+import tempfile
+import time
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import List
-from unstructured.partition.auto import partition
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
+from config.settings import AppConfig
 from .base import BaseExtractor, ExtractionError
 from ..utils.logger import setup_logger
+from ..utils.metrics import increment, metrics, span
+from ..utils.pdf_utils import group_page_ranges
+
+
+PARTITION_STRATEGIES = ("auto", "fast", "hi_res", "ocr_only")
+
+
+def _element_page(element: Any, default: int) -> int:
+    return getattr(element.metadata, "page_number", None) or default
+
+
+def _partition_page_range(file_path: str, first_page: int, last_page: int,
+                          strategy: str) -> Tuple[List[Tuple[int, str]], float]:
+    """Partition an inclusive range of PDF pages inside a pool worker.
+    
+    The pages are copied into a temporary PDF, so the worker only parses
+    its own share of the document. Page numbers in the element metadata
+    still refer to the original document.
+    
+    Returns:
+        Tuple of ((page number, element text) pairs in order, seconds taken)
+    """
+    from pypdf import PdfReader, PdfWriter
+    from unstructured.partition.auto import partition
+    
+    started = time.perf_counter()
+    reader = PdfReader(file_path)
+    writer = PdfWriter()
+    for index in range(first_page - 1, last_page):
+        writer.add_page(reader.pages[index])
+    
+    with tempfile.TemporaryDirectory(prefix="unstructured_pages_") as tmp_dir:
+        range_path = Path(tmp_dir) / f"pages_{first_page}-{last_page}.pdf"
+        with open(range_path, "wb") as f:
+            writer.write(f)
+        elements = partition(filename=str(range_path), strategy=strategy, starting_page_number=first_page)
+    
+    texts = [(_element_page(element, first_page), str(element)) for element in elements]
+    return texts, time.perf_counter() - started
 
 
 class UnstructuredTextExtractor(BaseExtractor):
-    """Text extractor using the unstructured library."""
+    """Text extractor using the unstructured library.
+    
+    Large PDFs can be split into page ranges that are partitioned in
+    parallel worker processes; elements are streamed back in document order.
+    """
     
-    def __init__(self):
+    name = "unstructured"
+    version = "1"
+    
+    def __init__(self, strategy: Optional[str] = None, workers: Optional[int] = None,
+                 pages_per_range: Optional[int] = None):
         super().__init__()
         self.logger = setup_logger(__name__)
+        self.strategy = strategy or AppConfig.UNSTRUCTURED_STRATEGY
+        self.workers = max(1, workers if workers is not None else AppConfig.UNSTRUCTURED_WORKERS)
+        self.pages_per_range = max(1, pages_per_range or AppConfig.UNSTRUCTURED_PAGES_PER_RANGE)
+        
+        if self.strategy not in PARTITION_STRATEGIES:
+            raise ValueError(
+                f"Invalid partition strategy '{self.strategy}'. "
+                f"Expected one of: {', '.join(PARTITION_STRATEGIES)}"
+            )
     
     def extract(self, file_path: Path) -> str:
         """Extract text using unstructured library.
@@ -29,8 +89,8 @@ class UnstructuredTextExtractor(BaseExtractor):
         try:
             self.logger.info(f"Extracting text from '{file_path}' using unstructured...")
             
-            elements = partition(filename=str(file_path))
-            extracted_text = "\n\n".join([str(el) for el in elements])
+            extracted_text = "\n\n".join(text for _, text in self.iter_elements(file_path))
+            increment("unstructured.chars", len(extracted_text))
             
             self.logger.info(f"Successfully extracted {len(extracted_text)} characters")
             return extracted_text
@@ -40,6 +100,124 @@ class UnstructuredTextExtractor(BaseExtractor):
             self.logger.error(error_msg)
             raise ExtractionError(error_msg) from e
     
+    def extract_pages(self, file_path: Path, page_numbers: Optional[List[int]] = None) -> Dict[int, str]:
+        """Extract text per page using unstructured library.
+        
+        Elements are grouped by their ``page_number`` metadata. Elements without
+        page information (e.g. from plain text files) are attributed to page 1.
+        
+        Args:
+            file_path: Path to the file to extract text from
+            page_numbers: PDF pages to extract (default: all)
+            
+        Returns:
+            Mapping of page number to page text, in page order. Pages without
+            any elements are absent.
+            
+        Raises:
+            ExtractionError: If extraction fails
+        """
+        try:
+            self.logger.info(f"Extracting per-page text from '{file_path}' using unstructured...")
+            
+            page_elements = defaultdict(list)
+            for page_number, text in self.iter_elements(file_path, page_numbers):
+                page_elements[page_number].append(text)
+            
+            pages = {
+                page_number: "\n\n".join(page_elements[page_number])
+                for page_number in sorted(page_elements)
+            }
+            
+            self.logger.info(f"Successfully extracted text from {len(pages)} pages")
+            return pages
+            
+        except Exception as e:
+            error_msg = f"Unstructured extraction failed for '{file_path}': {e}"
+            self.logger.error(error_msg)
+            raise ExtractionError(error_msg) from e
+    
+    def iter_elements(self, file_path: Path, page_numbers: Optional[List[int]] = None) -> Iterator[Tuple[int, str]]:
+        """Yield (page number, element text) pairs in document order.
+        
+        PDFs longer than one page range are partitioned range by range in a
+        process pool when more than one worker is configured; each range is
+        yielded as soon as it and every range before it are done. When
+        ``page_numbers`` is given, only those pages of the PDF are partitioned.
+        """
+        if page_numbers is not None:
+            page_ranges = [
+                (first, min(first + self.pages_per_range - 1, last))
+                for start, last in group_page_ranges(page_numbers)
+                for first in range(start, last + 1, self.pages_per_range)
+            ]
+        else:
+            page_ranges = self._page_ranges(file_path) if self.workers > 1 else []
+            if len(page_ranges) <= 1:
+                for element in self._partition(file_path):
+                    yield _element_page(element, 1), str(element)
+                return
+        
+        workers = min(self.workers, len(page_ranges))
+        self.logger.info(
+            f"Partitioning {len(page_ranges)} page ranges of '{file_path}'"
+            + (f" with {workers} worker processes" if workers > 1 else "")
+        )
+        executor = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+        try:
+            # map() yields results in submission order, so ranges stay in sequence
+            results = (executor.map if executor is not None else map)(
+                _partition_page_range,
+                [str(file_path)] * len(page_ranges),
+                [first for first, _ in page_ranges],
+                [last for _, last in page_ranges],
+                [self.strategy] * len(page_ranges),
+            )
+            for (first_page, last_page), (texts, seconds) in zip(page_ranges, results):
+                # Ranges may be partitioned in pool workers, so they are timed there and recorded here
+                metrics.record_span("unstructured.partition", seconds, file=file_path.name,
+                                    first_page=first_page, last_page=last_page, elements=len(texts))
+                increment("unstructured.elements", len(texts))
+                yield from texts
+        finally:
+            if executor is not None:
+                executor.shutdown()
+    
+    def _page_ranges(self, file_path: Path) -> List[Tuple[int, int]]:
+        """Split a PDF into inclusive page ranges of ``pages_per_range`` pages."""
+        if file_path.suffix.lower() != ".pdf":
+            return []
+        from pypdf import PdfReader
+        
+        try:
+            page_count = len(PdfReader(str(file_path)).pages)
+        except Exception as e:
+            self.logger.warning(f"Could not count pages of '{file_path}', partitioning it whole: {e}")
+            return []
+        return [
+            (first, min(first + self.pages_per_range - 1, page_count))
+            for first in range(1, page_count + 1, self.pages_per_range)
+        ]
+    
+    def _partition(self, file_path: Path) -> List[Any]:
+        """Partition a whole document into elements."""
+        # unstructured takes seconds to import, so only load it when a document is partitioned
+        from unstructured.partition.auto import partition
+        
+        with span("unstructured.partition", file=file_path.name) as attributes:
+            elements = partition(filename=str(file_path), strategy=self.strategy)
+            attributes["elements"] = len(elements)
+        increment("unstructured.elements", len(elements))
+        return elements
+    
+    def warm_up(self) -> None:
+        """Import unstructured's partitioners."""
+        import unstructured.partition.auto  # noqa: F401
+    
+    def get_settings(self) -> Dict[str, Any]:
+        """Return the settings that influence partitioning output."""
+        return {"strategy": self.strategy}
+    
     def can_extract(self, file_path: Path) -> bool:
         """Check if unstructured can handle this file type."""
         # Unstructured supports many formats, so we'll be permissive
@@ -0,0 +1,340 @@
+"""Batch summarization of many documents in a single process."""
+import asyncio
+import glob
+import json
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional, Tuple
+
+from config.settings import AppConfig
+from .extraction import extract_text_from_document
+from ..summarizers.base import SummarizationError
+from ..summarizers.registry import create_summarizer
+from ..utils.file_utils import generate_output_path, save_text_to_file
+from ..utils.logger import setup_logger
+from ..utils.metrics import increment, metrics, span
+
+if TYPE_CHECKING:
+    from ..summarizers.azure_openai_summarizer import AzureOpenAISummarizer
+
+
+GLOB_CHARACTERS = set("*?[")
+
+
+@dataclass
+class BatchResult:
+    """Outcome of processing one document in a batch."""
+    
+    path: str
+    status: str = "failed"
+    output_path: Optional[str] = None
+    error: Optional[str] = None
+    retryable: Optional[bool] = None
+    extracted_chars: int = 0
+    extract_seconds: float = 0.0
+    summarize_seconds: float = 0.0
+
+
+def is_document_name(name: str) -> bool:
+    """Whether a file name is a supported input document (and not one of our own outputs)."""
+    path = Path(name)
+    return path.suffix.lower() in AppConfig.SUPPORTED_EXTENSIONS and not path.stem.endswith("_summary")
+
+
+def _is_document(path: Path) -> bool:
+    """Whether a path is an existing supported input document."""
+    return path.is_file() and is_document_name(path.name)
+
+
+def read_manifest(manifest_path: Path) -> List[str]:
+    """Read input paths from a manifest file.
+    
+    The manifest is either a JSON list of paths or a text file with one path,
+    directory or glob per line. Blank lines and lines starting with '#' are ignored.
+    """
+    content = manifest_path.read_text(encoding="utf-8")
+    if manifest_path.suffix.lower() == ".json":
+        return [str(entry) for entry in json.loads(content)]
+    return [
+        line.strip() for line in content.splitlines()
+        if line.strip() and not line.strip().startswith("#")
+    ]
+
+
+def collect_input_files(inputs: Iterable[str], manifest_path: Optional[Path] = None) -> List[Path]:
+    """Expand files, directories, globs and manifest entries into a list of documents.
+    
+    Args:
+        inputs: Paths, directories (searched recursively) or glob patterns
+        manifest_path: Optional manifest file listing more inputs
+    
+    Returns:
+        Unique supported documents in the order they were found
+    """
+    inputs = list(inputs)
+    if manifest_path is not None:
+        inputs.extend(read_manifest(manifest_path))
+    
+    found = []
+    for entry in inputs:
+        if GLOB_CHARACTERS & set(entry):
+            candidates = [Path(p) for p in sorted(glob.glob(entry, recursive=True))]
+        elif Path(entry).is_dir():
+            candidates = sorted(p for p in Path(entry).rglob("*"))
+        else:
+            candidates = [Path(entry)]
+        found.extend(p for p in candidates if _is_document(p))
+    
+    unique = {}
+    for path in found:
+        unique.setdefault(path.resolve(), path)
+    return list(unique.values())
+
+
+def is_batch_request(inputs: List[str], manifest_path: Optional[str]) -> bool:
+    """Whether command line inputs call for batch mode rather than a single document."""
+    if manifest_path or len(inputs) > 1:
+        return True
+    return any(GLOB_CHARACTERS & set(entry) or Path(entry).is_dir() for entry in inputs)
+
+
+def _init_extraction_worker():
+    """Initialize an extraction worker process.
+    
+    Documents are the unit of parallelism in batch mode, so each worker OCRs
+    and partitions its pages serially instead of starting a nested process pool.
+    """
+    AppConfig.OCR_WORKERS = 1
+    AppConfig.UNSTRUCTURED_WORKERS = 1
+
+
+def _extract_in_worker(path: str, use_cache: bool) -> Tuple[str, float, Dict[str, Any]]:
+    """Extract one document inside a worker process.
+    
+    Returns:
+        Tuple of (text, elapsed seconds, metrics recorded during extraction),
+        so the parent process can merge the worker's spans and counters
+    """
+    metrics.reset()
+    started = time.perf_counter()
+    with span("extract", file=Path(path).name):
+        text = extract_text_from_document(Path(path), use_cache=use_cache)
+    return text, time.perf_counter() - started, metrics.export_state()
+
+
+def _extract_units_in_worker(path: str, use_cache: bool, tree_path: str) -> Tuple[List[str], float, Dict[str, Any]]:
+    """Extract one document as summary tree units inside a worker process, reusing stored pages.
+    
+    Returns:
+        Tuple of (units, elapsed seconds, metrics recorded during extraction)
+    """
+    from .incremental import extract_units
+    from ..summarizers.summary_tree import SummaryTreeStore
+    
+    metrics.reset()
+    started = time.perf_counter()
+    with span("extract", file=Path(path).name):
+        units, _ = extract_units(Path(path), SummaryTreeStore(tree_path), use_cache=use_cache)
+    return units, time.perf_counter() - started, metrics.export_state()
+
+
+class BatchSummarizer:
+    """Summarize many documents in a staged producer/consumer pipeline.
+    
+    Three stages run concurrently and are connected by bounded queues:
+    
+    1. Extraction: ``extraction_workers`` documents at a time are extracted in
+       a process pool, and their text is put on the summary queue.
+    2. Summarization: ``summary_concurrency`` tasks take texts off that queue
+       and summarize them through the async Azure OpenAI client.
+    3. Writing: a single task saves the summaries.
+    
+    When the LLM falls behind, the summary queue fills up and extraction
+    pauses, so at most ``queue_size`` extracted texts wait in memory. OCR
+    and LLM calls overlap, and the total time approaches the slower of the
+    two instead of their sum.
+    
+    With ``incremental`` set, documents are extracted page by page and
+    summarized as summary trees (see ``TreeSummarizer``), so revisions of
+    documents seen before only pay for the pages and sections that changed.
+    """
+    
+    def __init__(self, extraction_workers: Optional[int] = None,
+                 summary_concurrency: Optional[int] = None, use_cache: bool = True,
+                 queue_size: Optional[int] = None, incremental: Optional[bool] = None):
+        self.logger = setup_logger(__name__)
+        self.extraction_workers = max(1, extraction_workers or AppConfig.BATCH_EXTRACTION_WORKERS)
+        self.summary_concurrency = max(1, summary_concurrency or AppConfig.BATCH_SUMMARY_CONCURRENCY)
+        self.queue_size = max(1, queue_size or AppConfig.BATCH_QUEUE_SIZE)
+        self.use_cache = use_cache
+        self.incremental = AppConfig.SUMMARY_INCREMENTAL if incremental is None else incremental
+    
+    def run(self, paths: List[Path], results_path: Optional[Path] = None) -> List[BatchResult]:
+        """Process all documents and write the per-file result manifest.
+        
+        Args:
+            paths: Documents to summarize
+            results_path: Where to write the JSON result manifest, if anywhere
+        
+        Returns:
+            One BatchResult per document, in input order
+        """
+        started_at = datetime.now(timezone.utc)
+        results = asyncio.run(self._run(paths))
+        if results_path is not None:
+            self._write_results(results, results_path, started_at)
+        return results
+    
+    async def _run(self, paths: List[Path]) -> List[BatchResult]:
+        summarizer = create_summarizer()
+        results = [BatchResult(path=str(path)) for path in paths]
+        pending: "asyncio.Queue[int]" = asyncio.Queue()
+        for index in range(len(paths)):
+            pending.put_nowait(index)
+        # (document index, extracted text or units) and (document index, summary); None ends a stage
+        texts: "asyncio.Queue[Optional[Tuple[int, str]]]" = asyncio.Queue(maxsize=self.queue_size)
+        summaries: "asyncio.Queue[Optional[Tuple[int, str]]]" = asyncio.Queue(maxsize=self.queue_size)
+        
+        self.logger.info(
+            f"Processing {len(paths)} documents with {self.extraction_workers} extraction workers, "
+            f"{self.summary_concurrency} concurrent summaries and queues of {self.queue_size}"
+        )
+        with ProcessPoolExecutor(max_workers=self.extraction_workers,
+                                 initializer=_init_extraction_worker) as pool:
+            extractors = [
+                asyncio.create_task(self._extract_stage(paths, results, pending, texts, pool))
+                for _ in range(self.extraction_workers)
+            ]
+            summarizers = [
+                asyncio.create_task(self._summarize_stage(paths, results, texts, summaries, summarizer))
+                for _ in range(self.summary_concurrency)
+            ]
+            writer = asyncio.create_task(self._write_stage(paths, results, summaries))
+            
+            await asyncio.gather(*extractors)
+            for _ in summarizers:
+                await texts.put(None)
+            await asyncio.gather(*summarizers)
+            await summaries.put(None)
+            await writer
+        
+        for result in results:
+            increment("documents_succeeded" if result.status == "ok" else "documents_failed")
+        return results
+    
+    async def _extract_stage(self, paths: List[Path], results: List[BatchResult], pending: "asyncio.Queue[int]",
+                             texts: "asyncio.Queue", pool: ProcessPoolExecutor):
+        """Extract documents one at a time until none are left, feeding the summary queue."""
+        loop = asyncio.get_running_loop()
+        while not pending.empty():
+            index = pending.get_nowait()
+            path, result = paths[index], results[index]
+            try:
+                if self.incremental:
+                    text, result.extract_seconds, worker_metrics = await loop.run_in_executor(
+                        pool, _extract_units_in_worker, str(path), self.use_cache, str(AppConfig.SUMMARY_TREE_PATH)
+                    )
+                else:
+                    text, result.extract_seconds, worker_metrics = await loop.run_in_executor(
+                        pool, _extract_in_worker, str(path), self.use_cache
+                    )
+                metrics.merge(worker_metrics)
+            except Exception as e:
+                result.error = str(e)
+                self.logger.error(f"Failed to process '{path}': {e}")
+                continue
+            
+            units = text if self.incremental else [text]
+            result.extracted_chars = sum(len(unit) for unit in units)
+            increment("extracted_chars", result.extracted_chars)
+            if not any(unit.strip() for unit in units):
+                result.error = "The document appears empty or contains no extractable text."
+                self.logger.error(f"{path}: {result.error}")
+                continue
+            await self._put(texts, (index, text), "pipeline.summary_queue_wait")
+    
+    async def _summarize_stage(self, paths: List[Path], results: List[BatchResult], texts: "asyncio.Queue",
+                               summaries: "asyncio.Queue", summarizer: "AzureOpenAISummarizer"):
+        """Summarize extracted texts until the extraction stage is done."""
+        loop = asyncio.get_running_loop()
+        tree = None
+        if self.incremental:
+            from ..summarizers.summary_tree import TreeSummarizer
+            tree = TreeSummarizer(summarizer)
+        while True:
+            item = await texts.get()
+            if item is None:
+                return
+            index, text = item
+            path, result = paths[index], results[index]
+            started = time.perf_counter()
+            try:
+                with span("summarize", file=path.name):
+                    if tree is not None:
+                        # The tree's requests are synchronous, so they run in a thread
+                        summary = await loop.run_in_executor(None, tree.summarize, text, None, self.use_cache)
+                    else:
+                        summary = await summarizer.asummarize(text, use_cache=self.use_cache)
+            except SummarizationError as e:
+                result.error = str(e)
+                result.retryable = e.retryable
+                self.logger.error(f"Failed to summarize '{path}': {e}")
+                continue
+            except Exception as e:
+                result.error = str(e)
+                self.logger.error(f"Failed to process '{path}': {e}")
+                continue
+            finally:
+                result.summarize_seconds = time.perf_counter() - started
+            await self._put(summaries, (index, summary), "pipeline.write_queue_wait")
+    
+    async def _write_stage(self, paths: List[Path], results: List[BatchResult], summaries: "asyncio.Queue"):
+        """Save summaries next to their documents until the summarization stage is done."""
+        loop = asyncio.get_running_loop()
+        while True:
+            item = await summaries.get()
+            if item is None:
+                return
+            index, summary = item
+            path, result = paths[index], results[index]
+            output_path = generate_output_path(path)
+            try:
+                with span("write_output", file=path.name):
+                    # File I/O runs in a thread so it never stalls the summarizer tasks
+                    await loop.run_in_executor(None, save_text_to_file, summary, output_path)
+            except Exception as e:
+                result.error = str(e)
+                self.logger.error(f"Failed to save the summary of '{path}': {e}")
+                continue
+            result.output_path = str(output_path)
+            result.status = "ok"
+            self.logger.info(f"Summarized '{path}' -> '{output_path}'")
+    
+    @staticmethod
+    async def _put(queue: "asyncio.Queue", item: Any, wait_span: str):
+        """Put an item on a bounded queue, recording how long a full queue held the stage back."""
+        if not queue.full():
+            queue.put_nowait(item)
+            return
+        started = time.perf_counter()
+        await queue.put(item)
+        metrics.record_span(wait_span, time.perf_counter() - started)
+        increment("pipeline.backpressure_waits")
+    
+    def _write_results(self, results: List[BatchResult], results_path: Path, started_at: datetime):
+        """Write the batch result manifest as JSON."""
+        succeeded = sum(1 for result in results if result.status == "ok")
+        manifest = {
+            "started_at": started_at.isoformat(),
+            "finished_at": datetime.now(timezone.utc).isoformat(),
+            "total": len(results),
+            "succeeded": succeeded,
+            "failed": len(results) - succeeded,
+            "results": [asdict(result) for result in results],
+        }
+        results_path.parent.mkdir(parents=True, exist_ok=True)
+        results_path.write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+        self.logger.info(f"Batch results written to '{results_path}'")
@@ -0,0 +1,175 @@
+"""Text extraction orchestration across the available extractors."""
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from config.settings import AppConfig
+from ..extractors.base import ExtractionError
+from ..extractors.preflight import ROUTE_OCR, ROUTE_TEXT, probe_pdf
+from ..extractors.registry import create_extractor
+from ..utils.cache import ExtractionCache
+from ..utils.logger import setup_logger
+from ..utils.metrics import increment, metrics, span
+
+
+# Extractors the pipeline may use, by registry name
+PIPELINE_EXTRACTORS = ("unstructured", "ocr", "hybrid")
+
+# Counters of pages lost during extraction; text extracted with losses is not cached
+DEGRADED_EXTRACTION_COUNTERS = ("ocr.page_failures", "hybrid.ocr_failures")
+
+
+def choose_extraction_route(file_path: Path) -> Optional[str]:
+    """Probe a PDF's text layer to pick an extraction route up front.
+    
+    Args:
+        file_path: Path to the document
+        
+    Returns:
+        The preflight route, or None when the probe is disabled, does not
+        apply to the file type or fails
+    """
+    logger = setup_logger(__name__)
+    
+    if not AppConfig.EXTRACTION_PREFLIGHT or file_path.suffix.lower() != '.pdf':
+        return None
+    
+    try:
+        with span("extraction.preflight", file=file_path.name) as attributes:
+            route = probe_pdf(file_path).route
+            attributes["route"] = route
+        return route
+    except Exception as e:
+        logger.warning(f"Preflight probe failed ({e}). Using default extraction order...")
+        return None
+
+
+def extraction_settings() -> Dict[str, Any]:
+    """Collect every setting that can change the text extracted from a document.
+    
+    Returns:
+        JSON-serializable mapping of extraction settings and extractor versions
+    """
+    extractors = [create_extractor(name) for name in PIPELINE_EXTRACTORS]
+    return {
+        "mode": AppConfig.EXTRACTION_MODE,
+        "preflight": AppConfig.EXTRACTION_PREFLIGHT,
+        "min_text_length": AppConfig.OCR_MIN_TEXT_LENGTH,
+        "extractors": {
+            extractor.name: {"version": extractor.version, **extractor.get_settings()}
+            for extractor in extractors
+        },
+    }
+
+
+def warm_up_extractors():
+    """Import every extractor's dependencies so the first document is not slowed down."""
+    logger = setup_logger(__name__)
+    for name in PIPELINE_EXTRACTORS:
+        try:
+            create_extractor(name).warm_up()
+        except ImportError as e:
+            logger.warning(f"Could not warm up the '{name}' extractor: {e}")
+
+
+def extract_text_from_document(file_path: Path, use_cache: bool = True) -> str:
+    """Extract text from document using multiple extraction methods.
+    
+    Results are cached on disk by file content and extraction settings, so
+    re-running the same document skips partitioning and OCR entirely. Text
+    that is missing pages because OCR failed on them is not cached.
+    
+    Args:
+        file_path: Path to the document
+        use_cache: Set to False to bypass the extraction cache
+        
+    Returns:
+        Extracted text
+        
+    Raises:
+        ExtractionError: If all extraction methods fail
+    """
+    logger = setup_logger(__name__)
+    
+    if not (use_cache and AppConfig.EXTRACTION_CACHE_ENABLED):
+        return _extract_text_uncached(file_path)
+    
+    cache = ExtractionCache()
+    try:
+        cache_key = cache.make_key(file_path, extraction_settings())
+    except OSError as e:
+        logger.warning(f"Could not compute extraction cache key ({e}). Skipping cache...")
+        return _extract_text_uncached(file_path)
+    
+    cached_text = cache.get(cache_key)
+    if cached_text is not None:
+        increment("extraction.cache_hits")
+        logger.info(f"Loaded extracted text from cache ({len(cached_text)} chars)")
+        return cached_text
+    increment("extraction.cache_misses")
+    
+    failures_before = _extraction_failures()
+    extracted_text = _extract_text_uncached(file_path)
+    if _extraction_failures() > failures_before:
+        # A transient OCR failure would otherwise lose those pages for as long as the entry is cached
+        increment("extraction.cache_skipped_degraded")
+        logger.warning("Some pages could not be extracted. Not caching the result, so they are retried next time...")
+        return extracted_text
+    cache.set(cache_key, extracted_text)
+    return extracted_text
+
+
+def _extraction_failures() -> float:
+    """Pages lost to extraction failures so far in this process."""
+    return sum(metrics.counter(name) for name in DEGRADED_EXTRACTION_COUNTERS)
+
+
+def _extract_text_uncached(file_path: Path) -> str:
+    """Run the extraction methods in order without consulting the cache."""
+    logger = setup_logger(__name__)
+    route = choose_extraction_route(file_path)
+    ocr_extractor = create_extractor("ocr")
+    ocr_attempted = False
+    
+    if route == ROUTE_OCR:
+        # Scanned document: unstructured would only find the same empty text layer
+        logger.info("No text layer found. Skipping unstructured and running OCR directly...")
+        ocr_attempted = True
+        try:
+            extracted_text = ocr_extractor.extract(file_path)
+            logger.info("Successfully extracted text using OCR")
+            return extracted_text
+        except ExtractionError:
+            logger.warning("OCR extraction failed. Trying unstructured...")
+    
+    elif AppConfig.EXTRACTION_MODE == "page" and route != ROUTE_TEXT:
+        hybrid_extractor = create_extractor("hybrid")
+        if hybrid_extractor.can_extract(file_path):
+            extracted_text = hybrid_extractor.extract(file_path)
+            logger.info("Successfully extracted text using page-level hybrid extraction")
+            return extracted_text
+    
+    # Try unstructured first
+    text_extractor = create_extractor("unstructured")
+    try:
+        extracted_text = text_extractor.extract(file_path)
+        
+        # Check if extracted text is sufficient
+        if len(extracted_text.strip()) >= AppConfig.OCR_MIN_TEXT_LENGTH or ocr_attempted:
+            logger.info("Successfully extracted text using unstructured library")
+            return extracted_text
+        else:
+            logger.warning(f"Extracted text too short ({len(extracted_text)} chars). Trying OCR...")
+    
+    except ExtractionError:
+        logger.warning("Unstructured extraction failed. Trying OCR...")
+    
+    # Fallback to OCR
+    if ocr_extractor.can_extract(file_path) and not ocr_attempted:
+        try:
+            extracted_text = ocr_extractor.extract(file_path)
+            logger.info("Successfully extracted text using OCR")
+            return extracted_text
+        except ExtractionError:
+            logger.error("OCR extraction also failed")
+    
+    raise ExtractionError("All extraction methods failed")
@@ -0,0 +1,107 @@
+"""Incremental summarization of documents that are revised over time."""
+import hashlib
+import json
+from pathlib import Path
+from typing import TYPE_CHECKING, List, Optional, Tuple
+
+from .extraction import choose_extraction_route, extract_text_from_document, extraction_settings
+from ..extractors.base import ExtractionError
+from ..extractors.preflight import ROUTE_OCR
+from ..extractors.registry import create_extractor
+from ..summarizers.registry import create_summarizer
+from ..summarizers.summary_tree import SummaryTreeStore, TreeReport, TreeSummarizer
+from ..utils.logger import setup_logger
+from ..utils.metrics import increment, span
+from ..utils.pdf_utils import get_page_fingerprints
+
+if TYPE_CHECKING:
+    from ..summarizers.azure_openai_summarizer import AzureOpenAISummarizer
+
+
+def extract_units(file_path: Path, store: SummaryTreeStore, use_cache: bool = True) -> Tuple[List[str], int]:
+    """Extract a document as the units of its summary tree.
+    
+    A PDF's units are its pages. Each page is keyed by a fingerprint of its
+    content and the extraction settings, and only pages whose text is not
+    stored yet are extracted (and OCR'd), so a revision costs extraction of
+    its changed pages only. Pages without text are not stored and are
+    extracted again on the next run. Other documents, and PDFs that cannot be
+    fingerprinted, are extracted whole and split into blocks.
+    
+    Args:
+        file_path: Path to the document
+        store: Store holding the page texts of earlier extractions
+        use_cache: Set to False to extract every page again (results are still stored)
+    
+    Returns:
+        Tuple of (units in document order, number of units extracted now)
+    
+    Raises:
+        ExtractionError: If extraction fails
+    """
+    logger = setup_logger(__name__)
+    
+    fingerprints = None
+    if file_path.suffix.lower() == '.pdf':
+        try:
+            with span("tree.fingerprint", file=file_path.name):
+                fingerprints = get_page_fingerprints(file_path)
+        except Exception as e:
+            logger.warning(f"Could not fingerprint the pages of '{file_path}' ({e}). Extracting it whole...")
+    
+    if not fingerprints:
+        text = extract_text_from_document(file_path, use_cache=use_cache)
+        units = [block for block in text.split("\n\n") if block.strip()]
+        return units, len(units)
+    
+    route = choose_extraction_route(file_path)
+    settings = json.dumps({"extraction": extraction_settings(), "route": route}, sort_keys=True, default=str)
+    keys = [
+        hashlib.sha256(f"{fingerprint}\n{settings}".encode("utf-8")).hexdigest() for fingerprint in fingerprints
+    ]
+    stored = store.get_pages(keys) if use_cache else {}
+    missing = [page_number for page_number, key in enumerate(keys, start=1) if key not in stored]
+    increment("tree.pages_reused", len(keys) - len(missing))
+    
+    if missing:
+        logger.info(f"Extracting {len(missing)}/{len(keys)} pages that changed or are new...")
+        extractor = create_extractor("ocr" if route == ROUTE_OCR else "hybrid")
+        pages = extractor.extract_pages(file_path, missing)
+        new_pages = {keys[page_number - 1]: pages.get(page_number, "") for page_number in missing}
+        # Pages that came back empty may have been skipped by a failed OCR run; they are retried next time
+        store.set_pages({key: text for key, text in new_pages.items() if text.strip()})
+        stored = {**stored, **new_pages}
+        increment("tree.pages_extracted", len(missing))
+    return [stored[key] for key in keys], len(missing)
+
+
+def summarize_document_incremental(file_path: Path, summarizer: Optional["AzureOpenAISummarizer"] = None,
+                                   store: Optional[SummaryTreeStore] = None, custom_prompt: Optional[str] = None,
+                                   use_cache: bool = True) -> Tuple[str, TreeReport]:
+    """Extract and summarize a document, reusing whatever an earlier revision shares with it.
+    
+    Args:
+        file_path: Path to the document
+        summarizer: Summarizer to use (default: the configured one)
+        store: Summary tree store (default: ``AppConfig.SUMMARY_TREE_PATH``)
+        custom_prompt: Optional custom prompt for the final summary
+        use_cache: Set to False to extract and summarize everything again
+    
+    Returns:
+        Tuple of (summary, report of what was reused)
+    
+    Raises:
+        ExtractionError: If extraction fails
+        SummarizationError: If summarization fails
+    """
+    store = store or SummaryTreeStore()
+    report = TreeReport()
+    with span("extract", file=file_path.name):
+        units, report.units_extracted = extract_units(file_path, store, use_cache)
+    if not any(unit.strip() for unit in units):
+        raise ExtractionError("The document appears empty or contains no extractable text.")
+    
+    tree = TreeSummarizer(summarizer or create_summarizer(), store)
+    with span("summarize", file=file_path.name):
+        summary = tree.summarize(units, custom_prompt, use_cache=use_cache, report=report)
+    return summary, report
@@ -0,0 +1,331 @@
+"""Lease-based job queue shared by summarization workers on several machines."""
+import importlib
+import sqlite3
+import time
+import uuid
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from config.settings import AppConfig
+from ..utils.logger import setup_logger
+from ..utils.metrics import increment
+
+
+JOB_PENDING = "pending"
+JOB_LEASED = "leased"
+JOB_DONE = "done"
+JOB_FAILED = "failed"
+JOB_STATUSES = (JOB_PENDING, JOB_LEASED, JOB_DONE, JOB_FAILED)
+
+
+@dataclass
+class QueuedJob:
+    """A document in the queue, as leased by a worker."""
+    
+    id: int
+    path: str
+    status: str
+    attempts: int = 0
+    lease_owner: Optional[str] = None
+    lease_token: Optional[str] = None
+    lease_expires_at: Optional[float] = None
+    output_path: Optional[str] = None
+    error: Optional[str] = None
+
+
+class BaseJobQueue(ABC):
+    """Work queue of documents, shared by any number of worker processes.
+    
+    Workers lease jobs for ``lease_seconds`` and renew the lease with
+    heartbeats while they work. When a worker dies, its leases expire and
+    the jobs are handed to other workers. Every lease has its own token,
+    and results are only recorded for the current lease, so a worker that
+    lost its lease cannot overwrite the outcome of the job's new owner.
+    """
+    
+    def __init__(self, lease_seconds: Optional[float] = None, max_attempts: Optional[int] = None,
+                 retry_delay: Optional[float] = None):
+        self.lease_seconds = lease_seconds or AppConfig.JOB_LEASE_SECONDS
+        self.max_attempts = max(1, max_attempts or AppConfig.JOB_MAX_ATTEMPTS)
+        self.retry_delay = AppConfig.JOB_RETRY_DELAY if retry_delay is None else retry_delay
+    
+    @abstractmethod
+    def enqueue(self, paths: Iterable[str]) -> int:
+        """Add documents to the queue.
+        
+        Documents already in the queue are left alone, except failed ones,
+        which are queued again with a fresh attempt count.
+        
+        Returns:
+            Number of documents queued
+        """
+    
+    @abstractmethod
+    def lease(self, owner: str, limit: int = 1) -> List[QueuedJob]:
+        """Lease up to ``limit`` jobs that are pending or whose lease expired."""
+    
+    @abstractmethod
+    def heartbeat(self, jobs: List[QueuedJob]) -> int:
+        """Extend the leases of jobs.
+        
+        Returns:
+            Number of leases still held
+        """
+    
+    @abstractmethod
+    def complete(self, job: QueuedJob, output_path: Optional[str]) -> bool:
+        """Record a job as done. Returns False if the lease was lost."""
+    
+    @abstractmethod
+    def fail(self, job: QueuedJob, error: str, retryable: bool = True) -> bool:
+        """Record a failed attempt; the job is retried until it runs out of attempts.
+        
+        Returns False if the lease was lost.
+        """
+    
+    @abstractmethod
+    def release(self, jobs: List[QueuedJob]) -> None:
+        """Give leased jobs back without counting the attempt, e.g. on shutdown."""
+    
+    @abstractmethod
+    def counts(self) -> Dict[str, int]:
+        """Return the number of jobs in each status."""
+    
+    def is_drained(self) -> bool:
+        """Whether no job is pending or leased."""
+        counts = self.counts()
+        return not counts.get(JOB_PENDING) and not counts.get(JOB_LEASED)
+
+
+class SQLiteJobQueue(BaseJobQueue):
+    """Job queue in a SQLite database, e.g. on a filesystem shared by every node.
+    
+    Jobs are leased inside ``BEGIN IMMEDIATE`` transactions, so SQLite's file
+    lock guarantees that only one worker gets each job. The database uses
+    the rollback journal instead of WAL, because WAL needs shared memory
+    and does not work across machines on a network filesystem. Lease expiry
+    is based on each node's clock, so nodes should run NTP; a few seconds of
+    skew are harmless next to the lease duration.
+    """
+    
+    def __init__(self, db_path: Optional[str] = None, **kwargs):
+        super().__init__(**kwargs)
+        self.logger = setup_logger(__name__)
+        self.db_path = Path(db_path or AppConfig.JOB_QUEUE_PATH)
+        self._initialize_db()
+    
+    def _connect(self) -> sqlite3.Connection:
+        # Transactions are managed explicitly, so leasing can hold the write lock from its first read
+        return sqlite3.connect(str(self.db_path), timeout=60, isolation_level=None)
+    
+    def _initialize_db(self):
+        """Create the jobs table if it does not exist."""
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        conn = self._connect()
+        try:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS jobs ("
+                " id INTEGER PRIMARY KEY AUTOINCREMENT,"
+                " path TEXT NOT NULL UNIQUE,"
+                " status TEXT NOT NULL,"
+                " attempts INTEGER NOT NULL DEFAULT 0,"
+                " available_at REAL NOT NULL,"
+                " lease_owner TEXT,"
+                " lease_token TEXT,"
+                " lease_expires_at REAL,"
+                " output_path TEXT,"
+                " error TEXT,"
+                " enqueued_at REAL NOT NULL,"
+                " updated_at REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, available_at)")
+        finally:
+            conn.close()
+    
+    def _transaction(self, conn: sqlite3.Connection, statements) -> None:
+        """Run ``statements(conn)`` in an immediate (write-locked) transaction."""
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            statements(conn)
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+    
+    def enqueue(self, paths: Iterable[str]) -> int:
+        now = time.time()
+        rows = [(str(Path(path).resolve()), now, now, now) for path in paths]
+        queued = 0
+        
+        def statements(conn):
+            nonlocal queued
+            before = conn.total_changes
+            conn.executemany(
+                "INSERT INTO jobs (path, status, available_at, enqueued_at, updated_at) VALUES (?, 'pending', ?, ?, ?)"
+                " ON CONFLICT (path) DO UPDATE SET status = 'pending', attempts = 0, error = NULL,"
+                " available_at = excluded.available_at, updated_at = excluded.updated_at"
+                " WHERE jobs.status = 'failed'",
+                rows,
+            )
+            queued = conn.total_changes - before
+        
+        conn = self._connect()
+        try:
+            self._transaction(conn, statements)
+        finally:
+            conn.close()
+        return queued
+    
+    def lease(self, owner: str, limit: int = 1) -> List[QueuedJob]:
+        now = time.time()
+        expires_at = now + self.lease_seconds
+        leased: List[QueuedJob] = []
+        
+        def statements(conn):
+            # Leases that expired on their last attempt mean the document keeps killing its worker
+            conn.execute(
+                "UPDATE jobs SET status = 'failed', error = 'Lease expired on the last attempt',"
+                " lease_owner = NULL, lease_token = NULL, lease_expires_at = NULL, updated_at = ?"
+                " WHERE status = 'leased' AND lease_expires_at < ? AND attempts >= ?",
+                (now, now, self.max_attempts),
+            )
+            rows = conn.execute(
+                "SELECT id, path, status, attempts FROM jobs"
+                " WHERE (status = 'pending' AND available_at <= ?) OR (status = 'leased' AND lease_expires_at < ?)"
+                " ORDER BY id LIMIT ?",
+                (now, now, limit),
+            ).fetchall()
+            for job_id, path, status, attempts in rows:
+                if status == JOB_LEASED:
+                    increment("queue.reclaimed")
+                    self.logger.warning(f"Reclaiming '{path}' from an expired lease")
+                token = uuid.uuid4().hex
+                conn.execute(
+                    "UPDATE jobs SET status = 'leased', attempts = attempts + 1, lease_owner = ?, lease_token = ?,"
+                    " lease_expires_at = ?, updated_at = ? WHERE id = ?",
+                    (owner, token, expires_at, now, job_id),
+                )
+                leased.append(QueuedJob(id=job_id, path=path, status=JOB_LEASED, attempts=attempts + 1,
+                                        lease_owner=owner, lease_token=token, lease_expires_at=expires_at))
+        
+        conn = self._connect()
+        try:
+            self._transaction(conn, statements)
+        finally:
+            conn.close()
+        increment("queue.leased", len(leased))
+        return leased
+    
+    def _update_leased(self, sql: str, params: List[Tuple]) -> int:
+        """Run an update guarded by ``lease_token = ?`` (the last parameter) and return the rows changed."""
+        if not params:
+            return 0
+        conn = self._connect()
+        try:
+            before = conn.total_changes
+            self._transaction(conn, lambda c: c.executemany(sql, params))
+            return conn.total_changes - before
+        finally:
+            conn.close()
+    
+    def heartbeat(self, jobs: List[QueuedJob]) -> int:
+        now = time.time()
+        expires_at = now + self.lease_seconds
+        held = self._update_leased(
+            "UPDATE jobs SET lease_expires_at = ?, updated_at = ?"
+            " WHERE id = ? AND status = 'leased' AND lease_token = ?",
+            [(expires_at, now, job.id, job.lease_token) for job in jobs],
+        )
+        for job in jobs:
+            job.lease_expires_at = expires_at
+        return held
+    
+    def complete(self, job: QueuedJob, output_path: Optional[str]) -> bool:
+        now = time.time()
+        done = self._update_leased(
+            "UPDATE jobs SET status = 'done', output_path = ?, error = NULL, lease_owner = NULL, lease_token = NULL,"
+            " lease_expires_at = NULL, updated_at = ? WHERE id = ? AND status = 'leased' AND lease_token = ?",
+            [(output_path, now, job.id, job.lease_token)],
+        )
+        if done:
+            increment("queue.completed")
+        return bool(done)
+    
+    def fail(self, job: QueuedJob, error: str, retryable: bool = True) -> bool:
+        now = time.time()
+        final = not retryable or job.attempts >= self.max_attempts
+        # Back off linearly with the number of attempts, so a flaky document does not hog the workers
+        available_at = now + self.retry_delay * job.attempts
+        failed = self._update_leased(
+            "UPDATE jobs SET status = ?, error = ?, available_at = ?, lease_owner = NULL, lease_token = NULL,"
+            " lease_expires_at = NULL, updated_at = ? WHERE id = ? AND status = 'leased' AND lease_token = ?",
+            [(JOB_FAILED if final else JOB_PENDING, error, available_at, now, job.id, job.lease_token)],
+        )
+        if failed:
+            increment("queue.failed" if final else "queue.retried")
+        return bool(failed)
+    
+    def release(self, jobs: List[QueuedJob]) -> None:
+        now = time.time()
+        self._update_leased(
+            "UPDATE jobs SET status = 'pending', attempts = attempts - 1, available_at = ?, lease_owner = NULL,"
+            " lease_token = NULL, lease_expires_at = NULL, updated_at = ?"
+            " WHERE id = ? AND status = 'leased' AND lease_token = ?",
+            [(now, now, job.id, job.lease_token) for job in jobs],
+        )
+    
+    def counts(self) -> Dict[str, int]:
+        conn = self._connect()
+        try:
+            rows = conn.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall()
+        finally:
+            conn.close()
+        return {status: count for status, count in rows}
+    
+    def failures(self) -> List[QueuedJob]:
+        """Return the jobs that ran out of attempts."""
+        conn = self._connect()
+        try:
+            rows = conn.execute(
+                "SELECT id, path, status, attempts, error FROM jobs WHERE status = 'failed' ORDER BY id"
+            ).fetchall()
+        finally:
+            conn.close()
+        return [QueuedJob(id=row[0], path=row[1], status=row[2], attempts=row[3], error=row[4]) for row in rows]
+
+
+# Backend name -> (module, class), imported on first use like the extractor registry
+JOB_QUEUES: Dict[str, Tuple[str, str]] = {
+    "sqlite": (".job_queue", "SQLiteJobQueue"),
+}
+
+
+def register_job_queue(name: str, module: str, class_name: str):
+    """Register a job queue backend by import path without importing it.
+    
+    Args:
+        name: Name the backend is selected by (``JOB_QUEUE_BACKEND``)
+        module: Module path, absolute or relative to this package
+        class_name: ``BaseJobQueue`` subclass whose first argument is the queue location
+    """
+    JOB_QUEUES[name] = (module, class_name)
+
+
+def create_job_queue(location: Optional[str] = None, backend: Optional[str] = None, **kwargs) -> BaseJobQueue:
+    """Create the job queue of a backend.
+    
+    Args:
+        location: Where the queue lives, e.g. the SQLite file (default: ``AppConfig.JOB_QUEUE_PATH``)
+        backend: Backend name (default: ``AppConfig.JOB_QUEUE_BACKEND``)
+    
+    Raises:
+        ValueError: If no backend is registered under the name
+    """
+    backend = backend or AppConfig.JOB_QUEUE_BACKEND
+    if backend not in JOB_QUEUES:
+        raise ValueError(f"Unknown job queue backend '{backend}'. Available: {', '.join(JOB_QUEUES)}")
+    module, class_name = JOB_QUEUES[backend]
+    queue_class = getattr(importlib.import_module(module, __package__), class_name)
+    return queue_class(location or AppConfig.JOB_QUEUE_PATH, **kwargs)
@@ -0,0 +1,149 @@
+"""SQLite index of the documents that have already been summarized."""
+import hashlib
+import json
+import sqlite3
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, Optional
+
+from config.settings import AppConfig, AzureOpenAIConfig
+from .extraction import extraction_settings
+from ..utils.logger import setup_logger
+
+
+STATUS_OK = "ok"
+STATUS_FAILED = "failed"
+
+
+@dataclass
+class ManifestEntry:
+    """What the index knows about one document."""
+    
+    path: str
+    size: int
+    mtime_ns: int
+    content_hash: str
+    settings_hash: str
+    status: str
+    output_path: Optional[str] = None
+    error: Optional[str] = None
+    retryable: bool = False
+    processed_at: float = 0.0
+    
+    def is_current(self, size: int, mtime_ns: int, settings_hash: str) -> bool:
+        """Whether the document is unchanged since it was processed with these settings."""
+        return (
+            self.size == size
+            and self.mtime_ns == mtime_ns
+            and self.settings_hash == settings_hash
+            and not (self.status == STATUS_FAILED and self.retryable)
+        )
+
+
+def settings_hash() -> str:
+    """Hash every setting that can change a document's summary.
+    
+    Documents processed under a different hash are summarized again.
+    """
+    settings = {
+        "extraction": extraction_settings(),
+        "summary": {
+            "deployment": AzureOpenAIConfig.DEPLOYMENT,
+            "temperature": AppConfig.SUMMARY_TEMPERATURE,
+            "max_tokens": AppConfig.SUMMARY_MAX_TOKENS,
+            "mode": AppConfig.SUMMARY_MODE,
+            "max_input_tokens": AppConfig.SUMMARY_MAX_INPUT_TOKENS,
+            "chunk_tokens": AppConfig.SUMMARY_CHUNK_TOKENS,
+            "chunk_max_tokens": AppConfig.SUMMARY_CHUNK_MAX_TOKENS,
+            "normalization": [
+                AppConfig.TEXT_NORMALIZATION,
+                AppConfig.NORMALIZE_MIN_REPEATS,
+                AppConfig.NORMALIZE_DEDUPE_SIMILARITY,
+            ],
+        },
+    }
+    return hashlib.sha256(json.dumps(settings, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+class ManifestIndex:
+    """Path-keyed index of processed documents.
+    
+    Each row records a document's size, mtime, content hash, the settings
+    hash it was summarized with and the outcome. Unchanged documents are
+    recognized from their ``stat()`` alone, with one primary-key lookup (or
+    one dict lookup after ``load``), so rescanning a large folder never
+    reads file contents. Like the response cache, a new connection is
+    opened per operation.
+    """
+    
+    def __init__(self, db_path: Optional[str] = None):
+        self.logger = setup_logger(__name__)
+        self.db_path = Path(db_path or AppConfig.WATCH_INDEX_PATH)
+        self._initialize_db()
+    
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(str(self.db_path), timeout=30)
+    
+    def _initialize_db(self):
+        """Create the documents table if it does not exist."""
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS documents ("
+                " path TEXT PRIMARY KEY,"
+                " size INTEGER NOT NULL,"
+                " mtime_ns INTEGER NOT NULL,"
+                " content_hash TEXT NOT NULL,"
+                " settings_hash TEXT NOT NULL,"
+                " status TEXT NOT NULL,"
+                " output_path TEXT,"
+                " error TEXT,"
+                " retryable INTEGER NOT NULL DEFAULT 0,"
+                " processed_at REAL NOT NULL)"
+            )
+    
+    def get(self, path: str) -> Optional[ManifestEntry]:
+        """Return the entry of a document, or None if it was never processed."""
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT path, size, mtime_ns, content_hash, settings_hash, status, output_path, error,"
+                " retryable, processed_at FROM documents WHERE path = ?",
+                (path,),
+            ).fetchone()
+        return ManifestEntry(*row[:8], bool(row[8]), row[9]) if row is not None else None
+    
+    def load(self, prefix: str = "") -> Dict[str, ManifestEntry]:
+        """Return every entry whose path starts with ``prefix``, keyed by path."""
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT path, size, mtime_ns, content_hash, settings_hash, status, output_path, error,"
+                " retryable, processed_at FROM documents WHERE substr(path, 1, ?) = ?",
+                (len(prefix), prefix),
+            ).fetchall()
+        return {row[0]: ManifestEntry(*row[:8], bool(row[8]), row[9]) for row in rows}
+    
+    def record(self, entries: Iterable[ManifestEntry]) -> None:
+        """Insert or replace entries."""
+        now = time.time()
+        with self._connect() as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO documents (path, size, mtime_ns, content_hash, settings_hash, status,"
+                " output_path, error, retryable, processed_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (entry.path, entry.size, entry.mtime_ns, entry.content_hash, entry.settings_hash,
+                     entry.status, entry.output_path, entry.error, int(entry.retryable), entry.processed_at or now)
+                    for entry in entries
+                ],
+            )
+    
+    def touch(self, path: str, size: int, mtime_ns: int) -> None:
+        """Update the stat of a document whose content did not change."""
+        with self._connect() as conn:
+            conn.execute("UPDATE documents SET size = ?, mtime_ns = ? WHERE path = ?", (size, mtime_ns, path))
+    
+    def forget(self, paths: Iterable[str]) -> None:
+        """Remove entries, e.g. of deleted documents."""
+        with self._connect() as conn:
+            conn.executemany("DELETE FROM documents WHERE path = ?", [(path,) for path in paths])
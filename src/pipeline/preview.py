@@ -0,0 +1,310 @@
+"""Budgeted preview summaries of huge documents from a representative subset of their pages."""
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from config.settings import AppConfig
+from .extraction import extract_text_from_document
+from ..extractors.base import ExtractionError
+from ..extractors.preflight import ROUTE_OCR, PageProfile, probe_pdf
+from ..extractors.registry import create_extractor
+from ..summarizers.registry import create_summarizer
+from ..utils.logger import setup_logger
+from ..utils.metrics import increment, span
+from ..utils.pdf_utils import group_page_ranges
+from ..utils.token_utils import CHARS_PER_TOKEN, count_tokens
+
+if TYPE_CHECKING:
+    from ..summarizers.azure_openai_summarizer import AzureOpenAISummarizer
+
+
+# Why a page was selected, in the order the reasons are tried
+REASON_FRONT = "front matter"
+REASON_SECTION = "section start"
+REASON_FIGURE = "table/figure"
+REASON_SAMPLE = "sample"
+
+
+@dataclass
+class PreviewCoverage:
+    """Which parts of a document a preview summary is based on."""
+    
+    total_units: int
+    unit: str = "pages"
+    selected: Dict[int, str] = field(default_factory=dict)  # unit number -> reason, in priority order
+    included: List[int] = field(default_factory=list)
+    estimated_tokens: int = 0  # of the whole document
+    included_tokens: int = 0
+    stopped_by: Optional[str] = None  # "time" or "token" when a budget cut the preview short
+    elapsed_seconds: float = 0.0
+    
+    @property
+    def ratio(self) -> float:
+        return len(self.included) / self.total_units if self.total_units else 1.0
+    
+    def skipped_ranges(self) -> List[Tuple[int, int]]:
+        """Ranges of units the summary does not cover."""
+        included = set(self.included)
+        return group_page_ranges(n for n in range(1, self.total_units + 1) if n not in included)
+    
+    def describe(self) -> str:
+        """Human-readable coverage report."""
+        counts: Dict[str, int] = {}
+        for number in self.included:
+            reason = self.selected.get(number, REASON_SAMPLE)
+            counts[reason] = counts.get(reason, 0) + 1
+        lines = [
+            f"Preview coverage: {len(self.included)} of {self.total_units} {self.unit} ({self.ratio:.0%}), "
+            f"about {self.included_tokens} of {self.estimated_tokens} tokens, in {self.elapsed_seconds:.1f}s",
+            "Selected: " + ", ".join(f"{count} {reason}" for reason, count in counts.items()),
+        ]
+        if self.stopped_by:
+            lines.append(f"Stopped early: the {self.stopped_by} budget was reached")
+        skipped = self.skipped_ranges()
+        if skipped:
+            lines.append("Not covered: " + ", ".join(
+                str(first) if first == last else f"{first}-{last}" for first, last in skipped
+            ))
+        return "\n".join(lines)
+
+
+def spread_order(count: int) -> List[int]:
+    """Indices 0..count-1 ordered so that every prefix is spread evenly (0, 1/2, 1/4, 3/4, ...)."""
+    order: List[int] = []
+    seen = set()
+    denominator = 1
+    while len(order) < count:
+        for numerator in range(denominator):
+            index = numerator * count // denominator
+            if index not in seen:
+                seen.add(index)
+                order.append(index)
+        denominator *= 2
+    return order
+
+
+def _take_turns(sources: List[Tuple[List[int], str]]) -> Iterator[Tuple[int, str]]:
+    """Yield (page, reason) from each source in turn until all are exhausted."""
+    iterators = [(iter(pages), reason) for pages, reason in sources]
+    while iterators:
+        remaining = []
+        for pages, reason in iterators:
+            page = next(pages, None)
+            if page is not None:
+                remaining.append((pages, reason))
+                yield page, reason
+        iterators = remaining
+
+
+def _estimate_page_tokens(profile: PageProfile) -> int:
+    """Estimate a page's tokens from its text layer, or assume a typical page if it must be OCR'd."""
+    # The hybrid extractor OCRs pages whose text layer is shorter than this
+    if profile.has_text_layer() and profile.text_chars >= AppConfig.OCR_MIN_PAGE_TEXT_LENGTH:
+        return max(1, profile.text_chars // CHARS_PER_TOKEN)
+    return AppConfig.PREVIEW_OCR_PAGE_TOKENS
+
+
+def _outline_pages(file_path: Path) -> List[int]:
+    """Return the first pages of the sections in a PDF's outline (bookmarks), if it has one."""
+    from pypdf import PdfReader
+    
+    reader = PdfReader(str(file_path))
+    pages = set()
+    stack = list(reader.outline)
+    while stack:
+        item = stack.pop()
+        if isinstance(item, list):
+            stack.extend(item)
+            continue
+        try:
+            page_index = reader.get_destination_page_number(item)
+        except Exception:
+            continue
+        if page_index is not None and page_index >= 0:
+            pages.add(page_index + 1)
+    return sorted(pages)
+
+
+def plan_pages(profiles: List[PageProfile], section_pages: Iterable[int], max_tokens: int) -> Dict[int, str]:
+    """Choose the pages a preview is built from, most important first.
+    
+    The first ``PREVIEW_FRONT_PAGES`` pages come first. After them, section
+    starts from the outline, pages with tables or figures (densest first)
+    and evenly spaced samples take turns, so a tight budget still gets some
+    of each. Pages are added while their estimated tokens fit ``max_tokens``.
+    
+    Returns:
+        Mapping of page number to selection reason, in priority order
+    """
+    total = len(profiles)
+    estimates = {profile.page_number: _estimate_page_tokens(profile) for profile in profiles}
+    
+    sections = [page for page in section_pages if 1 <= page <= total]
+    sections = [sections[index] for index in spread_order(len(sections))]
+    # The image on a page without a text layer is the scan itself, not a figure
+    visual = {
+        profile.page_number: profile.rect_count + AppConfig.PREVIEW_TABLE_MIN_RECTS * (
+            profile.image_count if profile.has_text_layer() else 0
+        )
+        for profile in profiles
+    }
+    figures = sorted(
+        (page for page, score in visual.items() if score >= AppConfig.PREVIEW_TABLE_MIN_RECTS),
+        key=lambda page: -visual[page],
+    )
+    samples = [index + 1 for index in spread_order(total)]
+    
+    front = [(page, REASON_FRONT) for page in range(1, min(AppConfig.PREVIEW_FRONT_PAGES, total) + 1)]
+    selected: Dict[int, str] = {}
+    tokens = 0
+    turns = _take_turns([(sections, REASON_SECTION), (figures, REASON_FIGURE), (samples, REASON_SAMPLE)])
+    for page, reason in [*front, *turns]:
+        if page in selected or tokens + estimates[page] > max_tokens:
+            continue
+        selected[page] = reason
+        tokens += estimates[page]
+    return selected
+
+
+def _extract_preview_pages(file_path: Path, pages: List[int], route: Optional[str], deadline: Optional[float],
+                           coverage: PreviewCoverage) -> Dict[int, str]:
+    """Extract the planned pages in priority order, batch by batch, until the time budget runs out.
+    
+    Only the pages of the batches that are started are partitioned or OCR'd.
+    """
+    logger = setup_logger(__name__)
+    extractor = create_extractor("ocr" if route == ROUTE_OCR else "hybrid")
+    batch_size = max(1, AppConfig.PREVIEW_BATCH_PAGES)
+    texts: Dict[int, str] = {}
+    seconds_per_page = 0.0
+    started = time.monotonic()
+    
+    for start in range(0, len(pages), batch_size):
+        batch = pages[start:start + batch_size]
+        if texts and deadline is not None and time.monotonic() + seconds_per_page * len(batch) > deadline:
+            coverage.stopped_by = "time"
+            logger.info(f"Time budget reached after extracting {len(texts)} of {len(pages)} planned pages")
+            break
+        texts.update(extractor.extract_pages(file_path, batch))
+        seconds_per_page = (time.monotonic() - started) / len(texts)
+    return texts
+
+
+def build_preview(file_path: Path, max_seconds: float, max_tokens: int) -> Tuple[str, PreviewCoverage]:
+    """Extract a representative subset of a document within a time and token budget.
+    
+    PDFs are profiled page by page without extracting them (see
+    ``probe_pdf``), the pages to read are planned with ``plan_pages``, and
+    only those pages are partitioned or OCR'd, most important first, while
+    ``PREVIEW_EXTRACTION_SHARE`` of the time budget lasts. The remaining
+    time is left for the summary. Other documents are extracted whole and
+    their text blocks are sampled the same way.
+    
+    Args:
+        file_path: Path to the document
+        max_seconds: Wall-clock budget for the whole preview, 0 for none
+        max_tokens: Budget for the excerpts sent to the LLM, 0 for none
+    
+    Returns:
+        Tuple of (excerpts in document order, each headed by its page number, coverage)
+    
+    Raises:
+        ExtractionError: If extraction fails
+    """
+    logger = setup_logger(__name__)
+    started = time.monotonic()
+    deadline = started + max_seconds * AppConfig.PREVIEW_EXTRACTION_SHARE if max_seconds > 0 else None
+    token_budget = max_tokens if max_tokens > 0 else float("inf")
+    
+    if file_path.suffix.lower() == '.pdf':
+        with span("preview.plan", file=file_path.name) as attributes:
+            try:
+                preflight = probe_pdf(file_path)
+            except Exception as e:
+                raise ExtractionError(f"Could not profile the pages of '{file_path}': {e}") from e
+            try:
+                section_pages = _outline_pages(file_path)
+            except Exception as e:
+                logger.warning(f"Could not read the outline of '{file_path}' ({e}). Sampling without it...")
+                section_pages = []
+            coverage = PreviewCoverage(
+                total_units=len(preflight.pages),
+                estimated_tokens=sum(_estimate_page_tokens(profile) for profile in preflight.pages),
+            )
+            coverage.selected = plan_pages(preflight.pages, section_pages, token_budget)
+            attributes.update(pages=coverage.total_units, selected=len(coverage.selected))
+        if len(coverage.selected) < coverage.total_units:
+            coverage.stopped_by = "token"
+        texts = _extract_preview_pages(file_path, list(coverage.selected), preflight.route, deadline, coverage)
+        label = "Page"
+    else:
+        text = extract_text_from_document(file_path)
+        blocks = [block for block in text.split("\n\n") if block.strip()]
+        coverage = PreviewCoverage(total_units=len(blocks), unit="blocks", estimated_tokens=count_tokens(text))
+        order = list(range(1, min(AppConfig.PREVIEW_FRONT_PAGES, len(blocks)) + 1))
+        order += [index + 1 for index in spread_order(len(blocks)) if index + 1 not in order]
+        tokens = 0
+        for number in order:
+            block_tokens = count_tokens(blocks[number - 1])
+            if tokens + block_tokens <= token_budget:
+                coverage.selected[number] = REASON_FRONT if number <= AppConfig.PREVIEW_FRONT_PAGES else REASON_SAMPLE
+                tokens += block_tokens
+        if len(coverage.selected) < coverage.total_units:
+            coverage.stopped_by = "token"
+        texts = {number: blocks[number - 1] for number in coverage.selected}
+        label = "Block"
+    
+    # Estimates can be off (OCR'd pages, dense tables): drop the least important excerpts until the real text fits
+    included = [number for number in coverage.selected if texts.get(number, "").strip()]
+    tokens = {number: count_tokens(texts[number]) for number in included}
+    while len(included) > 1 and sum(tokens.values()) > token_budget:
+        tokens.pop(included.pop())
+        coverage.stopped_by = "token"
+    
+    coverage.included = sorted(included)
+    coverage.included_tokens = sum(tokens.values())
+    coverage.elapsed_seconds = time.monotonic() - started
+    increment("preview.units_included", len(coverage.included))
+    increment("preview.units_skipped", coverage.total_units - len(coverage.included))
+    excerpts = "\n\n".join(f"[{label} {number}]\n{texts[number].strip()}" for number in coverage.included)
+    return excerpts, coverage
+
+
+def summarize_preview(file_path: Path, max_seconds: Optional[float] = None, max_tokens: Optional[int] = None,
+                      summarizer: Optional["AzureOpenAISummarizer"] = None, custom_prompt: Optional[str] = None,
+                      use_cache: bool = True) -> Tuple[str, PreviewCoverage]:
+    """Summarize a document from a budgeted subset of its pages.
+    
+    Args:
+        file_path: Path to the document
+        max_seconds: Wall-clock budget, defaults to ``AppConfig.PREVIEW_MAX_SECONDS``
+        max_tokens: Budget for the excerpts, defaults to ``AppConfig.PREVIEW_MAX_TOKENS``
+        summarizer: Summarizer to use (default: the configured one)
+        custom_prompt: Optional custom prompt for summarization
+        use_cache: Set to False to always call the API
+    
+    Returns:
+        Tuple of (summary, coverage)
+    
+    Raises:
+        ExtractionError: If extraction fails or finds no text
+        SummarizationError: If summarization fails
+    """
+    max_seconds = AppConfig.PREVIEW_MAX_SECONDS if max_seconds is None else max_seconds
+    max_tokens = AppConfig.PREVIEW_MAX_TOKENS if max_tokens is None else max_tokens
+    started = time.monotonic()
+    
+    with span("extract", file=file_path.name, preview=True):
+        excerpts, coverage = build_preview(file_path, max_seconds, max_tokens)
+    if not excerpts.strip():
+        raise ExtractionError("The sampled pages contain no extractable text.")
+    
+    summarizer = summarizer or create_summarizer()
+    with span("summarize", preview=True):
+        summary = summarizer.summarize_preview(
+            excerpts, f"{len(coverage.included)} of its {coverage.total_units} {coverage.unit}",
+            custom_prompt=custom_prompt, use_cache=use_cache,
+        )
+    coverage.elapsed_seconds = time.monotonic() - started
+    return summary, coverage
@@ -0,0 +1,110 @@
+"""Worker that summarizes the documents of a shared job queue."""
+import os
+import socket
+import threading
+import time
+from pathlib import Path
+from typing import List, Optional
+
+from config.settings import AppConfig
+from .batch import BatchSummarizer
+from .job_queue import BaseJobQueue, QueuedJob
+from ..utils.logger import setup_logger
+from ..utils.metrics import span
+
+
+class _Heartbeat:
+    """Renews the leases of the jobs being worked on from a background thread."""
+    
+    def __init__(self, queue: BaseJobQueue, jobs: List[QueuedJob], interval: float):
+        self.logger = setup_logger(__name__)
+        self.queue = queue
+        self.jobs = jobs
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="lease-heartbeat", daemon=True)
+    
+    def __enter__(self):
+        self._thread.start()
+        return self
+    
+    def __exit__(self, *exc_info):
+        self._stop.set()
+        self._thread.join()
+    
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                held = self.queue.heartbeat(self.jobs)
+            except Exception as e:
+                self.logger.warning(f"Heartbeat failed: {e}")
+                continue
+            if held < len(self.jobs):
+                self.logger.warning(f"Lost the lease of {len(self.jobs) - held} jobs; their results will be discarded")
+
+
+class QueueWorker:
+    """Lease documents from a job queue and summarize them until the queue is empty or forever.
+    
+    Run one worker per machine (its ``BatchSummarizer`` already uses every
+    core for extraction), or several, on as many machines as share the
+    queue. Each worker leases one job per extraction worker at a time, so
+    work stays spread across nodes, and summarizes them through the staged
+    batch pipeline while a heartbeat keeps the leases alive. Summaries are
+    written atomically next to their documents, so a job that is reclaimed
+    and run again after a crash just rewrites the same file.
+    """
+    
+    def __init__(self, queue: BaseJobQueue, batch_summarizer: Optional[BatchSummarizer] = None,
+                 lease_batch: Optional[int] = None, worker_id: Optional[str] = None):
+        self.logger = setup_logger(__name__)
+        self.queue = queue
+        self.batch_summarizer = batch_summarizer or BatchSummarizer()
+        self.lease_batch = max(1, lease_batch or AppConfig.JOB_LEASE_BATCH or self.batch_summarizer.extraction_workers)
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}"
+        self.heartbeat_interval = min(AppConfig.JOB_HEARTBEAT_INTERVAL, queue.lease_seconds / 3)
+        self.poll_interval = AppConfig.JOB_POLL_INTERVAL
+    
+    def run(self, exit_when_empty: bool = False) -> int:
+        """Process jobs until interrupted, or until no job is pending or leased if ``exit_when_empty``.
+        
+        Jobs leased by other workers may still fail and come back, so an
+        exiting worker waits for them to finish before it checks the queue.
+        
+        Returns:
+            Number of jobs this worker completed
+        """
+        completed = 0
+        self.logger.info(f"Worker {self.worker_id} leasing up to {self.lease_batch} jobs at a time")
+        while True:
+            with span("queue.lease"):
+                jobs = self.queue.lease(self.worker_id, self.lease_batch)
+            if not jobs:
+                if exit_when_empty and self.queue.is_drained():
+                    self.logger.info(f"Queue is empty, worker {self.worker_id} completed {completed} jobs")
+                    return completed
+                time.sleep(self.poll_interval)
+                continue
+            completed += self._process(jobs)
+    
+    def _process(self, jobs: List[QueuedJob]) -> int:
+        """Summarize leased jobs and record their outcomes. Returns the number completed."""
+        try:
+            with _Heartbeat(self.queue, jobs, self.heartbeat_interval):
+                results = self.batch_summarizer.run([Path(job.path) for job in jobs])
+        except BaseException:
+            # Hand the jobs to another worker now rather than after their leases expire
+            self.queue.release(jobs)
+            raise
+        
+        completed = 0
+        for job, result in zip(jobs, results):
+            if result.status == "ok":
+                completed += self.queue.complete(job, result.output_path)
+                continue
+            # Only errors known to be permanent skip the retries; extraction errors may be transient
+            if not self.queue.fail(job, result.error or "Unknown error", retryable=result.retryable is not False):
+                self.logger.warning(f"Lease of '{job.path}' was lost, another worker owns it now")
+            elif job.attempts < self.queue.max_attempts and result.retryable is not False:
+                self.logger.info(f"'{job.path}' failed on attempt {job.attempts}, it will be retried")
+        return completed
@@ -0,0 +1,230 @@
+"""HTTP API for the summarization service."""
+import json
+import re
+import uuid
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, Optional
+from urllib.parse import parse_qs, urlparse
+
+from config.settings import AppConfig
+from .service import JOB_FAILED, JOB_SUCCEEDED, SummarizationService
+from ..utils.logger import setup_logger
+from ..utils.metrics import metrics
+
+
+JOB_PATH = re.compile(r"^/jobs/([0-9a-f]+)(/result)?$")
+SAFE_FILENAME = re.compile(r"[^A-Za-z0-9._-]")
+
+
+def _parse_flag(value: Any, name: str) -> bool:
+    """Read a boolean option given as a JSON boolean or as "true"/"false".
+    
+    Raises:
+        ValueError: If the value is anything else
+    """
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, str) and value.strip().lower() in ("true", "false"):
+        return value.strip().lower() == "true"
+    raise ValueError(f"'{name}' must be true or false, got {value!r}")
+
+
+class SummarizationRequestHandler(BaseHTTPRequestHandler):
+    """Routes requests to the service attached to the server.
+    
+    Endpoints:
+        GET  /health               Service status and job counts
+        GET  /metrics              Stage timings and counters in Prometheus format
+        POST /jobs                 Submit a job (JSON body or raw file upload)
+        GET  /jobs                 List jobs
+        GET  /jobs/<id>            Job status
+        GET  /jobs/<id>/result     Summary of a finished job
+    """
+    
+    server_version = "DocSummarizer/1.0"
+    protocol_version = "HTTP/1.1"  # keep-alive, so clients can reuse connections
+    
+    @property
+    def service(self) -> SummarizationService:
+        return self.server.service
+    
+    def log_message(self, format: str, *args):
+        setup_logger(__name__).debug(f"{self.address_string()} - {format % args}")
+    
+    def do_GET(self):
+        url = urlparse(self.path)
+        if url.path == "/health":
+            self._send_json(HTTPStatus.OK, {"status": "ok", "jobs": self.service.stats()})
+            return
+        if url.path == "/metrics":
+            self._send_text(HTTPStatus.OK, metrics.to_prometheus(), "text/plain; version=0.0.4")
+            return
+        if url.path == "/jobs":
+            self._send_json(HTTPStatus.OK, {"jobs": [job.to_dict() for job in self.service.list_jobs()]})
+            return
+        
+        match = JOB_PATH.match(url.path)
+        if not match:
+            self._send_error(HTTPStatus.NOT_FOUND, f"No route for {url.path}")
+            return
+        
+        job = self.service.get_job(match.group(1))
+        if job is None:
+            self._send_error(HTTPStatus.NOT_FOUND, f"Unknown job {match.group(1)}")
+        elif not match.group(2):
+            self._send_json(HTTPStatus.OK, job.to_dict())
+        elif job.status == JOB_SUCCEEDED:
+            self._send_json(HTTPStatus.OK, job.to_dict(include_summary=True))
+        elif job.status == JOB_FAILED:
+            self._send_json(HTTPStatus.UNPROCESSABLE_ENTITY, job.to_dict())
+        else:
+            # Not finished yet: poll again later
+            self._send_json(HTTPStatus.ACCEPTED, job.to_dict())
+    
+    def do_POST(self):
+        url = urlparse(self.path)
+        if url.path != "/jobs":
+            self._send_error(HTTPStatus.NOT_FOUND, f"No route for {url.path}")
+            return
+        
+        length_header = self.headers.get("Content-Length")
+        if length_header is None:
+            self._send_error(HTTPStatus.LENGTH_REQUIRED, "Content-Length header is required")
+            self.close_connection = True
+            return
+        try:
+            length = int(length_header)
+            if length < 0:
+                raise ValueError(length_header)
+        except ValueError:
+            # The body cannot be read reliably, so the connection cannot be reused either
+            self._send_error(HTTPStatus.BAD_REQUEST, f"Invalid Content-Length: {length_header}")
+            self.close_connection = True
+            return
+        if length > AppConfig.SERVER_MAX_UPLOAD_MB * 1024 * 1024:
+            self._send_error(HTTPStatus.REQUEST_ENTITY_TOO_LARGE,
+                             f"Request exceeds {AppConfig.SERVER_MAX_UPLOAD_MB} MB")
+            self.close_connection = True
+            return
+        body = self.rfile.read(length)
+        
+        try:
+            content_type = self.headers.get("Content-Type", "").split(";")[0].strip()
+            if content_type == "application/json":
+                job = self._submit_json(json.loads(body or b"{}"))
+            else:
+                job = self._submit_upload(body, parse_qs(url.query))
+        except (ValueError, FileNotFoundError) as e:
+            self._send_error(HTTPStatus.BAD_REQUEST, str(e))
+            return
+        except PermissionError as e:
+            self._send_error(HTTPStatus.FORBIDDEN, str(e))
+            return
+        
+        self._send_json(HTTPStatus.ACCEPTED, job.to_dict(), location=f"/jobs/{job.id}")
+    
+    def _submit_json(self, request: Any):
+        """Submit ``{"path": ...}`` (a file on the server) or ``{"text": ...}``."""
+        if not isinstance(request, dict):
+            raise ValueError("Request body must be a JSON object")
+        options = {
+            "custom_prompt": request.get("custom_prompt"),
+            "use_cache": _parse_flag(request.get("use_cache", True), "use_cache"),
+        }
+        if request.get("text") is not None:
+            return self.service.submit_text(str(request["text"]), **options)
+        if request.get("path"):
+            return self.service.submit_path(str(self._resolve_input_path(str(request["path"]))), **options)
+        raise ValueError("Request must contain 'path' or 'text'")
+    
+    def _resolve_input_path(self, path: str) -> Path:
+        """Resolve a client-supplied path, which must lie inside ``AppConfig.SERVER_INPUT_ROOT``.
+        
+        Raises:
+            PermissionError: If path jobs are disabled or the path is outside the input root
+        """
+        if not AppConfig.SERVER_INPUT_ROOT:
+            raise PermissionError("Path jobs are disabled; set SERVER_INPUT_ROOT or upload the file")
+        root = Path(AppConfig.SERVER_INPUT_ROOT).expanduser().resolve()
+        # Relative paths are taken relative to the root; symlinks and '..' are resolved before the check
+        resolved = (root / path).resolve()
+        if resolved != root and root not in resolved.parents:
+            raise PermissionError(f"Path is outside the server's input root: {path}")
+        return resolved
+    
+    def _submit_upload(self, body: bytes, query: Dict[str, list]):
+        """Store an uploaded document (``POST /jobs?filename=report.pdf``) and submit it."""
+        filename = (query.get("filename") or [""])[0]
+        if not filename:
+            raise ValueError("Uploads need a 'filename' query parameter")
+        if not body:
+            raise ValueError("Upload is empty")
+        
+        upload_dir = Path(AppConfig.SERVER_UPLOAD_DIR)
+        upload_dir.mkdir(parents=True, exist_ok=True)
+        upload_path = upload_dir / f"{uuid.uuid4().hex}_{SAFE_FILENAME.sub('_', Path(filename).name)}"
+        upload_path.write_bytes(body)
+        
+        try:
+            return self.service.submit_path(
+                str(upload_path),
+                custom_prompt=(query.get("custom_prompt") or [None])[0],
+                use_cache=_parse_flag((query.get("use_cache") or ["true"])[0], "use_cache"),
+                delete_after_extraction=True,
+            )
+        except Exception:
+            upload_path.unlink(missing_ok=True)
+            raise
+    
+    def _send_json(self, status: HTTPStatus, payload: Dict[str, Any], location: Optional[str] = None):
+        self._send_text(status, json.dumps(payload), "application/json", location)
+    
+    def _send_text(self, status: HTTPStatus, text: str, content_type: str, location: Optional[str] = None):
+        body = text.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        if location:
+            self.send_header("Location", location)
+        self.end_headers()
+        self.wfile.write(body)
+    
+    def _send_error(self, status: HTTPStatus, message: str):
+        self._send_json(status, {"error": message})
+
+
+class SummarizationServer(ThreadingHTTPServer):
+    """Threaded HTTP server bound to a summarization service."""
+    
+    daemon_threads = True
+    
+    def __init__(self, address, service: SummarizationService):
+        super().__init__(address, SummarizationRequestHandler)
+        self.service = service
+
+
+def serve(host: Optional[str] = None, port: Optional[int] = None,
+          service: Optional[SummarizationService] = None):
+    """Start the service and serve the HTTP API until interrupted.
+    
+    Args:
+        host: Interface to bind (default: ``AppConfig.SERVER_HOST``)
+        port: Port to bind (default: ``AppConfig.SERVER_PORT``)
+        service: Service to expose; a default one is created and started if omitted
+    """
+    logger = setup_logger(__name__)
+    if service is None:
+        service = SummarizationService()
+        service.start()
+    
+    server = SummarizationServer((host or AppConfig.SERVER_HOST, port or AppConfig.SERVER_PORT), service)
+    logger.info(f"Serving on http://{server.server_address[0]}:{server.server_address[1]}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        logger.info("Shutting down...")
+    finally:
+        server.server_close()
+        service.shutdown(wait=False)
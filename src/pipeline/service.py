@@ -0,0 +1,246 @@
+"""Long-running summarization service: a job queue served by warm workers."""
+import os
+import queue
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from config.settings import AppConfig
+from .batch import _extract_in_worker
+from .extraction import warm_up_extractors
+from ..summarizers.base import SummarizationError
+from ..summarizers.registry import create_summarizer
+from ..utils.file_utils import validate_file_path
+from ..utils.logger import setup_logger
+from ..utils.metrics import increment, metrics, span
+
+
+JOB_QUEUED = "queued"
+JOB_EXTRACTING = "extracting"
+JOB_SUMMARIZING = "summarizing"
+JOB_SUCCEEDED = "succeeded"
+JOB_FAILED = "failed"
+FINISHED_STATUSES = (JOB_SUCCEEDED, JOB_FAILED)
+
+
+@dataclass
+class Job:
+    """A document or text submitted to the service, and its outcome."""
+    
+    id: str
+    path: Optional[str] = None
+    text: Optional[str] = field(default=None, repr=False)
+    custom_prompt: Optional[str] = None
+    use_cache: bool = True
+    delete_after_extraction: bool = False  # uploaded files are removed once extracted
+    status: str = JOB_QUEUED
+    summary: Optional[str] = field(default=None, repr=False)
+    error: Optional[str] = None
+    retryable: Optional[bool] = None
+    extracted_chars: int = 0
+    submitted_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    extract_seconds: float = 0.0
+    summarize_seconds: float = 0.0
+    
+    @property
+    def finished(self) -> bool:
+        return self.status in FINISHED_STATUSES
+    
+    def to_dict(self, include_summary: bool = False) -> Dict[str, Any]:
+        """Return the job as a JSON-serializable status report."""
+        report = asdict(self)
+        report.pop("text")
+        report.pop("delete_after_extraction")
+        if not include_summary:
+            report.pop("summary")
+        return report
+
+
+def _init_service_worker():
+    """Initialize an extraction worker process and import the extractors up front.
+    
+    Jobs are the unit of parallelism, so each worker OCRs and partitions its
+    pages serially instead of starting a nested process pool.
+    """
+    AppConfig.OCR_WORKERS = 1
+    AppConfig.UNSTRUCTURED_WORKERS = 1
+    warm_up_extractors()
+
+
+def _worker_ready() -> int:
+    """No-op task used to make sure a worker process has started."""
+    return os.getpid()
+
+
+class SummarizationService:
+    """Queue of summarization jobs processed by long-lived workers.
+    
+    Extraction runs in a persistent process pool whose workers import the
+    extractor dependencies once at startup. Summaries are produced by one
+    shared summarizer, so its HTTP client and connection pool stay warm
+    across jobs. Up to ``job_workers`` jobs are processed at a time.
+    """
+    
+    def __init__(self, job_workers: Optional[int] = None, extraction_workers: Optional[int] = None,
+                 summarizer=None):
+        self.logger = setup_logger(__name__)
+        self.job_workers = max(1, job_workers or AppConfig.SERVER_JOB_WORKERS)
+        self.extraction_workers = max(1, extraction_workers or AppConfig.SERVER_EXTRACTION_WORKERS)
+        self.summarizer = summarizer
+        self._jobs: "OrderedDict[str, Job]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._queue: "queue.Queue[Optional[Job]]" = queue.Queue()
+        self._threads: List[threading.Thread] = []
+        self._pool: Optional[ProcessPoolExecutor] = None
+    
+    def start(self):
+        """Start the extraction pool, the summarizer and the job workers."""
+        started = time.perf_counter()
+        self._pool = ProcessPoolExecutor(max_workers=self.extraction_workers,
+                                         initializer=_init_service_worker)
+        # Wait for every worker so none of them warms up while a job is waiting
+        pids = [self._pool.submit(_worker_ready) for _ in range(self.extraction_workers)]
+        for future in pids:
+            future.result()
+        
+        if self.summarizer is None:
+            self.summarizer = create_summarizer()
+        
+        for i in range(self.job_workers):
+            thread = threading.Thread(target=self._work, name=f"job-worker-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        
+        self.logger.info(
+            f"Service ready in {time.perf_counter() - started:.1f}s with {self.job_workers} job workers "
+            f"and {self.extraction_workers} extraction workers"
+        )
+    
+    def shutdown(self, wait: bool = True):
+        """Stop accepting work and shut down the workers."""
+        for _ in self._threads:
+            self._queue.put(None)
+        if wait:
+            for thread in self._threads:
+                thread.join()
+        self._threads = []
+        if self._pool is not None:
+            self._pool.shutdown(wait=wait, cancel_futures=not wait)
+            self._pool = None
+    
+    def submit_path(self, path: str, custom_prompt: Optional[str] = None, use_cache: bool = True,
+                    delete_after_extraction: bool = False) -> Job:
+        """Queue a document for extraction and summarization.
+        
+        Raises:
+            FileNotFoundError: If the file does not exist
+            ValueError: If the file type is not supported
+        """
+        document_path = validate_file_path(path)
+        return self._enqueue(Job(id=uuid.uuid4().hex, path=str(document_path), custom_prompt=custom_prompt,
+                                 use_cache=use_cache, delete_after_extraction=delete_after_extraction))
+    
+    def submit_text(self, text: str, custom_prompt: Optional[str] = None, use_cache: bool = True) -> Job:
+        """Queue already extracted text for summarization.
+        
+        Raises:
+            ValueError: If the text is empty
+        """
+        if not text.strip():
+            raise ValueError("Text is empty")
+        return self._enqueue(Job(id=uuid.uuid4().hex, text=text, custom_prompt=custom_prompt,
+                                 use_cache=use_cache))
+    
+    def get_job(self, job_id: str) -> Optional[Job]:
+        """Return a job by ID, or None if it is unknown or was forgotten."""
+        with self._lock:
+            return self._jobs.get(job_id)
+    
+    def list_jobs(self) -> List[Job]:
+        """Return all known jobs, oldest first."""
+        with self._lock:
+            return list(self._jobs.values())
+    
+    def stats(self) -> Dict[str, int]:
+        """Count known jobs by status."""
+        counts = {status: 0 for status in (JOB_QUEUED, JOB_EXTRACTING, JOB_SUMMARIZING) + FINISHED_STATUSES}
+        with self._lock:
+            for job in self._jobs.values():
+                counts[job.status] += 1
+        return counts
+    
+    def _enqueue(self, job: Job) -> Job:
+        with self._lock:
+            self._jobs[job.id] = job
+        self._queue.put(job)
+        self.logger.info(f"Queued job {job.id} ({job.path or f'{len(job.text)} chars of text'})")
+        return job
+    
+    def _work(self):
+        """Job worker loop; exits on a None sentinel."""
+        while True:
+            job = self._queue.get()
+            if job is None:
+                return
+            try:
+                self._run_job(job)
+            finally:
+                self._forget_finished_jobs()
+    
+    def _run_job(self, job: Job):
+        """Extract, summarize and record the outcome of one job."""
+        job.started_at = time.time()
+        try:
+            text = job.text
+            if text is None:
+                job.status = JOB_EXTRACTING
+                try:
+                    text, job.extract_seconds, worker_metrics = self._pool.submit(
+                        _extract_in_worker, job.path, job.use_cache
+                    ).result()
+                    metrics.merge(worker_metrics)
+                finally:
+                    if job.delete_after_extraction:
+                        Path(job.path).unlink(missing_ok=True)
+            job.extracted_chars = len(text)
+            if not text.strip():
+                raise ValueError("The document appears empty or contains no extractable text.")
+            
+            job.status = JOB_SUMMARIZING
+            started = time.perf_counter()
+            with span("summarize", job=job.id):
+                job.summary = self.summarizer.summarize(text, job.custom_prompt, use_cache=job.use_cache)
+            job.summarize_seconds = time.perf_counter() - started
+            job.status = JOB_SUCCEEDED
+            self.logger.info(
+                f"Job {job.id} succeeded (extract {job.extract_seconds:.2f}s, "
+                f"summarize {job.summarize_seconds:.2f}s)"
+            )
+        
+        except SummarizationError as e:
+            job.error = str(e)
+            job.retryable = e.retryable
+            job.status = JOB_FAILED
+            self.logger.error(f"Job {job.id} failed to summarize: {e}")
+        except Exception as e:
+            job.error = str(e)
+            job.status = JOB_FAILED
+            self.logger.error(f"Job {job.id} failed: {e}")
+        finally:
+            job.text = None  # the summary is all that is kept
+            job.finished_at = time.time()
+            increment("documents_succeeded" if job.status == JOB_SUCCEEDED else "documents_failed")
+    
+    def _forget_finished_jobs(self):
+        """Drop the oldest finished jobs beyond ``AppConfig.SERVER_MAX_FINISHED_JOBS``."""
+        with self._lock:
+            finished = [job_id for job_id, job in self._jobs.items() if job.finished]
+            for job_id in finished[:max(0, len(finished) - AppConfig.SERVER_MAX_FINISHED_JOBS)]:
+                del self._jobs[job_id]
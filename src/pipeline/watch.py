@@ -0,0 +1,308 @@
+"""Watch folders and summarize new or changed documents."""
+import os
+import select
+import struct
+import sys
+import time
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from config.settings import AppConfig
+from .batch import BatchSummarizer, is_document_name
+from .manifest import STATUS_FAILED, STATUS_OK, ManifestEntry, ManifestIndex, settings_hash
+from ..utils.cache import hash_file
+from ..utils.logger import setup_logger
+from ..utils.metrics import increment, span
+
+
+WATCH_BACKENDS = ("auto", "inotify", "poll")
+
+# inotify constants from <sys/inotify.h>
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE
+EVENT_HEADER = struct.Struct("iIII")
+
+
+class InotifyWatcher:
+    """Minimal ctypes binding to Linux inotify.
+    
+    Reports files that were written and closed or moved into the watched
+    trees, and new subdirectories, which are watched from then on.
+    """
+    
+    def __init__(self):
+        import ctypes
+        import ctypes.util
+        
+        self._ctypes = ctypes
+        self._libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self._fd = self._libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self._fd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, f"inotify_init1 failed: {os.strerror(errno)}")
+        self._directories: Dict[int, str] = {}
+    
+    def add_tree(self, root: str) -> None:
+        """Watch a directory and every directory below it.
+        
+        Raises:
+            OSError: If a watch cannot be added (e.g. the user's watch limit is reached)
+        """
+        for directory, _, _ in os.walk(root):
+            wd = self._libc.inotify_add_watch(self._fd, os.fsencode(directory), WATCH_MASK)
+            if wd < 0:
+                errno = self._ctypes.get_errno()
+                raise OSError(errno, f"Cannot watch '{directory}': {os.strerror(errno)}")
+            self._directories[wd] = directory
+    
+    def wait(self, timeout: float) -> Tuple[Set[str], bool]:
+        """Wait up to ``timeout`` seconds for events.
+        
+        Returns:
+            Tuple of (changed file and new directory paths, whether events were
+            lost and the trees must be rescanned)
+        """
+        changed: Set[str] = set()
+        overflow = False
+        readable, _, _ = select.select([self._fd], [], [], timeout)
+        if not readable:
+            return changed, overflow
+        
+        while True:
+            try:
+                data = os.read(self._fd, 64 * 1024)
+            except BlockingIOError:
+                break
+            offset = 0
+            while offset < len(data):
+                wd, mask, _, length = EVENT_HEADER.unpack_from(data, offset)
+                name = os.fsdecode(data[offset + EVENT_HEADER.size:offset + EVENT_HEADER.size + length].rstrip(b"\0"))
+                offset += EVENT_HEADER.size + length
+                
+                if mask & IN_Q_OVERFLOW:
+                    overflow = True
+                elif mask & IN_IGNORED:
+                    self._directories.pop(wd, None)
+                elif wd in self._directories and name:
+                    path = os.path.join(self._directories[wd], name)
+                    if mask & IN_ISDIR:
+                        self.add_tree(path)
+                        changed.add(path)
+                    elif mask & (IN_CLOSE_WRITE | IN_MOVED_TO):
+                        changed.add(path)
+        return changed, overflow
+    
+    def close(self) -> None:
+        os.close(self._fd)
+
+
+def iter_documents(root: str) -> Iterator[Tuple[str, os.stat_result]]:
+    """Yield (path, stat) for every supported document below a directory, using one scandir per directory."""
+    stack = [root]
+    while stack:
+        directory = stack.pop()
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append(entry.path)
+                        elif entry.is_file() and is_document_name(entry.name):
+                            yield entry.path, entry.stat()
+                    except OSError:
+                        continue
+        except OSError:
+            continue
+
+
+class FolderWatcher:
+    """Summarize new and changed documents in a set of folders, now and as they appear.
+    
+    Every document is checked against the manifest index by size, mtime
+    and settings hash, so unchanged documents cost one dict lookup and are
+    never read. A document whose mtime changed but whose size did not is
+    hashed, and only summarized again if its content changed. Documents
+    are processed in batches through ``BatchSummarizer``.
+    
+    New files are picked up through inotify where available, with a full
+    rescan every ``rescan_interval`` seconds to catch missed events, or by
+    rescanning every ``poll_interval`` seconds otherwise.
+    """
+    
+    def __init__(self, folders: Iterable[str], index: Optional[ManifestIndex] = None,
+                 batch_summarizer: Optional[BatchSummarizer] = None, backend: Optional[str] = None):
+        self.logger = setup_logger(__name__)
+        self.folders = [str(Path(folder).resolve()) for folder in folders]
+        self.index = index or ManifestIndex()
+        self.batch_summarizer = batch_summarizer or BatchSummarizer()
+        self.backend = backend or AppConfig.WATCH_BACKEND
+        self.poll_interval = AppConfig.WATCH_POLL_INTERVAL
+        self.rescan_interval = AppConfig.WATCH_RESCAN_INTERVAL
+        self.settle_seconds = AppConfig.WATCH_SETTLE_SECONDS
+        self.settings_hash = ""
+        self._deferred: Set[str] = set()
+        
+        if self.backend not in WATCH_BACKENDS:
+            raise ValueError(f"Invalid watch backend '{self.backend}'. Expected one of: {', '.join(WATCH_BACKENDS)}")
+        for folder in self.folders:
+            if not os.path.isdir(folder):
+                raise ValueError(f"Not a directory: {folder}")
+    
+    def run(self, once: bool = False) -> None:
+        """Process new and changed documents, then keep watching unless ``once`` is set."""
+        self.settings_hash = settings_hash()
+        inotify = None if once else self._start_inotify()
+        self.scan_all()
+        if once:
+            return
+        
+        self.logger.info(f"Watching {len(self.folders)} folders ({'inotify' if inotify else 'polling'})")
+        last_full_scan = time.monotonic()
+        try:
+            while True:
+                timeout = min(self.poll_interval, self.settle_seconds) if self._deferred else self.poll_interval
+                if inotify is None:
+                    time.sleep(timeout)
+                    self.scan_all()
+                    continue
+                
+                changed, overflow = inotify.wait(timeout)
+                if overflow or time.monotonic() - last_full_scan >= self.rescan_interval:
+                    if overflow:
+                        self.logger.warning("inotify queue overflowed, rescanning every folder")
+                    self.scan_all()
+                    last_full_scan = time.monotonic()
+                elif changed or self._deferred:
+                    self.scan_paths(changed | self._deferred)
+        except KeyboardInterrupt:
+            self.logger.info("Stopped watching")
+        finally:
+            if inotify is not None:
+                inotify.close()
+    
+    def _start_inotify(self) -> Optional[InotifyWatcher]:
+        """Start watching the folders with inotify, or return None to poll instead."""
+        if self.backend == "poll":
+            return None
+        if not sys.platform.startswith("linux"):
+            if self.backend == "inotify":
+                self.logger.warning("inotify is only available on Linux, polling instead")
+            return None
+        
+        try:
+            inotify = InotifyWatcher()
+            for folder in self.folders:
+                inotify.add_tree(folder)
+            return inotify
+        except (OSError, AttributeError) as e:
+            self.logger.warning(f"Could not start inotify ({e}), polling instead")
+            return None
+    
+    def scan_all(self) -> None:
+        """Rescan every folder, process what changed and forget documents that no longer exist."""
+        for folder in self.folders:
+            started = time.perf_counter()
+            with span("watch.scan", folder=folder) as attributes:
+                known = self.index.load(folder.rstrip(os.sep) + os.sep)
+                candidates: Dict[str, os.stat_result] = {}
+                seen = 0
+                for path, stat in iter_documents(folder):
+                    seen += 1
+                    if self._needs_processing(path, stat, known.pop(path, None)):
+                        candidates[path] = stat
+                if known:
+                    self.index.forget(known)
+                attributes.update(documents=seen, changed=len(candidates))
+            
+            self.logger.info(
+                f"Scanned {seen} documents in '{folder}' in {time.perf_counter() - started:.1f}s: "
+                f"{len(candidates)} new or changed, {len(self._deferred)} still being written"
+            )
+            self._process(candidates)
+    
+    def scan_paths(self, paths: Iterable[str]) -> None:
+        """Check specific files (or new directories) and process the ones that changed."""
+        candidates: Dict[str, os.stat_result] = {}
+        for path in paths:
+            self._deferred.discard(path)
+            if os.path.isdir(path):
+                documents = list(iter_documents(path))
+            elif is_document_name(os.path.basename(path)):
+                try:
+                    documents = [(path, os.stat(path))]
+                except OSError:
+                    continue
+            else:
+                continue
+            for document, stat in documents:
+                if self._needs_processing(document, stat, self.index.get(document)):
+                    candidates[document] = stat
+        self._process(candidates)
+    
+    def _needs_processing(self, path: str, stat: os.stat_result, entry: Optional[ManifestEntry]) -> bool:
+        """Decide from the index whether a document must be summarized."""
+        if entry is not None and entry.is_current(stat.st_size, stat.st_mtime_ns, self.settings_hash):
+            increment("watch.unchanged")
+            return False
+        
+        if time.time() - stat.st_mtime < self.settle_seconds:
+            # Still being written or copied: look at it again once it settles
+            self._deferred.add(path)
+            return False
+        self._deferred.discard(path)
+        
+        if (entry is not None and entry.settings_hash == self.settings_hash and entry.size == stat.st_size
+                and not (entry.status == STATUS_FAILED and entry.retryable)):
+            try:
+                unchanged = hash_file(Path(path)) == entry.content_hash
+            except OSError:
+                return False
+            if unchanged:
+                # Touched or copied over with identical content
+                self.index.touch(path, stat.st_size, stat.st_mtime_ns)
+                increment("watch.unchanged")
+                return False
+        return True
+    
+    def _process(self, candidates: Dict[str, os.stat_result]) -> None:
+        """Summarize documents and record the outcomes in the index."""
+        if not candidates:
+            return
+        
+        hashes = {}
+        for path in candidates:
+            try:
+                hashes[path] = hash_file(Path(path))
+            except OSError as e:
+                self.logger.warning(f"Skipping '{path}': {e}")
+        paths: List[str] = list(hashes)
+        
+        results = self.batch_summarizer.run([Path(path) for path in paths])
+        entries = []
+        for path, result in zip(paths, results):
+            stat = candidates[path]
+            entries.append(ManifestEntry(
+                path=path,
+                size=stat.st_size,
+                mtime_ns=stat.st_mtime_ns,
+                content_hash=hashes[path],
+                settings_hash=self.settings_hash,
+                status=STATUS_OK if result.status == "ok" else STATUS_FAILED,
+                output_path=result.output_path,
+                error=result.error,
+                retryable=bool(result.retryable),
+            ))
+        self.index.record(entries)
+        
+        succeeded = sum(1 for entry in entries if entry.status == STATUS_OK)
+        increment("watch.processed", len(entries))
+        self.logger.info(
+            f"Processed {len(entries)} documents: {succeeded} succeeded, {len(entries) - succeeded} failed"
+        )
@@ -1,81 +1,659 @@
 """Azure OpenAI-based text summarization."""
-from openai import AzureOpenAI
-from typing import Optional
+import asyncio
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, Iterator, List, Optional
 
 from config.settings import AzureOpenAIConfig, AppConfig
+from .base import SummarizationError
+from .deployment_pool import Deployment, get_async_client, get_client, get_deployment_pool
+from .response_cache import BaseResponseCache, SQLiteResponseCache, make_request_key
+from .streaming import SummaryStream
 from ..utils.logger import setup_logger
+from ..utils.metrics import increment, span
+from ..utils.text_normalization import normalize_text
+from ..utils.token_utils import count_tokens, split_text_into_chunks
+
+
+SUMMARY_SYSTEM_PROMPT = (
+    "You are an expert assistant skilled at summarizing documents, charts, and financial data. "
+    "You MUST provide summaries in exactly 4 sentences, no more, no less."
+)
+CHUNK_SYSTEM_PROMPT = "You are an expert assistant skilled at summarizing documents, charts, and financial data."
+
+RETRYABLE_STATUS_CODES = {408, 409, 429}
+
+
+def _is_retryable(error: Exception) -> bool:
+    """Whether an API error is transient and the request may be retried."""
+    from openai import APIConnectionError, APIStatusError
+    
+    if isinstance(error, APIConnectionError):  # includes timeouts
+        return True
+    if isinstance(error, APIStatusError):
+        return error.status_code in RETRYABLE_STATUS_CODES or error.status_code >= 500
+    return False
+
+
+def _get_retry_after(error: Exception) -> Optional[float]:
+    """Read the server-requested delay in seconds from an error response, if any."""
+    response = getattr(error, "response", None)
+    if response is None:
+        return None
+    
+    headers = response.headers
+    retry_after_ms = headers.get("retry-after-ms")
+    if retry_after_ms:
+        try:
+            return float(retry_after_ms) / 1000
+        except ValueError:
+            pass
+    
+    retry_after = headers.get("retry-after")
+    if retry_after:
+        try:
+            return float(retry_after)
+        except ValueError:
+            try:
+                return max(0.0, parsedate_to_datetime(retry_after).timestamp() - time.time())
+            except (TypeError, ValueError):
+                pass
+    return None
+
+
+def _backoff_delay(attempt: int) -> float:
+    """Exponential backoff with jitter, so retrying callers do not stampede together."""
+    delay = min(AppConfig.SUMMARY_RETRY_MAX_DELAY, AppConfig.SUMMARY_RETRY_BASE_DELAY * 2 ** (attempt - 1))
+    return random.uniform(delay / 2, delay)
 
 
 class AzureOpenAISummarizer:
-    """Summarizer using Azure OpenAI."""
+    """Summarizer using Azure OpenAI.
     
-    def __init__(self):
+    Requests go to the process-wide deployment pool (see ``DeploymentPool``),
+    which is the single configured deployment unless
+    ``AZURE_OPENAI_DEPLOYMENTS`` lists several, through clients shared by
+    every summarizer instance.
+    """
+    
+    def __init__(self, response_cache: Optional[BaseResponseCache] = None):
         self.logger = setup_logger(__name__)
-        self.client = None
+        self.pool = None
+        self.response_cache = response_cache
         self._initialize_client()
+        self._initialize_response_cache()
     
     def _initialize_client(self):
-        """Initialize the Azure OpenAI client."""
+        """Initialize the Azure OpenAI clients of the deployment pool."""
         try:
-            AzureOpenAIConfig.validate()
-            
-            self.client = AzureOpenAI(
-                api_key=AzureOpenAIConfig.API_KEY,
-                api_version=AzureOpenAIConfig.API_VERSION,
-                azure_endpoint=AzureOpenAIConfig.ENDPOINT,
-            )
+            self.pool = get_deployment_pool()
+            for deployment in self.pool.deployments:
+                get_client(deployment)
             
-            self.logger.info("Azure OpenAI client initialized successfully")
+            self.logger.info(f"Azure OpenAI client initialized for {len(self.pool.deployments)} deployment(s)")
             
         except Exception as e:
             self.logger.error(f"Failed to initialize Azure OpenAI client: {e}")
             raise
     
-    def summarize(self, document_text: str, custom_prompt: Optional[str] = None) -> str:
+    def _initialize_response_cache(self):
+        """Create the default response cache unless one was injected or caching is disabled."""
+        if self.response_cache is not None or not AppConfig.LLM_CACHE_ENABLED:
+            return
+        
+        try:
+            self.response_cache = SQLiteResponseCache()
+        except Exception as e:
+            self.logger.warning(f"Response cache unavailable, continuing without it: {e}")
+    
+    def summarize(self, document_text: str, custom_prompt: Optional[str] = None,
+                  use_cache: bool = True) -> str:
         """Summarize the given document text.
         
         Args:
             document_text: Text to summarize
             custom_prompt: Optional custom prompt for summarization
+            use_cache: Set to False to always call the API
             
         Returns:
             Summary text
             
         Raises:
-            Exception: If summarization fails
+            SummarizationError: If summarization fails
         """
         try:
             self.logger.info("Generating summary using Azure OpenAI...")
             
-            if custom_prompt:
-                prompt = custom_prompt.format(document_text=document_text)
+            document_text = self._normalize(document_text)
+            if self._should_chunk(document_text):
+                summary = self._summarize_chunked(document_text, custom_prompt, use_cache)
             else:
-                prompt = self._build_default_prompt(document_text)
-            
-            response = self.client.chat.completions.create(
-                model=AzureOpenAIConfig.DEPLOYMENT,
-                messages=[
-                    {
-                        "role": "system", 
-                            "content": "You are an expert assistant skilled at summarizing documents, charts, and financial data. You MUST provide summaries in exactly 4 sentences, no more, no less."
-                    },
-                    {
-                        "role": "user", 
-                        "content": prompt
-                    }
-                ],
-                temperature=AppConfig.SUMMARY_TEMPERATURE,
-                max_tokens=AppConfig.SUMMARY_MAX_TOKENS
-            )
+                with span("llm.prompt_build"):
+                    prompt = self._build_summary_prompt(document_text, custom_prompt)
+                summary = self._complete(SUMMARY_SYSTEM_PROMPT, prompt, AppConfig.SUMMARY_MAX_TOKENS, use_cache)
             
-            summary = response.choices[0].message.content.strip()
             self.logger.info(f"Summary generation complete. Generated {len(summary)} characters")
             return summary
             
+        except SummarizationError as e:
+            self.logger.error(f"Summarization failed: {e}")
+            raise
+        except Exception as e:
+            error_msg = f"Summarization failed: {e}"
+            self.logger.error(error_msg)
+            raise SummarizationError(error_msg) from e
+    
+    async def asummarize(self, document_text: str, custom_prompt: Optional[str] = None,
+                         use_cache: bool = True) -> str:
+        """Summarize the given document text using the async client.
+        
+        Behaves like ``summarize`` but awaits the API instead of blocking, so
+        many documents can be summarized concurrently from one event loop.
+        
+        Args:
+            document_text: Text to summarize
+            custom_prompt: Optional custom prompt for summarization
+            use_cache: Set to False to always call the API
+            
+        Returns:
+            Summary text
+            
+        Raises:
+            SummarizationError: If summarization fails
+        """
+        try:
+            self.logger.info("Generating summary using Azure OpenAI (async)...")
+            
+            document_text = self._normalize(document_text)
+            if self._should_chunk(document_text):
+                summary = await self._asummarize_chunked(document_text, custom_prompt, use_cache)
+            else:
+                with span("llm.prompt_build"):
+                    prompt = self._build_summary_prompt(document_text, custom_prompt)
+                summary = await self._acomplete(
+                    SUMMARY_SYSTEM_PROMPT, prompt, AppConfig.SUMMARY_MAX_TOKENS, use_cache
+                )
+            
+            self.logger.info(f"Summary generation complete. Generated {len(summary)} characters")
+            return summary
+            
+        except SummarizationError as e:
+            self.logger.error(f"Summarization failed: {e}")
+            raise
+        except Exception as e:
+            error_msg = f"Summarization failed: {e}"
+            self.logger.error(error_msg)
+            raise SummarizationError(error_msg) from e
+    
+    def summarize_preview(self, excerpts: str, coverage: str, custom_prompt: Optional[str] = None,
+                          use_cache: bool = True) -> str:
+        """Summarize a document from excerpts of it in a single call.
+        
+        Used by budgeted previews: the prompt tells the model that it only
+        sees part of the document, so it does not present the summary as
+        complete. The excerpts are never chunked, their size is up to the
+        caller's token budget.
+        
+        Args:
+            excerpts: Selected pages of the document, in document order
+            coverage: What the excerpts cover, e.g. "40 of its 400 pages"
+            custom_prompt: Optional custom prompt for summarization
+            use_cache: Set to False to always call the API
+            
+        Returns:
+            Summary text
+            
+        Raises:
+            SummarizationError: If summarization fails
+        """
+        try:
+            self.logger.info(f"Generating preview summary from {coverage} using Azure OpenAI...")
+            
+            excerpts = self._normalize(excerpts)
+            with span("llm.prompt_build"):
+                if custom_prompt:
+                    prompt = custom_prompt.format(document_text=excerpts)
+                else:
+                    prompt = self._build_preview_prompt(excerpts, coverage)
+            summary = self._complete(SUMMARY_SYSTEM_PROMPT, prompt, AppConfig.SUMMARY_MAX_TOKENS, use_cache)
+            
+            self.logger.info(f"Summary generation complete. Generated {len(summary)} characters")
+            return summary
+            
+        except SummarizationError as e:
+            self.logger.error(f"Summarization failed: {e}")
+            raise
+        except Exception as e:
+            error_msg = f"Summarization failed: {e}"
+            self.logger.error(error_msg)
+            raise SummarizationError(error_msg) from e
+    
+    def summarize_stream(self, document_text: str, custom_prompt: Optional[str] = None,
+                         use_cache: bool = True) -> SummaryStream:
+        """Summarize the given document text, yielding the summary as it is generated.
+        
+        Long documents are still mapped chunk by chunk before this returns;
+        only the final completion is streamed.
+        
+        Args:
+            document_text: Text to summarize
+            custom_prompt: Optional custom prompt for summarization
+            use_cache: Set to False to always call the API
+            
+        Returns:
+            SummaryStream of text deltas, which records time to first token
+            and tokens per second as it is consumed
+            
+        Raises:
+            SummarizationError: If summarization fails, before or while streaming
+        """
+        started = time.perf_counter()
+        try:
+            self.logger.info("Generating summary using Azure OpenAI (streaming)...")
+            
+            document_text = self._normalize(document_text)
+            if self._should_chunk(document_text):
+                partial_summaries = self._map_chunks(document_text, use_cache)
+                prompt = self._build_summary_prompt("\n\n".join(partial_summaries), custom_prompt, reduce=True)
+            else:
+                with span("llm.prompt_build"):
+                    prompt = self._build_summary_prompt(document_text, custom_prompt)
+            
+            request = self._build_request(SUMMARY_SYSTEM_PROMPT, prompt, AppConfig.SUMMARY_MAX_TOKENS)
+            cache_key = self._get_cache_key(request) if use_cache else None
+            if cache_key:
+                cached_response = self.response_cache.get(cache_key)
+                if cached_response is not None:
+                    increment("llm.cache_hits")
+                    self.logger.info(f"Loaded response from response cache ({len(cached_response)} characters)")
+                    return SummaryStream([cached_response], started, cached=True)
+                increment("llm.cache_misses")
+            
+            return SummaryStream(self._stream_completion(request, cache_key), started)
+            
+        except SummarizationError as e:
+            self.logger.error(f"Summarization failed: {e}")
+            raise
         except Exception as e:
             error_msg = f"Summarization failed: {e}"
             self.logger.error(error_msg)
-            return error_msg
+            raise SummarizationError(error_msg) from e
+    
+    def _normalize(self, document_text: str) -> str:
+        """Strip boilerplate and redundancy from the document text and report the tokens saved."""
+        if not AppConfig.TEXT_NORMALIZATION:
+            return document_text
+        
+        with span("text.normalize") as attributes:
+            normalized, report = normalize_text(
+                document_text, AppConfig.NORMALIZE_MIN_REPEATS, AppConfig.NORMALIZE_DEDUPE_SIMILARITY
+            )
+            attributes.update(tokens_before=report.original_tokens, tokens_after=report.normalized_tokens)
+        increment("normalize.tokens_before", report.original_tokens)
+        increment("normalize.tokens_saved", report.tokens_saved)
+        self.logger.info(
+            f"Normalized text from {report.original_tokens} to {report.normalized_tokens} tokens "
+            f"(saved {report.tokens_saved}, {report.savings_ratio:.1%}): removed {report.page_number_lines} "
+            f"page numbers, {report.boilerplate_lines} repeated header/footer lines and "
+            f"{report.duplicate_blocks} duplicate blocks"
+        )
+        return normalized
+    
+    def _build_request(self, system_prompt: str, prompt: str, max_tokens: int) -> Dict[str, Any]:
+        """Build the chat completion request payload."""
+        return {
+            "model": AzureOpenAIConfig.DEPLOYMENT,
+            "messages": [
+                {
+                    "role": "system",
+                    "content": system_prompt
+                },
+                {
+                    "role": "user",
+                    "content": prompt
+                }
+            ],
+            "temperature": AppConfig.SUMMARY_TEMPERATURE,
+            "max_tokens": max_tokens,
+        }
+    
+    def section_request(self, section_text: str) -> Dict[str, Any]:
+        """Build the request that summarizes one section of a summary tree.
+        
+        Unlike chunk prompts, the prompt does not mention the section's
+        position, so the request only changes when the section's text does.
+        """
+        return self._build_request(
+            CHUNK_SYSTEM_PROMPT, self._build_section_prompt(section_text), AppConfig.SUMMARY_CHUNK_MAX_TOKENS
+        )
+    
+    def final_request(self, text: str, custom_prompt: Optional[str] = None, reduce: bool = False) -> Dict[str, Any]:
+        """Build the request for a document's final summary, from its text or, with ``reduce``, its part summaries."""
+        prompt = self._build_summary_prompt(text, custom_prompt, reduce=reduce)
+        return self._build_request(SUMMARY_SYSTEM_PROMPT, prompt, AppConfig.SUMMARY_MAX_TOKENS)
+    
+    def request_key(self, request: Dict[str, Any]) -> str:
+        """Return a key identifying a request's response: its payload and the model serving it."""
+        # The same deployment name can exist on different resources
+        return make_request_key({**self.pool.cache_scope(), **request})
+    
+    def _complete(self, system_prompt: str, prompt: str, max_tokens: int, use_cache: bool = True) -> str:
+        """Run one chat completion, serving it from the response cache when possible."""
+        return self.complete_request(self._build_request(system_prompt, prompt, max_tokens), use_cache)
+    
+    def complete_request(self, request: Dict[str, Any], use_cache: bool = True) -> str:
+        """Run a chat completion request, serving it from the response cache when possible.
+        
+        Raises:
+            SummarizationError: If the request fails after all retries
+        """
+        cache_key = self._get_cache_key(request) if use_cache else None
+        if cache_key:
+            cached_response = self.response_cache.get(cache_key)
+            if cached_response is not None:
+                increment("llm.cache_hits")
+                self.logger.info(f"Loaded response from response cache ({len(cached_response)} characters)")
+                return cached_response
+            increment("llm.cache_misses")
+        
+        response = self._create_with_retry(request)
+        self._record_usage(response)
+        content = response.choices[0].message.content.strip()
+        
+        if cache_key:
+            self.response_cache.set(cache_key, content)
+        return content
+    
+    async def _acomplete(self, system_prompt: str, prompt: str, max_tokens: int, use_cache: bool = True) -> str:
+        """Async counterpart of ``_complete``."""
+        request = self._build_request(system_prompt, prompt, max_tokens)
+        
+        cache_key = self._get_cache_key(request) if use_cache else None
+        if cache_key:
+            cached_response = self.response_cache.get(cache_key)
+            if cached_response is not None:
+                increment("llm.cache_hits")
+                self.logger.info(f"Loaded response from response cache ({len(cached_response)} characters)")
+                return cached_response
+            increment("llm.cache_misses")
+        
+        response = await self._acreate_with_retry(request)
+        self._record_usage(response)
+        content = response.choices[0].message.content.strip()
+        
+        if cache_key:
+            self.response_cache.set(cache_key, content)
+        return content
+    
+    def _stream_completion(self, request: Dict[str, Any], cache_key: Optional[str]) -> Iterator[str]:
+        """Yield the text of a streamed chat completion, caching it once complete.
+        
+        Only opening the stream is retried: once text has been yielded, a
+        failure is raised as a SummarizationError.
+        """
+        stream = self._create_with_retry({**request, "stream": True})
+        parts = []
+        try:
+            for chunk in stream:
+                if not chunk.choices:
+                    continue  # e.g. Azure's content filter results
+                delta = chunk.choices[0].delta.content
+                if delta:
+                    parts.append(delta)
+                    yield delta
+        except Exception as e:
+            raise SummarizationError(
+                f"Summary stream interrupted: {e}",
+                retryable=_is_retryable(e),
+                status_code=getattr(e, "status_code", None),
+            ) from e
+        finally:
+            stream.close()
+        
+        # Only complete responses are cached, never a stream the caller abandoned
+        if cache_key:
+            self.response_cache.set(cache_key, "".join(parts).strip())
+    
+    def _create_with_retry(self, request: Dict[str, Any]):
+        """Send a request to the best deployment of the pool, failing over and retrying transient failures."""
+        estimated_tokens = self._estimate_request_tokens(request)
+        attempt = 0
+        failed_on = None
+        while True:
+            attempt += 1
+            with span("llm.rate_limit_wait"):
+                deployment = self.pool.acquire(estimated_tokens, avoid=failed_on)
+            increment("llm.requests")
+            started = time.perf_counter()
+            settled = False
+            try:
+                with span("llm.request", attempt=attempt, stream=bool(request.get("stream")),
+                          deployment=deployment.name):
+                    response = get_client(deployment).chat.completions.create(
+                        **{**request, "model": deployment.deployment}
+                    )
+            except Exception as e:
+                settled = True
+                failed_on = deployment
+                delay = self._handle_failed_attempt(e, attempt, deployment)
+            else:
+                settled = True
+                self.pool.succeeded(deployment, time.perf_counter() - started, estimated_tokens)
+                return response
+            finally:
+                if not settled:
+                    # Cancelled or interrupted: free the deployment's slot without judging its health
+                    self.pool.released(deployment)
+            time.sleep(delay)
+    
+    async def _acreate_with_retry(self, request: Dict[str, Any]):
+        """Async counterpart of ``_create_with_retry``."""
+        estimated_tokens = self._estimate_request_tokens(request)
+        attempt = 0
+        failed_on = None
+        while True:
+            attempt += 1
+            with span("llm.rate_limit_wait"):
+                deployment = await self.pool.acquire_async(estimated_tokens, avoid=failed_on)
+            increment("llm.requests")
+            started = time.perf_counter()
+            settled = False
+            try:
+                with span("llm.request", attempt=attempt, stream=bool(request.get("stream")),
+                          deployment=deployment.name):
+                    response = await get_async_client(deployment).chat.completions.create(
+                        **{**request, "model": deployment.deployment}
+                    )
+            except Exception as e:
+                settled = True
+                failed_on = deployment
+                delay = self._handle_failed_attempt(e, attempt, deployment)
+            else:
+                settled = True
+                self.pool.succeeded(deployment, time.perf_counter() - started, estimated_tokens)
+                return response
+            finally:
+                if not settled:
+                    # Cancelled or interrupted: free the deployment's slot without judging its health
+                    self.pool.released(deployment)
+            await asyncio.sleep(delay)
+    
+    def _handle_failed_attempt(self, error: Exception, attempt: int, deployment: Deployment) -> float:
+        """Decide how to proceed after a failed request.
+        
+        Returns:
+            Seconds to wait before the next attempt: none if another deployment
+            of the pool is healthy and the request can fail over to it
+            
+        Raises:
+            SummarizationError: If the error is not retryable or attempts are exhausted
+        """
+        status_code = getattr(error, "status_code", None)
+        retryable = _is_retryable(error)
+        retry_after = _get_retry_after(error)
+        delay = retry_after if retry_after is not None else _backoff_delay(attempt)
+        # Throttling only says the quota is used up; bad requests are not the deployment's fault
+        self.pool.failed(
+            deployment,
+            unhealthy=retryable and status_code != 429,
+            # Throttled: hold back every caller sharing this deployment's quota
+            pause_seconds=delay if status_code == 429 else 0.0,
+        )
+        
+        if not retryable or attempt >= AppConfig.SUMMARY_MAX_ATTEMPTS:
+            raise SummarizationError(
+                f"Azure OpenAI request failed after {attempt} attempt(s): {error}",
+                retryable=retryable,
+                status_code=status_code,
+                attempts=attempt,
+            ) from error
+        
+        if status_code == 429:
+            increment("llm.throttled")
+        increment("llm.retries")
+        
+        if self.pool.has_alternative(deployment):
+            increment("llm.failovers")
+            self.logger.warning(f"Attempt {attempt} on '{deployment.name}' failed ({error}). Failing over...")
+            return 0.0
+        self.logger.warning(f"Attempt {attempt} failed ({error}). Retrying in {delay:.1f}s...")
+        return delay
+    
+    def _record_usage(self, response):
+        """Count the tokens reported in a completion's usage block."""
+        usage = getattr(response, "usage", None)
+        if usage is not None:
+            increment("llm.prompt_tokens", usage.prompt_tokens or 0)
+            increment("llm.completion_tokens", usage.completion_tokens or 0)
+    
+    def _estimate_request_tokens(self, request: Dict[str, Any]) -> int:
+        """Estimate the tokens a request counts against the quota (prompt plus max_tokens)."""
+        prompt_tokens = sum(count_tokens(message["content"]) for message in request["messages"])
+        return prompt_tokens + request["max_tokens"]
+    
+    def _should_chunk(self, document_text: str) -> bool:
+        """Decide whether the document needs map-reduce summarization."""
+        if AppConfig.SUMMARY_MODE == "chunked":
+            return True
+        if AppConfig.SUMMARY_MODE == "single":
+            return False
+        return count_tokens(document_text) > AppConfig.SUMMARY_MAX_INPUT_TOKENS
+    
+    def _summarize_chunked(self, document_text: str, custom_prompt: Optional[str], use_cache: bool) -> str:
+        """Summarize a long document with map-reduce.
+        
+        The document is split on element/page boundaries into chunks of at most
+        ``AppConfig.SUMMARY_CHUNK_TOKENS`` tokens, the chunks are summarized
+        concurrently, and the chunk summaries are combined into the final
+        summary. Latency is bounded by the slowest chunk rather than the
+        document length.
+        """
+        partial_summaries = self._map_chunks(document_text, use_cache)
+        prompt = self._build_summary_prompt("\n\n".join(partial_summaries), custom_prompt, reduce=True)
+        return self._complete(SUMMARY_SYSTEM_PROMPT, prompt, AppConfig.SUMMARY_MAX_TOKENS, use_cache)
+    
+    def _map_chunks(self, document_text: str, use_cache: bool) -> List[str]:
+        """Summarize the chunks of a long document until they fit in one reduce call."""
+        chunks = split_text_into_chunks(document_text, AppConfig.SUMMARY_CHUNK_TOKENS)
+        self.logger.info(
+            f"Document split into {len(chunks)} chunks of up to {AppConfig.SUMMARY_CHUNK_TOKENS} tokens"
+        )
+        partial_summaries = self._summarize_chunks(chunks, use_cache)
+        
+        # Collapse further if the chunk summaries do not fit in a single reduce call
+        groups = self._get_reduce_groups(partial_summaries)
+        while groups:
+            partial_summaries = self._summarize_chunks(groups, use_cache)
+            groups = self._get_reduce_groups(partial_summaries)
+        return partial_summaries
+    
+    async def _asummarize_chunked(self, document_text: str, custom_prompt: Optional[str],
+                                  use_cache: bool) -> str:
+        """Async counterpart of ``_summarize_chunked``."""
+        chunks = split_text_into_chunks(document_text, AppConfig.SUMMARY_CHUNK_TOKENS)
+        self.logger.info(
+            f"Document split into {len(chunks)} chunks of up to {AppConfig.SUMMARY_CHUNK_TOKENS} tokens"
+        )
+        partial_summaries = await self._asummarize_chunks(chunks, use_cache)
+        
+        groups = self._get_reduce_groups(partial_summaries)
+        while groups:
+            partial_summaries = await self._asummarize_chunks(groups, use_cache)
+            groups = self._get_reduce_groups(partial_summaries)
+        
+        prompt = self._build_summary_prompt("\n\n".join(partial_summaries), custom_prompt, reduce=True)
+        return await self._acomplete(SUMMARY_SYSTEM_PROMPT, prompt, AppConfig.SUMMARY_MAX_TOKENS, use_cache)
+    
+    def _get_reduce_groups(self, partial_summaries: List[str]) -> Optional[List[str]]:
+        """Group chunk summaries that are too long for one reduce call.
+        
+        Returns:
+            Groups of summaries to summarize again, or None once they fit in a
+            single reduce call (or grouping would no longer shrink them)
+        """
+        combined = "\n\n".join(partial_summaries)
+        if len(partial_summaries) <= 1 or count_tokens(combined) <= AppConfig.SUMMARY_CHUNK_TOKENS:
+            return None
+        
+        groups = split_text_into_chunks(combined, AppConfig.SUMMARY_CHUNK_TOKENS)
+        if len(groups) >= len(partial_summaries):
+            return None
+        
+        self.logger.info(f"Combining {len(partial_summaries)} chunk summaries in {len(groups)} groups")
+        return groups
+    
+    def _summarize_chunks(self, chunks: List[str], use_cache: bool) -> List[str]:
+        """Summarize chunks concurrently, returning the summaries in chunk order."""
+        workers = max(1, min(AppConfig.SUMMARY_CHUNK_CONCURRENCY, len(chunks)))
+        total = len(chunks)
+        
+        def summarize_chunk(index: int) -> str:
+            prompt = self._build_chunk_prompt(chunks[index], index + 1, total)
+            summary = self._complete(
+                CHUNK_SYSTEM_PROMPT, prompt, AppConfig.SUMMARY_CHUNK_MAX_TOKENS, use_cache
+            )
+            self.logger.info(f"Summarized chunk {index + 1}/{total}")
+            return summary
+        
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(summarize_chunk, range(total)))
+    
+    async def _asummarize_chunks(self, chunks: List[str], use_cache: bool) -> List[str]:
+        """Summarize chunks concurrently on the event loop, returning the summaries in chunk order."""
+        semaphore = asyncio.Semaphore(max(1, AppConfig.SUMMARY_CHUNK_CONCURRENCY))
+        total = len(chunks)
+        
+        async def summarize_chunk(index: int) -> str:
+            prompt = self._build_chunk_prompt(chunks[index], index + 1, total)
+            async with semaphore:
+                summary = await self._acomplete(
+                    CHUNK_SYSTEM_PROMPT, prompt, AppConfig.SUMMARY_CHUNK_MAX_TOKENS, use_cache
+                )
+            self.logger.info(f"Summarized chunk {index + 1}/{total}")
+            return summary
+        
+        return list(await asyncio.gather(*(summarize_chunk(i) for i in range(total))))
+    
+    def _get_cache_key(self, request: Dict[str, Any]) -> Optional[str]:
+        """Return the response cache key for a request, or None if it must not be cached."""
+        if self.response_cache is None:
+            return None
+        
+        if request["temperature"] > AppConfig.LLM_CACHE_MAX_TEMPERATURE:
+            self.logger.debug("Temperature above LLM_CACHE_MAX_TEMPERATURE, not caching the response")
+            return None
+        return self.request_key(request)
+    
+    def _build_summary_prompt(self, document_text: str, custom_prompt: Optional[str],
+                              reduce: bool = False) -> str:
+        """Build the final summarization prompt from a custom template or the defaults."""
+        if custom_prompt:
+            return custom_prompt.format(document_text=document_text)
+        if reduce:
+            return self._build_reduce_prompt(document_text)
+        return self._build_default_prompt(document_text)
     
     def _build_default_prompt(self, document_text: str) -> str:
         """Build the default summarization prompt."""
@@ -88,6 +666,51 @@ class AzureOpenAISummarizer:
             f"in your summary as well.\n\nSummary:"
         )
     
+    def _build_chunk_prompt(self, chunk_text: str, chunk_number: int, total_chunks: int) -> str:
+        """Build the prompt used to summarize one chunk of a long document."""
+        return (
+            f"The following is part {chunk_number} of {total_chunks} of a longer document "
+            f"(including any OCR-extracted chart or table text):\n\n"
+            f"---\n\n{chunk_text}\n\n---\n\n"
+            f"Summarize this part. Keep the key points, names, dates and any figures from "
+            f"charts, tables or numerical data, since the summaries of all parts will be "
+            f"combined into one document summary.\n\nSummary:"
+        )
+    
+    def _build_section_prompt(self, section_text: str) -> str:
+        """Build the prompt that summarizes one section of a summary tree."""
+        return (
+            f"The following is one section of a longer document "
+            f"(including any OCR-extracted chart or table text):\n\n"
+            f"---\n\n{section_text}\n\n---\n\n"
+            f"Summarize this section. Keep the key points, names, dates and any figures from "
+            f"charts, tables or numerical data, since the summaries of all sections will be "
+            f"combined into one document summary.\n\nSummary:"
+        )
+    
+    def _build_preview_prompt(self, excerpts: str, coverage: str) -> str:
+        """Build the prompt that summarizes a document from a sample of its pages."""
+        return (
+            f"The following excerpts cover {coverage} of a longer document: its front matter, "
+            f"the start of major sections, pages with tables or figures and evenly spaced samples "
+            f"(including any OCR-extracted chart or table text). Each excerpt is headed by its page number.\n\n"
+            f"---\n\n{excerpts}\n\n---\n\n"
+            f"Please provide a preview summary of the whole document from these excerpts: its purpose, "
+            f"main themes and the most important details and figures. Do not speculate about the pages "
+            f"you have not seen.\n\nSummary:"
+        )
+    
+    def _build_reduce_prompt(self, chunk_summaries: str) -> str:
+        """Build the prompt that combines chunk summaries into the final summary."""
+        return (
+            f"The following are summaries of consecutive parts of one document:\n\n"
+            f"---\n\n{chunk_summaries}\n\n---\n\n"
+            f"Please combine them into a single comprehensive summary of the whole document "
+            f"that captures the key points, main themes, and important details. If there are "
+            f"any charts, tables, or numerical data mentioned, please include those insights "
+            f"in your summary as well.\n\nSummary:"
+        )
+    
     def is_available(self) -> bool:
         """Check if the summarizer is properly configured and available."""
-        return self.client is not None
\ No newline at end of file
+        return self.pool is not None
\ No newline at end of file
@@ -0,0 +1,20 @@
+"""Base classes for summarizers."""
+from typing import Optional
+
+
+class SummarizationError(Exception):
+    """Exception raised when summarization fails.
+    
+    Attributes:
+        retryable: Whether the failure was transient (rate limit, timeout,
+            server error), i.e. the same request may succeed later
+        status_code: HTTP status code returned by the service, if any
+        attempts: Number of attempts made before giving up
+    """
+    
+    def __init__(self, message: str, retryable: bool = False, status_code: Optional[int] = None,
+                 attempts: int = 1):
+        super().__init__(message)
+        self.retryable = retryable
+        self.status_code = status_code
+        self.attempts = attempts
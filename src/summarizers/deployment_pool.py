@@ -0,0 +1,355 @@
+"""Load balancing of Azure OpenAI requests across a pool of deployments."""
+import asyncio
+import json
+import threading
+import time
+import weakref
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
+
+from config.settings import AppConfig, AzureOpenAIConfig
+from .rate_limiter import RateLimiter, get_rate_limiter
+from ..utils.logger import setup_logger
+from ..utils.metrics import increment
+
+if TYPE_CHECKING:
+    from openai import AsyncAzureOpenAI, AzureOpenAI
+
+
+# How much a deployment's error rate (0-1) inflates its routing score
+ERROR_RATE_PENALTY = 4.0
+
+
+@dataclass(frozen=True)
+class Deployment:
+    """One Azure OpenAI deployment that requests can be routed to."""
+    
+    endpoint: str
+    deployment: str
+    api_key: str
+    api_version: str
+    weight: float = 1.0
+    requests_per_minute: int = 0
+    tokens_per_minute: int = 0
+    
+    @property
+    def name(self) -> str:
+        """Identifies the deployment's quota, e.g. for its rate limiter."""
+        return f"{self.endpoint}|{self.deployment}"
+
+
+def load_deployments() -> List[Deployment]:
+    """Read the deployments to balance across.
+    
+    ``AzureOpenAIConfig.DEPLOYMENTS`` is a JSON list, inline or in a file,
+    of objects with ``endpoint`` and ``deployment`` and optionally
+    ``api_key``, ``api_version``, ``weight``, ``rpm`` and ``tpm``. Missing
+    fields default to the ``AZURE_OPENAI_*`` and ``RATE_LIMIT_*`` settings.
+    Without it, the pool is the single configured deployment.
+    
+    Raises:
+        ValueError: If the configuration is missing or invalid
+    """
+    spec = AzureOpenAIConfig.DEPLOYMENTS.strip()
+    if not spec:
+        AzureOpenAIConfig.validate()
+        return [Deployment(
+            endpoint=AzureOpenAIConfig.ENDPOINT,
+            deployment=AzureOpenAIConfig.DEPLOYMENT,
+            api_key=AzureOpenAIConfig.API_KEY,
+            api_version=AzureOpenAIConfig.API_VERSION,
+            requests_per_minute=AppConfig.RATE_LIMIT_REQUESTS_PER_MINUTE,
+            tokens_per_minute=AppConfig.RATE_LIMIT_TOKENS_PER_MINUTE,
+        )]
+    
+    try:
+        entries = json.loads(spec if spec.startswith("[") else Path(spec).read_text(encoding="utf-8"))
+    except (OSError, ValueError) as e:
+        raise ValueError(f"Invalid AZURE_OPENAI_DEPLOYMENTS: {e}") from e
+    if not isinstance(entries, list) or not entries:
+        raise ValueError("AZURE_OPENAI_DEPLOYMENTS must be a non-empty JSON list")
+    
+    deployments = []
+    for index, entry in enumerate(entries, start=1):
+        deployment = Deployment(
+            endpoint=entry.get("endpoint") or AzureOpenAIConfig.ENDPOINT,
+            deployment=entry.get("deployment") or AzureOpenAIConfig.DEPLOYMENT,
+            api_key=entry.get("api_key") or AzureOpenAIConfig.API_KEY,
+            api_version=entry.get("api_version") or AzureOpenAIConfig.API_VERSION,
+            weight=float(entry.get("weight", 1.0)),
+            requests_per_minute=int(entry.get("rpm", AppConfig.RATE_LIMIT_REQUESTS_PER_MINUTE)),
+            tokens_per_minute=int(entry.get("tpm", AppConfig.RATE_LIMIT_TOKENS_PER_MINUTE)),
+        )
+        if not (deployment.endpoint and deployment.deployment and deployment.api_key):
+            raise ValueError(
+                f"Deployment {index} in AZURE_OPENAI_DEPLOYMENTS needs an endpoint, deployment and api_key"
+            )
+        if deployment.weight <= 0:
+            raise ValueError(f"Deployment {index} in AZURE_OPENAI_DEPLOYMENTS needs a positive weight")
+        deployments.append(deployment)
+    return deployments
+
+
+class _DeploymentState:
+    """What the pool has observed about one deployment."""
+    
+    def __init__(self, deployment: Deployment):
+        self.deployment = deployment
+        self.limiter: RateLimiter = get_rate_limiter(
+            deployment.name, deployment.requests_per_minute, deployment.tokens_per_minute
+        )
+        self.in_flight = 0
+        self.latency: Optional[float] = None  # moving average of seconds per 1000 request tokens
+        self.error_rate = 0.0  # moving average of failed requests
+        self.consecutive_failures = 0
+        self.ejected_until = 0.0
+
+
+class DeploymentPool:
+    """Routes each request to the least-loaded healthy deployment of a pool.
+    
+    Deployments are ranked by ``(in-flight requests + 1) * latency *
+    (1 + error penalty) / weight``, where latency and error rate are moving
+    averages of what this process observed, so a slow or failing region
+    receives less traffic and an idle, fast one more. A deployment is only
+    chosen if its rate limiter has budget for the request; otherwise the
+    next one is tried, so every deployment's quota is used before anyone
+    waits. A deployment that fails ``LLM_POOL_FAILURE_THRESHOLD`` times in a
+    row is ejected for ``LLM_POOL_COOLDOWN_SECONDS``, and a throttled one is
+    paused for its ``Retry-After`` delay through its rate limiter.
+    """
+    
+    def __init__(self, deployments: List[Deployment]):
+        if not deployments:
+            raise ValueError("A deployment pool needs at least one deployment")
+        self.logger = setup_logger(__name__)
+        self._states = {deployment: _DeploymentState(deployment) for deployment in deployments}
+        self._lock = threading.Lock()
+        self.failure_threshold = max(1, AppConfig.LLM_POOL_FAILURE_THRESHOLD)
+        self.cooldown_seconds = AppConfig.LLM_POOL_COOLDOWN_SECONDS
+        self.latency_decay = AppConfig.LLM_POOL_LATENCY_DECAY
+    
+    @property
+    def deployments(self) -> List[Deployment]:
+        return list(self._states)
+    
+    def cache_scope(self) -> Dict[str, Any]:
+        """Identify the model behind the pool, for keying cached responses.
+        
+        A single deployment is identified by its endpoint and API version,
+        as before pools existed. The deployments of a pool must serve the
+        same model, so a pool is identified by ``AZURE_OPENAI_DEPLOYMENT``
+        alone and cached responses survive adding or removing deployments.
+        """
+        if len(self._states) == 1:
+            deployment = self.deployments[0]
+            return {"endpoint": deployment.endpoint, "api_version": deployment.api_version}
+        return {"pool": AzureOpenAIConfig.DEPLOYMENT}
+    
+    def _ranked(self, avoid: Optional[Deployment], now: float) -> Tuple[List[_DeploymentState], float]:
+        """Order the usable deployments best first.
+        
+        Returns:
+            Tuple of (candidates, seconds until an ejected deployment returns
+            if none is usable)
+        """
+        with self._lock:
+            healthy = [state for state in self._states.values() if state.ejected_until <= now]
+            if not healthy:
+                return [], min(state.ejected_until for state in self._states.values()) - now
+            if avoid is not None and len(healthy) > 1:
+                # Fail over: retry a failed request elsewhere while anywhere else is healthy
+                healthy = [state for state in healthy if state.deployment != avoid]
+            
+            observed = [state.latency for state in self._states.values() if state.latency is not None]
+            # Deployments without observations yet are assumed to be average, so they get tried
+            default_latency = sum(observed) / len(observed) if observed else 1.0
+            
+            def score(state: _DeploymentState) -> float:
+                latency = state.latency if state.latency is not None else default_latency
+                return ((state.in_flight + 1) * latency * (1 + ERROR_RATE_PENALTY * state.error_rate)
+                        / state.deployment.weight)
+            
+            return sorted(healthy, key=score), 0.0
+    
+    def try_acquire(self, tokens: int, avoid: Optional[Deployment] = None) -> Tuple[Optional[Deployment], float]:
+        """Reserve budget for one request on the best deployment that has some.
+        
+        Args:
+            tokens: Estimated tokens of the request
+            avoid: Deployment the request just failed on, used only if nothing else is healthy
+        
+        Returns:
+            Tuple of (deployment, 0) or, if none can take the request now,
+            (None, seconds to wait before trying again)
+        """
+        candidates, wait = self._ranked(avoid, time.time())
+        waits = []
+        for state in candidates:
+            budget_wait = state.limiter.try_acquire(tokens)
+            if budget_wait <= 0:
+                with self._lock:
+                    state.in_flight += 1
+                return state.deployment, 0.0
+            waits.append(budget_wait)
+        return None, min(waits) if waits else wait
+    
+    def acquire(self, tokens: int, avoid: Optional[Deployment] = None) -> Deployment:
+        """Block until a deployment can take a request of ``tokens`` tokens, and return it."""
+        while True:
+            deployment, wait = self.try_acquire(tokens, avoid)
+            if deployment is not None:
+                return deployment
+            time.sleep(wait)
+    
+    async def acquire_async(self, tokens: int, avoid: Optional[Deployment] = None) -> Deployment:
+        """Wait without blocking the event loop until a deployment can take a request, and return it."""
+        while True:
+            deployment, wait = self.try_acquire(tokens, avoid)
+            if deployment is not None:
+                return deployment
+            await asyncio.sleep(wait)
+    
+    def succeeded(self, deployment: Deployment, seconds: float, tokens: int) -> None:
+        """Record a completed request."""
+        state = self._states[deployment]
+        latency = seconds / max(1.0, tokens / 1000)
+        with self._lock:
+            state.in_flight -= 1
+            state.latency = latency if state.latency is None else (
+                self.latency_decay * latency + (1 - self.latency_decay) * state.latency
+            )
+            state.error_rate *= 1 - self.latency_decay
+            state.consecutive_failures = 0
+    
+    def released(self, deployment: Deployment) -> None:
+        """Record a request that neither completed nor failed, e.g. because it was cancelled."""
+        with self._lock:
+            self._states[deployment].in_flight -= 1
+    
+    def failed(self, deployment: Deployment, unhealthy: bool, pause_seconds: float = 0.0) -> None:
+        """Record a failed request.
+        
+        Args:
+            deployment: Deployment the request was sent to
+            unhealthy: Whether the failure counts against the deployment's health
+                (timeouts, connection and server errors, not bad requests)
+            pause_seconds: Pause the deployment's rate limiter, e.g. after a 429
+        """
+        state = self._states[deployment]
+        if pause_seconds > 0:
+            state.limiter.pause(pause_seconds)
+        with self._lock:
+            state.in_flight -= 1
+            if not unhealthy:
+                return
+            state.error_rate = self.latency_decay + (1 - self.latency_decay) * state.error_rate
+            state.consecutive_failures += 1
+            if state.consecutive_failures < self.failure_threshold or len(self._states) == 1:
+                return
+            state.ejected_until = time.time() + self.cooldown_seconds
+        increment("llm.deployments_ejected")
+        self.logger.warning(
+            f"Deployment '{deployment.name}' failed {state.consecutive_failures} times in a row, "
+            f"ejecting it for {self.cooldown_seconds:.0f}s"
+        )
+    
+    def has_alternative(self, deployment: Deployment) -> bool:
+        """Whether another deployment is healthy, so a failed request can fail over right away."""
+        now = time.time()
+        with self._lock:
+            return any(
+                state.deployment != deployment and state.ejected_until <= now for state in self._states.values()
+            )
+
+
+_pool: Optional[DeploymentPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_deployment_pool() -> DeploymentPool:
+    """Return the deployment pool shared by every summarizer in this process.
+    
+    Raises:
+        ValueError: If the deployments are not configured correctly
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = DeploymentPool(load_deployments())
+            setup_logger(__name__).info(f"Balancing requests across {len(_pool.deployments)} deployment(s)")
+        return _pool
+
+
+_clients: Dict[Tuple[str, str, str], "AzureOpenAI"] = {}
+_http_clients: Dict[str, Any] = {}
+_async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[Tuple[str, str, str], Any]]" = (
+    weakref.WeakKeyDictionary()
+)
+_async_http_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, Any]]" = (
+    weakref.WeakKeyDictionary()
+)
+_clients_lock = threading.Lock()
+
+
+def _connection_limits():
+    import httpx
+    
+    connections = max(1, AppConfig.LLM_MAX_CONNECTIONS)
+    return httpx.Limits(max_connections=connections, max_keepalive_connections=connections)
+
+
+def get_client(deployment: Deployment) -> "AzureOpenAI":
+    """Return the client for a deployment's endpoint, shared by every summarizer in this process.
+    
+    All clients of one endpoint share one pooled HTTP client, so
+    connections are kept alive and reused across summarizers and threads.
+    """
+    key = (deployment.endpoint, deployment.api_key, deployment.api_version)
+    with _clients_lock:
+        client = _clients.get(key)
+        if client is None:
+            from openai import AzureOpenAI, DefaultHttpxClient
+            
+            http_client = _http_clients.get(deployment.endpoint)
+            if http_client is None:
+                http_client = _http_clients[deployment.endpoint] = DefaultHttpxClient(limits=_connection_limits())
+            client = _clients[key] = AzureOpenAI(
+                api_key=deployment.api_key,
+                api_version=deployment.api_version,
+                azure_endpoint=deployment.endpoint,
+                max_retries=0,  # retries and failover are handled by the summarizer
+                http_client=http_client,
+            )
+        return client
+
+
+def get_async_client(deployment: Deployment) -> "AsyncAzureOpenAI":
+    """Async counterpart of ``get_client``.
+    
+    Async connections belong to an event loop, so clients are shared per
+    running loop and dropped with it.
+    """
+    loop = asyncio.get_running_loop()
+    key = (deployment.endpoint, deployment.api_key, deployment.api_version)
+    with _clients_lock:
+        clients = _async_clients.setdefault(loop, {})
+        client = clients.get(key)
+        if client is None:
+            from openai import AsyncAzureOpenAI, DefaultAsyncHttpxClient
+            
+            http_clients = _async_http_clients.setdefault(loop, {})
+            http_client = http_clients.get(deployment.endpoint)
+            if http_client is None:
+                http_client = http_clients[deployment.endpoint] = DefaultAsyncHttpxClient(
+                    limits=_connection_limits()
+                )
+            client = clients[key] = AsyncAzureOpenAI(
+                api_key=deployment.api_key,
+                api_version=deployment.api_version,
+                azure_endpoint=deployment.endpoint,
+                max_retries=0,  # retries and failover are handled by the summarizer
+                http_client=http_client,
+            )
+        return client
@@ -0,0 +1,221 @@
+"""Client-side rate limiting for Azure OpenAI deployments."""
+import asyncio
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+from config.settings import AppConfig
+from ..utils.logger import setup_logger
+
+
+# Azure enforces quotas over short windows, so buckets hold at most ~10 seconds of budget
+BURST_WINDOWS_PER_MINUTE = 6
+
+
+class TokenBucket:
+    """Token bucket refilled continuously at a per-minute rate.
+    
+    A bucket only computes state transitions; callers own the locking and,
+    for shared limiters, the storage of ``level`` and ``updated``.
+    """
+    
+    def __init__(self, per_minute: float):
+        self.capacity = max(1.0, per_minute / BURST_WINDOWS_PER_MINUTE)
+        self.refill_per_second = per_minute / 60.0
+    
+    def refill(self, level: float, updated: float, now: float) -> float:
+        """Return the bucket level at ``now`` given its level at ``updated``."""
+        return min(self.capacity, level + max(0.0, now - updated) * self.refill_per_second)
+    
+    def wait_time(self, level: float, amount: float) -> float:
+        """Seconds until ``amount`` can be taken from a bucket at ``level``."""
+        # Requests larger than the bucket are let through whenever the bucket is full
+        deficit = min(amount, self.capacity) - level
+        return 0.0 if deficit <= 0 else deficit / self.refill_per_second
+    
+    def take(self, level: float, amount: float) -> float:
+        """Return the level after taking ``amount``.
+        
+        The full amount is taken, so a request larger than the bucket leaves
+        it in debt and later callers wait until the debt is refilled.
+        """
+        return level - amount
+
+
+class RateLimiter:
+    """Requests-per-minute and tokens-per-minute limiter for one deployment.
+    
+    The limiter is thread-safe and can be awaited from async code. A limit
+    of 0 disables that bucket. When the service answers 429, ``pause`` stops
+    every caller sharing the limiter until the ``Retry-After`` delay has
+    passed, even when both buckets are disabled.
+    """
+    
+    def __init__(self, requests_per_minute: int = 0, tokens_per_minute: int = 0):
+        self.request_bucket = TokenBucket(requests_per_minute) if requests_per_minute > 0 else None
+        self.token_bucket = TokenBucket(tokens_per_minute) if tokens_per_minute > 0 else None
+        self._lock = threading.Lock()
+        now = time.time()
+        self._state = {
+            "requests": (self.request_bucket.capacity if self.request_bucket else 0.0, now),
+            "tokens": (self.token_bucket.capacity if self.token_bucket else 0.0, now),
+        }
+        self._paused_until = 0.0
+    
+    def _reserve(self, state: Dict[str, Tuple[float, float]], paused_until: float,
+                 tokens: int, now: float) -> Tuple[float, Dict[str, Tuple[float, float]]]:
+        """Try to take one request and ``tokens`` tokens from the given state.
+        
+        Returns:
+            Tuple of (seconds to wait, new state). The budget is only taken
+            when the wait is 0.
+        """
+        if paused_until > now:
+            return paused_until - now, state
+        
+        buckets = {"requests": (self.request_bucket, 1), "tokens": (self.token_bucket, tokens)}
+        levels = {}
+        wait = 0.0
+        for name, (bucket, amount) in buckets.items():
+            if bucket is None:
+                continue
+            level = bucket.refill(*state[name], now)
+            levels[name] = level
+            wait = max(wait, bucket.wait_time(level, amount))
+        
+        if wait > 0:
+            return wait, state
+        
+        new_state = dict(state)
+        for name, level in levels.items():
+            bucket, amount = buckets[name]
+            new_state[name] = (bucket.take(level, amount), now)
+        return 0.0, new_state
+    
+    def try_acquire(self, tokens: int = 0) -> float:
+        """Take budget for one request if available, otherwise return the wait in seconds."""
+        with self._lock:
+            wait, self._state = self._reserve(self._state, self._paused_until, tokens, time.time())
+            return wait
+    
+    def pause(self, seconds: float):
+        """Block every caller of this limiter for ``seconds`` (e.g. after a 429)."""
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.time() + seconds)
+    
+    def acquire(self, tokens: int = 0):
+        """Block until one request using ``tokens`` tokens fits in the budget."""
+        while True:
+            wait = self.try_acquire(tokens)
+            if wait <= 0:
+                return
+            time.sleep(wait)
+    
+    async def acquire_async(self, tokens: int = 0):
+        """Wait without blocking the event loop until one request fits in the budget."""
+        while True:
+            wait = self.try_acquire(tokens)
+            if wait <= 0:
+                return
+            await asyncio.sleep(wait)
+
+
+class SQLiteRateLimiter(RateLimiter):
+    """Rate limiter whose bucket state lives in a SQLite database.
+    
+    Every process pointing at the same database file (on local disk) shares
+    one budget, so a batch job with several worker processes stays under the
+    deployment's quota as a whole.
+    """
+    
+    def __init__(self, db_path: str, name: str, requests_per_minute: int = 0, tokens_per_minute: int = 0):
+        super().__init__(requests_per_minute, tokens_per_minute)
+        self.db_path = Path(db_path)
+        self.name = name
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS rate_limits ("
+                " name TEXT PRIMARY KEY,"
+                " request_level REAL NOT NULL,"
+                " token_level REAL NOT NULL,"
+                " updated REAL NOT NULL,"
+                " paused_until REAL NOT NULL)"
+            )
+            conn.execute(
+                "INSERT OR IGNORE INTO rate_limits VALUES (?, ?, ?, ?, 0)",
+                (name, self._state["requests"][0], self._state["tokens"][0], time.time()),
+            )
+    
+    def _connect(self) -> sqlite3.Connection:
+        # Autocommit mode, transactions are managed explicitly with BEGIN IMMEDIATE
+        return sqlite3.connect(str(self.db_path), timeout=30, isolation_level=None)
+    
+    def try_acquire(self, tokens: int = 0) -> float:
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            request_level, token_level, updated, paused_until = conn.execute(
+                "SELECT request_level, token_level, updated, paused_until FROM rate_limits WHERE name = ?",
+                (self.name,),
+            ).fetchone()
+            state = {"requests": (request_level, updated), "tokens": (token_level, updated)}
+            now = time.time()
+            wait, new_state = self._reserve(state, paused_until, tokens, now)
+            if wait <= 0:
+                conn.execute(
+                    "UPDATE rate_limits SET request_level = ?, token_level = ?, updated = ? WHERE name = ?",
+                    (new_state["requests"][0], new_state["tokens"][0], now, self.name),
+                )
+            conn.execute("COMMIT")
+            return wait
+        except Exception:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+    
+    def pause(self, seconds: float):
+        conn = self._connect()
+        try:
+            conn.execute(
+                "UPDATE rate_limits SET paused_until = MAX(paused_until, ?) WHERE name = ?",
+                (time.time() + seconds, self.name),
+            )
+        finally:
+            conn.close()
+
+
+_limiters: Dict[str, RateLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(name: str, requests_per_minute: Optional[int] = None,
+                     tokens_per_minute: Optional[int] = None) -> RateLimiter:
+    """Return the rate limiter shared by every caller of a deployment in this process.
+    
+    Limits default to ``AppConfig.RATE_LIMIT_REQUESTS_PER_MINUTE`` and
+    ``AppConfig.RATE_LIMIT_TOKENS_PER_MINUTE``. When
+    ``AppConfig.RATE_LIMIT_STATE_PATH`` is set, the budget is also shared with
+    other processes through a SQLite database.
+    
+    Args:
+        name: Identifies the quota, e.g. endpoint and deployment
+        requests_per_minute: Request limit of the quota, if it differs from the default
+        tokens_per_minute: Token limit of the quota, if it differs from the default
+    """
+    with _limiters_lock:
+        limiter = _limiters.get(name)
+        if limiter is None:
+            rpm = AppConfig.RATE_LIMIT_REQUESTS_PER_MINUTE if requests_per_minute is None else requests_per_minute
+            tpm = AppConfig.RATE_LIMIT_TOKENS_PER_MINUTE if tokens_per_minute is None else tokens_per_minute
+            if AppConfig.RATE_LIMIT_STATE_PATH and (rpm > 0 or tpm > 0):
+                limiter = SQLiteRateLimiter(AppConfig.RATE_LIMIT_STATE_PATH, name, rpm, tpm)
+            else:
+                limiter = RateLimiter(rpm, tpm)
+            setup_logger(__name__).debug(f"Created rate limiter for '{name}' (rpm={rpm}, tpm={tpm})")
+            _limiters[name] = limiter
+        return limiter
@@ -0,0 +1,45 @@
+"""Lazy registry of summarizers."""
+import importlib
+from typing import Any, Dict, Tuple
+
+
+DEFAULT_SUMMARIZER = "azure_openai"
+
+# Summarizer name -> (module, class). Modules are imported on first use, so the
+# LLM client library is only loaded once a summary is actually requested.
+SUMMARIZERS: Dict[str, Tuple[str, str]] = {
+    "azure_openai": (".azure_openai_summarizer", "AzureOpenAISummarizer"),
+}
+
+_classes: Dict[str, type] = {}
+
+
+def register_summarizer(name: str, module: str, class_name: str):
+    """Register a summarizer class by import path without importing it.
+    
+    Args:
+        name: Name the summarizer is created by
+        module: Module path, absolute or relative to this package
+        class_name: Name of the summarizer class in the module
+    """
+    SUMMARIZERS[name] = (module, class_name)
+    _classes.pop(name, None)
+
+
+def get_summarizer_class(name: str = DEFAULT_SUMMARIZER) -> type:
+    """Import and return the summarizer class registered under a name.
+    
+    Raises:
+        ValueError: If no summarizer is registered under the name
+    """
+    if name not in _classes:
+        if name not in SUMMARIZERS:
+            raise ValueError(f"Unknown summarizer '{name}'. Available: {', '.join(SUMMARIZERS)}")
+        module, class_name = SUMMARIZERS[name]
+        _classes[name] = getattr(importlib.import_module(module, __package__), class_name)
+    return _classes[name]
+
+
+def create_summarizer(name: str = DEFAULT_SUMMARIZER, **kwargs) -> Any:
+    """Create an instance of the summarizer registered under a name."""
+    return get_summarizer_class(name)(**kwargs)
@@ -0,0 +1,109 @@
+"""Caches for LLM responses keyed by the full request payload."""
+import hashlib
+import json
+import sqlite3
+import time
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from config.settings import AppConfig
+from ..utils.logger import setup_logger
+
+
+def make_request_key(payload: Dict[str, Any]) -> str:
+    """Hash a request payload into a stable cache key.
+    
+    Args:
+        payload: JSON-serializable request, including the endpoint and every
+            parameter that can change the response
+    
+    Returns:
+        Hex digest of the canonical JSON encoding of the payload
+    """
+    payload_json = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(payload_json.encode("utf-8")).hexdigest()
+
+
+class BaseResponseCache(ABC):
+    """Abstract base class for LLM response caches."""
+    
+    @abstractmethod
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached response for a key, or None on a miss or expired entry."""
+        pass
+    
+    @abstractmethod
+    def set(self, key: str, response: str) -> None:
+        """Store a response for a key."""
+        pass
+
+
+class SQLiteResponseCache(BaseResponseCache):
+    """Response cache stored in a SQLite database.
+    
+    Entries expire after ``ttl_seconds``. Once the cache holds more than
+    ``max_entries`` rows, the least recently used ones are deleted. A new
+    connection is opened per operation, so one instance can be shared by
+    threads and the database file by processes.
+    """
+    
+    def __init__(self, db_path: Optional[str] = None, ttl_seconds: Optional[int] = None,
+                 max_entries: Optional[int] = None):
+        self.logger = setup_logger(__name__)
+        self.db_path = Path(db_path or AppConfig.LLM_CACHE_PATH)
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else AppConfig.LLM_CACHE_TTL_SECONDS
+        self.max_entries = max_entries if max_entries is not None else AppConfig.LLM_CACHE_MAX_ENTRIES
+        self._initialize_db()
+    
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(str(self.db_path), timeout=30)
+    
+    def _initialize_db(self):
+        """Create the cache table if it does not exist."""
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                " key TEXT PRIMARY KEY,"
+                " response TEXT NOT NULL,"
+                " created_at REAL NOT NULL,"
+                " accessed_at REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS responses_accessed_at ON responses (accessed_at)")
+    
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached response for a key, or None on a miss or expired entry."""
+        now = time.time()
+        try:
+            with self._connect() as conn:
+                row = conn.execute(
+                    "SELECT response FROM responses WHERE key = ? AND created_at >= ?",
+                    (key, now - self.ttl_seconds),
+                ).fetchone()
+                if row is not None:
+                    conn.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key))
+        except sqlite3.Error as e:
+            self.logger.warning(f"Response cache lookup failed: {e}")
+            return None
+        
+        return row[0] if row is not None else None
+    
+    def set(self, key: str, response: str) -> None:
+        """Store a response and evict expired and least recently used entries."""
+        now = time.time()
+        try:
+            with self._connect() as conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO responses (key, response, created_at, accessed_at) "
+                    "VALUES (?, ?, ?, ?)",
+                    (key, response, now, now),
+                )
+                conn.execute("DELETE FROM responses WHERE created_at < ?", (now - self.ttl_seconds,))
+                conn.execute(
+                    "DELETE FROM responses WHERE key IN ("
+                    " SELECT key FROM responses ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+                    (self.max_entries,),
+                )
+        except sqlite3.Error as e:
+            self.logger.warning(f"Response cache write failed: {e}")
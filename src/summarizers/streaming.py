@@ -0,0 +1,67 @@
+"""Streaming summary output and its latency metrics."""
+import time
+from dataclasses import dataclass
+from typing import Iterable, Iterator, List, Optional
+
+from ..utils.logger import setup_logger
+from ..utils.metrics import increment, metrics
+from ..utils.token_utils import count_tokens
+
+
+@dataclass
+class StreamStats:
+    """Latency and throughput of one streamed completion."""
+    
+    time_to_first_token: Optional[float] = None  # seconds from the request to the first text
+    elapsed_seconds: float = 0.0
+    completion_tokens: int = 0
+    cached: bool = False
+    
+    @property
+    def tokens_per_second(self) -> float:
+        """Generation speed after the first token."""
+        generation_seconds = self.elapsed_seconds - (self.time_to_first_token or 0.0)
+        return self.completion_tokens / generation_seconds if generation_seconds > 0 else 0.0
+
+
+class SummaryStream:
+    """Iterable of summary text deltas, in the order they arrive.
+    
+    The stream can be iterated once. While it is consumed, ``stats`` records
+    the time to first token (measured from when the summary was requested,
+    so it includes any map phase for long documents) and, once exhausted,
+    the total time, token count and tokens per second.
+    """
+    
+    def __init__(self, deltas: Iterable[str], started: Optional[float] = None, cached: bool = False):
+        self.logger = setup_logger(__name__)
+        self.started = started if started is not None else time.perf_counter()
+        self.stats = StreamStats(cached=cached)
+        self._deltas = iter(deltas)
+        self._parts: List[str] = []
+    
+    def __iter__(self) -> Iterator[str]:
+        for delta in self._deltas:
+            if not delta:
+                continue
+            if self.stats.time_to_first_token is None:
+                self.stats.time_to_first_token = time.perf_counter() - self.started
+            self._parts.append(delta)
+            yield delta
+        
+        self.stats.elapsed_seconds = time.perf_counter() - self.started
+        self.stats.completion_tokens = count_tokens(self.text)
+        if not self.stats.cached:
+            # Streams carry no usage block, so completion tokens are counted locally
+            increment("llm.completion_tokens", self.stats.completion_tokens)
+            metrics.record_span("llm.time_to_first_token", self.stats.time_to_first_token or 0.0)
+        self.logger.info(
+            f"Streamed {self.stats.completion_tokens} tokens: first token after "
+            f"{self.stats.time_to_first_token or 0.0:.2f}s, {self.stats.tokens_per_second:.1f} tokens/s"
+            f"{' (cached)' if self.stats.cached else ''}"
+        )
+    
+    @property
+    def text(self) -> str:
+        """The text received so far."""
+        return "".join(self._parts)
@@ -0,0 +1,279 @@
+"""Hierarchical summaries that are updated incrementally when a document is revised."""
+import hashlib
+import sqlite3
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, List, Optional
+
+from config.settings import AppConfig
+from .base import SummarizationError
+from ..utils.logger import setup_logger
+from ..utils.metrics import increment, span
+from ..utils.text_normalization import normalize_pages
+from ..utils.token_utils import count_tokens, split_text_into_chunks
+
+if TYPE_CHECKING:
+    from .azure_openai_summarizer import AzureOpenAISummarizer
+
+
+# Once a section holds SUMMARY_SECTION_MIN_TOKENS, it ends after the next unit whose
+# content hash is divisible by this, i.e. on average this many units later
+SECTION_BOUNDARY_DIVISOR = 4
+
+
+def _content_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def plan_sections(units: List[str], min_tokens: int, max_tokens: int) -> List[str]:
+    """Group consecutive units (pages, blocks or summaries) into sections.
+    
+    Section boundaries are chosen by the content of the units, not their
+    position: a section ends once it holds ``min_tokens`` and a unit's hash
+    is divisible by ``SECTION_BOUNDARY_DIVISOR``, or when the next unit
+    would exceed ``max_tokens``. When a revision changes, inserts or deletes
+    a unit, only the sections around it change; the boundaries before it
+    and, after the next shared boundary, those following it stay the same.
+    
+    Returns:
+        Section texts, units joined by blank lines
+    """
+    sections: List[str] = []
+    current: List[str] = []
+    current_tokens = 0
+    for unit in units:
+        for piece in (split_text_into_chunks(unit, max_tokens) if unit.strip() else []):
+            piece_tokens = count_tokens(piece)
+            if current and current_tokens + piece_tokens > max_tokens:
+                sections.append("\n\n".join(current))
+                current, current_tokens = [], 0
+            current.append(piece)
+            current_tokens += piece_tokens
+            if current_tokens >= min_tokens and int(_content_hash(piece)[:8], 16) % SECTION_BOUNDARY_DIVISOR == 0:
+                sections.append("\n\n".join(current))
+                current, current_tokens = [], 0
+    if current:
+        sections.append("\n\n".join(current))
+    return sections
+
+
+@dataclass
+class TreeReport:
+    """How much of a document's summary tree was reused."""
+    
+    units: int = 0
+    units_extracted: int = 0
+    sections: int = 0
+    sections_summarized: int = 0
+    groups: int = 0
+    groups_summarized: int = 0
+    final_summarized: bool = False
+    
+    @property
+    def llm_requests(self) -> int:
+        return self.sections_summarized + self.groups_summarized + int(self.final_summarized)
+
+
+class SummaryTreeStore:
+    """Extracted page texts and tree node summaries, keyed by content.
+    
+    Page texts are keyed by the page's fingerprint and the extraction
+    settings, node summaries by their full LLM request. Keys never depend
+    on a document's name, so a revision saved under a new file name still
+    reuses everything its predecessor shares with it. Unlike the response
+    cache, entries only expire after ``max_age_days`` without being used.
+    """
+    
+    def __init__(self, db_path: Optional[str] = None, max_age_days: Optional[int] = None):
+        self.logger = setup_logger(__name__)
+        self.db_path = Path(db_path or AppConfig.SUMMARY_TREE_PATH)
+        self.max_age_days = max_age_days if max_age_days is not None else AppConfig.SUMMARY_TREE_MAX_AGE_DAYS
+        self._initialize_db()
+    
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(str(self.db_path), timeout=30)
+    
+    def _initialize_db(self):
+        """Create the pages and nodes tables if they do not exist."""
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            for table in ("pages", "nodes"):
+                conn.execute(
+                    f"CREATE TABLE IF NOT EXISTS {table} ("
+                    " key TEXT PRIMARY KEY,"
+                    " text TEXT NOT NULL,"
+                    " used_at REAL NOT NULL)"
+                )
+                conn.execute(f"CREATE INDEX IF NOT EXISTS {table}_used_at ON {table} (used_at)")
+    
+    def _get_many(self, table: str, keys: List[str]) -> Dict[str, str]:
+        found: Dict[str, str] = {}
+        unique = list(dict.fromkeys(keys))
+        now = time.time()
+        with self._connect() as conn:
+            # Stay below SQLite's limit on bound parameters
+            for start in range(0, len(unique), 500):
+                batch = unique[start:start + 500]
+                placeholders = ",".join("?" * len(batch))
+                found.update(conn.execute(
+                    f"SELECT key, text FROM {table} WHERE key IN ({placeholders})", batch
+                ).fetchall())
+            conn.executemany(f"UPDATE {table} SET used_at = ? WHERE key = ?", [(now, key) for key in found])
+        return found
+    
+    def _set_many(self, table: str, items: Dict[str, str]) -> None:
+        now = time.time()
+        with self._connect() as conn:
+            conn.executemany(
+                f"INSERT OR REPLACE INTO {table} (key, text, used_at) VALUES (?, ?, ?)",
+                [(key, text, now) for key, text in items.items()],
+            )
+    
+    def get_pages(self, keys: List[str]) -> Dict[str, str]:
+        """Return the stored texts of the pages with these keys."""
+        return self._get_many("pages", keys)
+    
+    def set_pages(self, items: Dict[str, str]) -> None:
+        """Store page texts by key."""
+        self._set_many("pages", items)
+    
+    def get_nodes(self, keys: List[str]) -> Dict[str, str]:
+        """Return the stored summaries of the nodes with these keys."""
+        return self._get_many("nodes", keys)
+    
+    def set_nodes(self, items: Dict[str, str]) -> None:
+        """Store node summaries by key."""
+        self._set_many("nodes", items)
+    
+    def prune(self) -> None:
+        """Delete pages and summaries that were not used for ``max_age_days``."""
+        if self.max_age_days <= 0:
+            return
+        cutoff = time.time() - self.max_age_days * 86400
+        with self._connect() as conn:
+            for table in ("pages", "nodes"):
+                conn.execute(f"DELETE FROM {table} WHERE used_at < ?", (cutoff,))
+
+
+class TreeSummarizer:
+    """Summarize a document as a tree whose unchanged nodes are reused.
+    
+    The document's units (pages, or text blocks for non-PDF documents) are
+    grouped into content-defined sections and every section is summarized.
+    If the section summaries are too long for one final call, they are
+    grouped and summarized again, level by level, and the top level is
+    combined into the final summary. Every node's summary is stored under
+    its request, so when a revision arrives only the sections whose text
+    changed, the groups above them and the final summary are requested
+    again: tokens and latency scale with the size of the change.
+    """
+    
+    def __init__(self, summarizer: "AzureOpenAISummarizer", store: Optional[SummaryTreeStore] = None):
+        self.logger = setup_logger(__name__)
+        self.summarizer = summarizer
+        self.store = store or SummaryTreeStore()
+        self.min_section_tokens = AppConfig.SUMMARY_SECTION_MIN_TOKENS
+        self.max_section_tokens = AppConfig.SUMMARY_CHUNK_TOKENS
+    
+    def summarize(self, units: List[str], custom_prompt: Optional[str] = None, use_cache: bool = True,
+                  report: Optional[TreeReport] = None) -> str:
+        """Summarize a document given as units, reusing stored node summaries.
+        
+        Args:
+            units: Page texts (or text blocks) in document order
+            custom_prompt: Optional custom prompt for the final summary
+            use_cache: Set to False to request every node again (results are still stored)
+            report: Report to fill in with what was reused
+        
+        Returns:
+            Summary text
+        
+        Raises:
+            SummarizationError: If summarization fails
+        """
+        report = report if report is not None else TreeReport()
+        try:
+            report.units = len(units)
+            units = self._normalize(units)
+            
+            sections = plan_sections(units, self.min_section_tokens, self.max_section_tokens)
+            report.sections = len(sections)
+            if len(sections) <= 1:
+                # Short document: summarize it directly, as summarize() would
+                request = self.summarizer.final_request("\n\n".join(sections), custom_prompt)
+                summary, report.final_summarized = self._complete_one(request, use_cache)
+            else:
+                summaries, report.sections_summarized = self._summarize_nodes(sections, use_cache)
+                while count_tokens("\n\n".join(summaries)) > self.max_section_tokens:
+                    groups = plan_sections(summaries, self.min_section_tokens, self.max_section_tokens)
+                    if len(groups) >= len(summaries):
+                        break
+                    report.groups += len(groups)
+                    summaries, summarized = self._summarize_nodes(groups, use_cache)
+                    report.groups_summarized += summarized
+                
+                request = self.summarizer.final_request("\n\n".join(summaries), custom_prompt, reduce=True)
+                summary, report.final_summarized = self._complete_one(request, use_cache)
+            
+            increment("tree.sections", report.sections)
+            increment("tree.sections_reused", report.sections - report.sections_summarized)
+            self.logger.info(
+                f"Summary tree: {report.sections_summarized}/{report.sections} sections and "
+                f"{report.groups_summarized}/{report.groups} groups summarized, the rest reused"
+            )
+            self.store.prune()
+            return summary
+        except SummarizationError as e:
+            self.logger.error(f"Summarization failed: {e}")
+            raise
+        except Exception as e:
+            error_msg = f"Summarization failed: {e}"
+            self.logger.error(error_msg)
+            raise SummarizationError(error_msg) from e
+    
+    def _normalize(self, units: List[str]) -> List[str]:
+        """Normalize the units like ``AzureOpenAISummarizer`` normalizes whole documents."""
+        if not AppConfig.TEXT_NORMALIZATION:
+            return units
+        with span("text.normalize") as attributes:
+            units, report = normalize_pages(
+                units, AppConfig.NORMALIZE_MIN_REPEATS, AppConfig.NORMALIZE_DEDUPE_SIMILARITY
+            )
+            attributes.update(tokens_before=report.original_tokens, tokens_after=report.normalized_tokens)
+        increment("normalize.tokens_before", report.original_tokens)
+        increment("normalize.tokens_saved", report.tokens_saved)
+        return units
+    
+    def _summarize_nodes(self, texts: List[str], use_cache: bool):
+        """Summarize the nodes of one tree level, requesting only those not stored yet.
+        
+        Returns:
+            Tuple of (summaries in order, number of nodes that were requested)
+        """
+        requests = [self.summarizer.section_request(text) for text in texts]
+        keys = [self.summarizer.request_key(request) for request in requests]
+        stored = self.store.get_nodes(keys) if use_cache else {}
+        missing = [index for index, key in enumerate(keys) if key not in stored]
+        
+        if missing:
+            workers = max(1, min(AppConfig.SUMMARY_CHUNK_CONCURRENCY, len(missing)))
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                summaries = list(executor.map(
+                    lambda index: self.summarizer.complete_request(requests[index], use_cache), missing
+                ))
+            new_nodes = {keys[index]: summary for index, summary in zip(missing, summaries)}
+            self.store.set_nodes(new_nodes)
+            stored = {**stored, **new_nodes}
+        return [stored[key] for key in keys], len(missing)
+    
+    def _complete_one(self, request, use_cache: bool):
+        """Return the stored response of one request, or request it. Returns (summary, whether requested)."""
+        key = self.summarizer.request_key(request)
+        stored = self.store.get_nodes([key]).get(key) if use_cache else None
+        if stored is not None:
+            return stored, False
+        summary = self.summarizer.complete_request(request, use_cache)
+        self.store.set_nodes({key: summary})
+        return summary, True
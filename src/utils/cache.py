@@ -0,0 +1,112 @@
+"""Content-addressed on-disk cache for extracted text."""
+import hashlib
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from config.settings import AppConfig
+from .logger import setup_logger
+
+
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def hash_file(file_path: Path) -> str:
+    """Return the SHA-256 hex digest of a file's contents."""
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ExtractionCache:
+    """Extracted text cached on disk, keyed by file content and extraction settings.
+    
+    Entries are plain text files named after their key. An entry's mtime is
+    refreshed on every hit, so evicting the oldest mtimes first gives
+    least-recently-used eviction once the cache exceeds its size limit.
+    """
+    
+    def __init__(self, cache_dir: Optional[str] = None, max_size_mb: Optional[int] = None):
+        self.logger = setup_logger(__name__)
+        self.cache_dir = Path(cache_dir or AppConfig.EXTRACTION_CACHE_DIR)
+        max_size_mb = max_size_mb if max_size_mb is not None else AppConfig.EXTRACTION_CACHE_MAX_MB
+        self.max_size_bytes = max_size_mb * 1024 * 1024
+    
+    def make_key(self, file_path: Path, settings: Dict[str, Any]) -> str:
+        """Build the cache key for a file and the settings it is extracted with.
+        
+        Args:
+            file_path: Path to the document
+            settings: JSON-serializable extractor names, versions and settings
+        
+        Returns:
+            Hex digest identifying the extraction result
+        """
+        settings_json = json.dumps(settings, sort_keys=True, default=str)
+        return hashlib.sha256(f"{hash_file(file_path)}:{settings_json}".encode("utf-8")).hexdigest()
+    
+    def _entry_path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.txt"
+    
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached text for a key, or None on a miss."""
+        entry_path = self._entry_path(key)
+        try:
+            text = entry_path.read_text(encoding="utf-8")
+        except (FileNotFoundError, OSError):
+            return None
+        
+        try:
+            os.utime(entry_path)
+        except OSError:
+            pass
+        return text
+    
+    def set(self, key: str, text: str) -> None:
+        """Store text for a key and evict old entries if the cache is over its limit."""
+        entry_path = self._entry_path(key)
+        try:
+            entry_path.parent.mkdir(parents=True, exist_ok=True)
+            # Write to a temp file first so concurrent readers never see partial entries
+            fd, tmp_path = tempfile.mkstemp(dir=entry_path.parent, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(text)
+            os.replace(tmp_path, entry_path)
+        except OSError as e:
+            self.logger.warning(f"Could not write extraction cache entry: {e}")
+            return
+        
+        self.evict()
+    
+    def evict(self) -> None:
+        """Delete least recently used entries until the cache fits its size limit."""
+        entries = []
+        total_size = 0
+        for entry_path in self.cache_dir.glob("*/*.txt"):
+            try:
+                stat = entry_path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry_path))
+            total_size += stat.st_size
+        
+        if total_size <= self.max_size_bytes:
+            return
+        
+        entries.sort()
+        evicted = 0
+        for _, size, entry_path in entries:
+            if total_size <= self.max_size_bytes:
+                break
+            try:
+                entry_path.unlink()
+            except OSError:
+                continue
+            total_size -= size
+            evicted += 1
+        
+        self.logger.info(f"Evicted {evicted} extraction cache entries")
@@ -1,7 +1,9 @@
 """File handling utilities."""
 import os
+import threading
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Tuple
+from typing import Iterator, TextIO, Tuple
 from config.settings import AppConfig
 
 
@@ -27,9 +29,33 @@ def generate_output_path(input_path: Path, suffix: str = "_summary") -> Path:
     return input_path.parent / f"{input_path.stem}{suffix}.txt"
 
 
+@contextmanager
+def open_atomic(output_path: Path) -> Iterator[TextIO]:
+    """Open a temporary text file that replaces ``output_path`` when the block completes.
+    
+    If the block raises (or is interrupted), the temporary file is deleted
+    and the output is left as it was, so readers never see a partial file.
+    """
+    output_path = Path(output_path)
+    # Unique per process and thread, so concurrent writers never share a temporary file
+    temp_path = output_path.with_name(f".{output_path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        with open(temp_path, "w", encoding="utf-8") as f:
+            yield f
+        os.replace(temp_path, output_path)
+    except BaseException:
+        temp_path.unlink(missing_ok=True)
+        raise
+
+
 def save_text_to_file(text: str, output_path: Path) -> None:
-    """Save text content to a file."""
-    with open(output_path, "w", encoding="utf-8") as f:
+    """Save text content to a file.
+    
+    The text is written to a temporary file that then replaces the output,
+    so readers never see a partial file and writing the same output twice
+    (e.g. when a reclaimed job is run again) is harmless.
+    """
+    with open_atomic(output_path) as f:
         f.write(text)
 
 
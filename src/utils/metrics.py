@@ -0,0 +1,220 @@
+"""Per-stage tracing spans and counters for the pipeline."""
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from config.settings import AppConfig
+
+
+METRIC_NAME_INVALID = re.compile(r"[^a-zA-Z0-9_]")
+
+# Names of the open spans; a context variable so threads and asyncio tasks each see their own
+_open_spans: ContextVar[Tuple[str, ...]] = ContextVar("open_spans", default=())
+
+
+class Metrics:
+    """Collects timed spans and counters for one process.
+    
+    Spans are aggregated per stage name (count, total and max seconds), and
+    the most recent ``max_spans`` are also kept individually for the JSON run
+    report. Nested spans record their parent stage. Worker processes export
+    their state with ``export_state`` so the parent can ``merge`` it.
+    """
+    
+    def __init__(self, max_spans: Optional[int] = None):
+        self.max_spans = max_spans if max_spans is not None else AppConfig.METRICS_MAX_SPANS
+        self._lock = threading.Lock()
+        self.reset()
+    
+    def reset(self):
+        """Forget every span and counter."""
+        with self._lock:
+            self.started_at = time.time()
+            self._counters: Dict[str, float] = {}
+            self._stages: Dict[str, Dict[str, float]] = {}
+            self._spans: List[Dict[str, Any]] = []
+    
+    @contextmanager
+    def span(self, name: str, **attributes) -> Iterator[Dict[str, Any]]:
+        """Time a block of code as one occurrence of a stage.
+        
+        Yields the span's attribute dict, so callers can add attributes
+        (e.g. a page or token count) that are only known at the end.
+        """
+        open_spans = _open_spans.get()
+        parent = open_spans[-1] if open_spans else None
+        token = _open_spans.set(open_spans + (name,))
+        started_at = time.time()
+        started = time.perf_counter()
+        try:
+            yield attributes
+        except BaseException as e:
+            attributes["error"] = type(e).__name__
+            raise
+        finally:
+            _open_spans.reset(token)
+            self.record_span(name, time.perf_counter() - started, started_at=started_at,
+                             parent=parent, **attributes)
+    
+    def record_span(self, name: str, duration_seconds: float, started_at: Optional[float] = None,
+                    parent: Optional[str] = None, **attributes):
+        """Record a stage occurrence timed elsewhere (e.g. in a worker process)."""
+        with self._lock:
+            stage = self._stages.setdefault(name, {"count": 0, "total_seconds": 0.0, "max_seconds": 0.0})
+            stage["count"] += 1
+            stage["total_seconds"] += duration_seconds
+            stage["max_seconds"] = max(stage["max_seconds"], duration_seconds)
+            
+            if self.max_spans > 0:
+                self._spans.append({
+                    "name": name,
+                    "parent": parent,
+                    "started_at": started_at if started_at is not None else time.time() - duration_seconds,
+                    "duration_seconds": duration_seconds,
+                    "attributes": attributes,
+                })
+                if len(self._spans) > self.max_spans:
+                    del self._spans[:len(self._spans) - self.max_spans]
+    
+    def increment(self, name: str, value: float = 1):
+        """Add to a counter."""
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + value
+    
+    def counter(self, name: str) -> float:
+        """Return the current value of a counter (0 if it was never incremented)."""
+        with self._lock:
+            return self._counters.get(name, 0)
+    
+    def export_state(self) -> Dict[str, Any]:
+        """Return a picklable copy of the collected spans and counters."""
+        with self._lock:
+            return {
+                "counters": dict(self._counters),
+                "stages": {name: dict(stage) for name, stage in self._stages.items()},
+                "spans": list(self._spans),
+            }
+    
+    def merge(self, state: Dict[str, Any]):
+        """Add spans and counters exported by another process."""
+        with self._lock:
+            for name, value in state["counters"].items():
+                self._counters[name] = self._counters.get(name, 0) + value
+            for name, other in state["stages"].items():
+                stage = self._stages.setdefault(name, {"count": 0, "total_seconds": 0.0, "max_seconds": 0.0})
+                stage["count"] += other["count"]
+                stage["total_seconds"] += other["total_seconds"]
+                stage["max_seconds"] = max(stage["max_seconds"], other["max_seconds"])
+            if self.max_spans > 0:
+                self._spans.extend(state["spans"])
+                self._spans.sort(key=lambda span: span["started_at"])
+                if len(self._spans) > self.max_spans:
+                    del self._spans[:len(self._spans) - self.max_spans]
+    
+    def report(self) -> Dict[str, Any]:
+        """Build the JSON run report."""
+        state = self.export_state()
+        return {
+            "started_at": datetime.fromtimestamp(self.started_at, timezone.utc).isoformat(),
+            "finished_at": datetime.now(timezone.utc).isoformat(),
+            "elapsed_seconds": time.time() - self.started_at,
+            "counters": state["counters"],
+            "stages": {
+                name: {**stage, "mean_seconds": stage["total_seconds"] / stage["count"]}
+                for name, stage in sorted(state["stages"].items())
+            },
+            "spans": state["spans"],
+        }
+    
+    def to_prometheus(self, prefix: str = "doc_summarizer") -> str:
+        """Render counters and stage timings in the Prometheus text exposition format."""
+        state = self.export_state()
+        lines = []
+        for name, value in sorted(state["counters"].items()):
+            metric = f"{prefix}_{METRIC_NAME_INVALID.sub('_', name)}_total"
+            lines += [f"# TYPE {metric} counter", f"{metric} {value:g}"]
+        
+        if state["stages"]:
+            stage_metrics = [
+                ("seconds_total", "counter", "total_seconds"),
+                ("count", "counter", "count"),
+                ("max_seconds", "gauge", "max_seconds"),
+            ]
+            for suffix, metric_type, key in stage_metrics:
+                metric = f"{prefix}_stage_{suffix}"
+                lines.append(f"# TYPE {metric} {metric_type}")
+                for name, stage in sorted(state["stages"].items()):
+                    lines.append(f'{metric}{{stage="{name}"}} {stage[key]:g}')
+        return "\n".join(lines) + "\n"
+    
+    def write_json_report(self, path: Path, extra: Optional[Dict[str, Any]] = None):
+        """Write the JSON run report, with optional extra top-level fields."""
+        _write_atomically(Path(path), json.dumps({**self.report(), **(extra or {})}, indent=2))
+    
+    def write_prometheus_textfile(self, path: Path):
+        """Write metrics for the node_exporter textfile collector."""
+        # Written atomically so the collector never reads a partial file
+        _write_atomically(Path(path), self.to_prometheus())
+
+
+def _read_umask() -> int:
+    umask = os.umask(0)
+    os.umask(umask)
+    return umask
+
+
+# Read once at import; changing the umask to read it is not thread-safe
+_UMASK = _read_umask()
+
+
+def _write_atomically(path: Path, content: str):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(content)
+        # mkstemp creates the file as 0600; exporters such as node_exporter often run as another user
+        os.chmod(tmp_path, 0o644 & ~_UMASK)
+        os.replace(tmp_path, path)
+    except BaseException:
+        Path(tmp_path).unlink(missing_ok=True)
+        raise
+
+
+# Process-wide collector used by the pipeline
+metrics = Metrics()
+
+
+def span(name: str, **attributes):
+    """Time a block of code as a stage of the process-wide collector."""
+    return metrics.span(name, **attributes)
+
+
+def increment(name: str, value: float = 1):
+    """Add to a counter of the process-wide collector."""
+    metrics.increment(name, value)
+
+
+def write_metrics(json_path: Optional[str] = None, prometheus_path: Optional[str] = None,
+                  extra: Optional[Dict[str, Any]] = None):
+    """Export the process-wide metrics to the configured files.
+    
+    Args:
+        json_path: JSON run report path (default: ``AppConfig.METRICS_JSON_PATH``)
+        prometheus_path: Prometheus textfile path (default: ``AppConfig.METRICS_PROMETHEUS_PATH``)
+        extra: Extra top-level fields for the JSON report
+    """
+    json_path = json_path or AppConfig.METRICS_JSON_PATH
+    prometheus_path = prometheus_path or AppConfig.METRICS_PROMETHEUS_PATH
+    if json_path:
+        metrics.write_json_report(Path(json_path), extra)
+    if prometheus_path:
+        metrics.write_prometheus_textfile(Path(prometheus_path))
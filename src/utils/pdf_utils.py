@@ -0,0 +1,158 @@
+"""PDF page rendering utilities."""
+import hashlib
+import tempfile
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .metrics import increment, span
+
+if TYPE_CHECKING:
+    from PIL import Image
+
+
+# Rendered pages are sized against a US Letter page; A4 is within a few percent
+PAGE_WIDTH_INCHES = 8.5
+PAGE_HEIGHT_INCHES = 11
+
+# Keys that link a page into the document or carry metadata, and do not change what the page shows
+FINGERPRINT_IGNORED_KEYS = {"/Parent", "/StructParents", "/StructParent", "/PieceInfo", "/LastModified",
+                            "/Metadata", "/Thumb", "/B", "/ID", "/P"}
+
+
+def get_pdf_page_count(file_path: Path) -> int:
+    """Return the number of pages in a PDF without rendering it."""
+    from pdf2image import pdfinfo_from_path
+    
+    return int(pdfinfo_from_path(str(file_path))["Pages"])
+
+
+def _object_digest(obj: Any, digests: Dict[Tuple[int, int], bytes]) -> bytes:
+    """Hash a PDF object and everything it references by content, not by object number.
+    
+    Digests of indirect objects are memoized in ``digests``, so resources
+    shared by many pages (fonts, logos) are hashed once per document.
+    Streams are hashed in their encoded form, without decompressing them.
+    """
+    from pypdf.generic import ArrayObject, DictionaryObject, IndirectObject, StreamObject
+    
+    if isinstance(obj, IndirectObject):
+        key = (obj.idnum, obj.generation)
+        if key not in digests:
+            digests[key] = b""  # reference cycles (e.g. annotations pointing back at their page)
+            digests[key] = _object_digest(obj.get_object(), digests)
+        return digests[key]
+    
+    digest = hashlib.sha256(type(obj).__name__.encode("ascii"))
+    if isinstance(obj, DictionaryObject):
+        for name in sorted(obj):
+            if name not in FINGERPRINT_IGNORED_KEYS:
+                digest.update(name.encode("utf-8", "replace"))
+                digest.update(_object_digest(obj.raw_get(name), digests))
+        if isinstance(obj, StreamObject):
+            digest.update(obj._data)
+    elif isinstance(obj, ArrayObject):
+        for item in list.__iter__(obj):
+            digest.update(_object_digest(item, digests))
+    else:
+        digest.update(repr(obj).encode("utf-8", "replace"))
+    return digest.digest()
+
+
+def get_page_fingerprints(file_path: Path) -> List[str]:
+    """Fingerprint every page of a PDF without rendering or extracting it.
+    
+    A page's fingerprint covers its content streams, images, fonts and
+    every other object it references. Pages that are unchanged between two
+    revisions of a document keep their fingerprint, even if the revision
+    was written by another tool and renumbered its objects.
+    
+    Returns:
+        One hex digest per page, in page order
+    """
+    from pypdf import PdfReader
+    
+    digests: Dict[Tuple[int, int], bytes] = {}
+    reader = PdfReader(str(file_path))
+    return [_object_digest(page, digests).hex() for page in reader.pages]
+
+
+def render_pdf_page(file_path: Path, page_number: int, dpi: int, grayscale: bool = False) -> "Image.Image":
+    """Render a single PDF page in memory."""
+    from pdf2image import convert_from_path
+    
+    with span("ocr.rasterize", first_page=page_number, last_page=page_number, dpi=dpi):
+        return convert_from_path(str(file_path), dpi=dpi, first_page=page_number, last_page=page_number,
+                                 grayscale=grayscale)[0]
+
+
+def estimate_page_bytes(dpi: int, grayscale: bool) -> int:
+    """Estimate the decoded size of one rendered page in bytes."""
+    channels = 1 if grayscale else 3
+    return int(PAGE_WIDTH_INCHES * dpi) * int(PAGE_HEIGHT_INCHES * dpi) * channels
+
+
+def pages_within_memory(max_memory_mb: int, dpi: int, grayscale: bool) -> int:
+    """Return how many rendered pages fit in the given memory budget (at least one)."""
+    return max(1, int(max_memory_mb * 1024 * 1024) // estimate_page_bytes(dpi, grayscale))
+
+
+def group_page_ranges(page_numbers: Iterable[int]) -> List[Tuple[int, int]]:
+    """Group page numbers into sorted, inclusive (first, last) runs of consecutive pages."""
+    ranges = []
+    for page_number in sorted(set(page_numbers)):
+        if ranges and page_number == ranges[-1][1] + 1:
+            ranges[-1] = (ranges[-1][0], page_number)
+        else:
+            ranges.append((page_number, page_number))
+    return ranges
+
+
+def iter_pdf_page_windows(file_path: Path, window_size: int, dpi: int = 200,
+                          grayscale: bool = False, first_page: int = 1,
+                          last_page: Optional[int] = None,
+                          thread_count: int = 1) -> Iterator[List[Tuple[int, Path]]]:
+    """Render a PDF in bounded windows of pages.
+    
+    Each window is rendered by poppler straight to image files in a temporary
+    directory, so no page is held in memory by this process. The files of a
+    window are deleted as soon as the caller asks for the next one, which
+    keeps memory and disk usage flat regardless of the document length.
+    
+    Args:
+        file_path: Path to the PDF
+        window_size: Maximum number of pages rendered at a time
+        dpi: Rendering resolution
+        grayscale: Render single-channel images instead of RGB
+        first_page: First page to render (1-based)
+        last_page: Last page to render, defaults to the last page of the PDF
+        thread_count: Number of poppler processes used to render a window
+    
+    Yields:
+        Lists of (page number, image path) tuples in page order
+    """
+    from pdf2image import convert_from_path
+    
+    if last_page is None:
+        last_page = get_pdf_page_count(file_path)
+    
+    window_size = max(1, window_size)
+    for window_start in range(first_page, last_page + 1, window_size):
+        window_end = min(window_start + window_size - 1, last_page)
+        
+        with tempfile.TemporaryDirectory(prefix="ocr_pages_") as output_folder:
+            with span("ocr.rasterize", first_page=window_start, last_page=window_end, dpi=dpi):
+                image_paths = convert_from_path(
+                    str(file_path),
+                    dpi=dpi,
+                    first_page=window_start,
+                    last_page=window_end,
+                    grayscale=grayscale,
+                    output_folder=output_folder,
+                    fmt="ppm",
+                    paths_only=True,
+                    thread_count=min(thread_count, window_end - window_start + 1),
+                )
+            increment("pages_rasterized", window_end - window_start + 1)
+            # pdf2image returns the files in page order. They must not be sorted by name: every poppler
+            # process writes its chunk of the window under its own random prefix
+            yield list(zip(range(window_start, window_end + 1), map(Path, image_paths)))
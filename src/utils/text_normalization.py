@@ -0,0 +1,308 @@
+"""Token-reducing cleanup of extracted text before it is sent to the LLM."""
+import hashlib
+import re
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Dict, List, Set, Tuple
+
+from .token_utils import count_tokens
+
+
+_HORIZONTAL_WHITESPACE = re.compile(r"[ \t\u00a0\u2000-\u200b]+")
+_BLANK_LINES = re.compile(r"\n{3,}")
+# "Page 3", "Page 3 of 12", "3 of 12", "- 3 -"; bare numbers are handled by _find_bare_page_numbers
+_PAGE_NUMBER_LINE = re.compile(
+    r"^(?:page\s*\d{1,4}(?:\s*(?:of|/)\s*\d{1,4})?|\d{1,4}\s+of\s+\d{1,4}|[-–—]\s*\d{1,4}\s*[-–—])$",
+    re.IGNORECASE,
+)
+_BARE_NUMBER = re.compile(r"^\d{1,4}$")
+_DIGITS = re.compile(r"\d+")
+_WORD = re.compile(r"[a-z0-9]+")
+_ALPHA_WORD = re.compile(r"[A-Za-z]{3,}")
+
+# Running headers and footers recur once per page, never on neighbouring lines
+MIN_BOILERPLATE_GAP_LINES = 5
+MAX_BOILERPLATE_LINE_LENGTH = 200
+
+# Headers and footers sit in the first or last blocks of a page. Extraction puts every element in a
+# block of its own, so the edges of a block say nothing; only the page boundaries do
+PAGE_EDGE_BLOCKS = 2
+# ...and within this many lines of the top or bottom, for pages extracted as a single block
+PAGE_EDGE_LINES = 3
+
+# Bare numbers inside a page only count as page numbers when this many in a row count up by one,
+# each at least MIN_BOILERPLATE_GAP_LINES lines after the previous (not a column of table cells)
+MIN_PAGE_NUMBER_SEQUENCE = 3
+
+# Blocks shorter than this are never treated as duplicates (e.g. "Total", "N/A")
+MIN_DEDUPE_BLOCK_CHARS = 40
+SHINGLE_WORDS = 3
+SKETCH_SIZE = 4
+
+
+@dataclass
+class NormalizationReport:
+    """What normalization removed from one document."""
+    
+    original_chars: int
+    normalized_chars: int
+    original_tokens: int
+    normalized_tokens: int
+    page_number_lines: int = 0
+    boilerplate_lines: int = 0
+    duplicate_blocks: int = 0
+    
+    @property
+    def tokens_saved(self) -> int:
+        return self.original_tokens - self.normalized_tokens
+    
+    @property
+    def savings_ratio(self) -> float:
+        return self.tokens_saved / self.original_tokens if self.original_tokens else 0.0
+
+
+def _collapse_whitespace(text: str) -> List[str]:
+    """Return the text's lines with runs of spaces collapsed and form feeds as blank lines."""
+    text = text.replace("\r\n", "\n").replace("\r", "\n").replace("\f", "\n\n")
+    return [_HORIZONTAL_WHITESPACE.sub(" ", line).strip() for line in text.split("\n")]
+
+
+def _page_edge_lines(lines: List[str]) -> List[int]:
+    """Indexes of the lines in the first and last ``PAGE_EDGE_BLOCKS`` blocks of a page.
+    
+    Only the first and last ``PAGE_EDGE_LINES`` lines of the page qualify.
+    Blocks holding nothing but a page number are skipped, so a footer above
+    the page number still counts as the last block.
+    """
+    blocks: List[List[int]] = []
+    current: List[int] = []
+    for index, line in enumerate(lines + [""]):
+        if line:
+            current.append(index)
+        elif current:
+            if not all(_PAGE_NUMBER_LINE.match(lines[i]) or _BARE_NUMBER.match(lines[i]) for i in current):
+                blocks.append(current)
+            current = []
+    content = [index for block in blocks for index in block]
+    near_edge = set(content[:PAGE_EDGE_LINES] + content[-PAGE_EDGE_LINES:])
+    edge_blocks = blocks[:PAGE_EDGE_BLOCKS] + blocks[-PAGE_EDGE_BLOCKS:]
+    return sorted({index for block in edge_blocks for index in block if index in near_edge})
+
+
+def _tracks_page(lines: List[str], page_indexes: List[int]) -> bool:
+    """Whether each line holds one number that rises with its page ("Page 3 | Fund Overview")."""
+    numbers = [_DIGITS.findall(line) for line in lines]
+    if any(len(found) != 1 for found in numbers):
+        return False
+    return len({int(found[0]) - page_index for found, page_index in zip(numbers, page_indexes)}) == 1
+
+
+def _find_boilerplate(page_lines: List[List[str]], min_repeats: int) -> Set[Tuple[int, int]]:
+    """Find the repeats of running headers and footers.
+    
+    A line qualifies when it recurs at least ``min_repeats`` times in the
+    edge blocks of pages, never on neighbouring lines, contains at least two
+    words, and either repeats verbatim or differs only by a number that rises
+    with the page. Data rows such as "Net IRR 8.1%" recur with other numbers
+    and are kept.
+    
+    Returns:
+        (page index, line index) of every occurrence but the first
+    """
+    offsets = []
+    total = 0
+    for lines in page_lines:
+        offsets.append(total)
+        total += len(lines) + 1
+    
+    occurrences: Dict[str, List[Tuple[int, int]]] = defaultdict(list)
+    for page_index, lines in enumerate(page_lines):
+        for line_index in _page_edge_lines(lines):
+            line = lines[line_index]
+            if len(line) <= MAX_BOILERPLATE_LINE_LENGTH and len(_ALPHA_WORD.findall(line)) >= 2:
+                occurrences[_DIGITS.sub("#", line.lower())].append((page_index, line_index))
+    
+    repeats = set()
+    for places in occurrences.values():
+        if len(places) < min_repeats:
+            continue
+        lines = [page_lines[page_index][line_index] for page_index, line_index in places]
+        if len({line.lower() for line in lines}) > 1 and not _tracks_page(lines, [page for page, _ in places]):
+            continue
+        positions = [offsets[page_index] + line_index for page_index, line_index in places]
+        if min(later - earlier for earlier, later in zip(positions, positions[1:])) >= MIN_BOILERPLATE_GAP_LINES:
+            repeats.update(places[1:])
+    return repeats
+
+
+def _find_bare_page_numbers(blocks: List[str], block_lines: List[int], page_edges: Set[int],
+                            find_sequences: bool = True) -> Set[int]:
+    """Find the blocks that are nothing but a page number.
+    
+    Extraction puts every element in a block of its own, so a bare number
+    may as well be a KPI callout, a year or a table cell. It only counts as
+    a page number at the first or last block of a page, or, when the page
+    boundaries are unknown, as part of a sequence of numbers counting up
+    page after page.
+    
+    Args:
+        blocks: Blocks of the document in order
+        block_lines: Line number of each block in the document
+        page_edges: Indexes of the blocks that start or end a page
+        find_sequences: Also look for sequences (page boundaries are unknown)
+    
+    Returns:
+        Indexes of the page number blocks
+    """
+    numbers = [index for index, block in enumerate(blocks) if _BARE_NUMBER.match(block)]
+    page_numbers = {index for index in numbers if index in page_edges}
+    if not find_sequences:
+        return page_numbers
+    
+    run: List[int] = []
+    # A document has at least one block per page, so larger values (such as years) are not page numbers
+    for index in (index for index in numbers if int(blocks[index]) <= len(blocks)):
+        if run and not (int(blocks[index]) == int(blocks[run[-1]]) + 1
+                        and block_lines[index] - block_lines[run[-1]] >= MIN_BOILERPLATE_GAP_LINES):
+            if len(run) >= MIN_PAGE_NUMBER_SEQUENCE:
+                page_numbers.update(run)
+            run = []
+        run.append(index)
+    if len(run) >= MIN_PAGE_NUMBER_SEQUENCE:
+        page_numbers.update(run)
+    return page_numbers
+
+
+def _stable_hash(text: str) -> int:
+    # Unlike hash(), the same in every process regardless of PYTHONHASHSEED
+    return int.from_bytes(hashlib.blake2b(text.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+def _shingles(words: List[str]) -> Set[int]:
+    if len(words) < SHINGLE_WORDS:
+        return {_stable_hash(" ".join(words))}
+    return {_stable_hash(" ".join(words[i:i + SHINGLE_WORDS])) for i in range(len(words) - SHINGLE_WORDS + 1)}
+
+
+def _find_duplicate_blocks(blocks: List[str], similarity: float) -> Set[int]:
+    """Find blocks that repeat an earlier block exactly or nearly (word-shingle Jaccard similarity).
+    
+    Candidates are found through a bottom-k sketch of each block's shingles,
+    so only blocks sharing a sketch value are compared.
+    
+    Returns:
+        Indexes of the duplicate blocks
+    """
+    kept_shingles: List[Set[int]] = []
+    sketch_index: Dict[int, List[int]] = defaultdict(list)
+    exact: Set[str] = set()
+    duplicates = set()
+    
+    for block_index, block in enumerate(blocks):
+        if len(block) < MIN_DEDUPE_BLOCK_CHARS:
+            continue
+        
+        words = _WORD.findall(block.lower())
+        normalized = " ".join(words)
+        if normalized in exact:
+            duplicates.add(block_index)
+            continue
+        
+        shingles = _shingles(words)
+        sketch = sorted(shingles)[:SKETCH_SIZE]
+        candidates = {index for value in sketch for index in sketch_index.get(value, ())}
+        if any(len(shingles & kept_shingles[index]) / len(shingles | kept_shingles[index]) >= similarity
+               for index in candidates):
+            duplicates.add(block_index)
+            continue
+        
+        exact.add(normalized)
+        for value in sketch:
+            sketch_index[value].append(len(kept_shingles))
+        kept_shingles.append(shingles)
+    return duplicates
+
+
+def normalize_text(text: str, min_repeats: int = 3, similarity: float = 0.9) -> Tuple[str, NormalizationReport]:
+    """Strip boilerplate and redundancy from extracted text.
+    
+    Removes page numbers, keeps only the first occurrence of running
+    headers, footers and repeated disclaimers, collapses whitespace and
+    drops blocks that (nearly) repeat an earlier block, such as the same
+    page extracted by both unstructured and OCR.
+    
+    Args:
+        text: Extracted document text
+        min_repeats: Occurrences after which a line counts as boilerplate
+        similarity: Jaccard similarity above which a block is a duplicate (1 = exact only)
+    
+    Returns:
+        Tuple of (normalized text, report of what was removed)
+    """
+    # Form feeds separate pages, which is where running headers and footers are looked for
+    pages, report = normalize_pages(text.split("\f"), min_repeats, similarity)
+    return "\n\n".join(page for page in pages if page), report
+
+
+def normalize_pages(pages: List[str], min_repeats: int = 3,
+                    similarity: float = 0.9) -> Tuple[List[str], NormalizationReport]:
+    """Normalize a document given as separate pages, keeping the page boundaries.
+    
+    Works like ``normalize_text`` on the whole document: boilerplate is
+    detected across all pages, and blocks are compared with the blocks of
+    every earlier page.
+    
+    Returns:
+        Tuple of (normalized text of each page, possibly empty, report of what was removed)
+    """
+    page_lines = [_collapse_whitespace(page) for page in pages]
+    boilerplate = _find_boilerplate(page_lines, min_repeats) if min_repeats > 1 else set()
+    
+    page_number_lines = boilerplate_lines = 0
+    blocks: List[str] = []
+    block_pages: List[int] = []
+    block_lines: List[int] = []
+    page_edges: Set[int] = set()
+    line_offset = 0
+    for page_index, lines in enumerate(page_lines):
+        kept_lines = []
+        for line_index, line in enumerate(lines):
+            if line and _PAGE_NUMBER_LINE.match(line):
+                page_number_lines += 1
+                continue
+            if (page_index, line_index) in boilerplate:
+                boilerplate_lines += 1
+                continue
+            kept_lines.append(line)
+        
+        first_block = len(blocks)
+        for block in _BLANK_LINES.sub("\n\n", "\n".join(kept_lines)).split("\n\n"):
+            if block.strip():
+                blocks.append(block.strip())
+                block_pages.append(page_index)
+                block_lines.append(line_offset)
+            line_offset += block.count("\n") + 2
+        if len(blocks) > first_block:
+            page_edges.update((first_block, len(blocks) - 1))
+    
+    page_numbers = _find_bare_page_numbers(blocks, block_lines, page_edges, find_sequences=len(pages) == 1)
+    page_number_lines += len(page_numbers)
+    duplicates = _find_duplicate_blocks(blocks, similarity)
+    page_blocks: List[List[str]] = [[] for _ in pages]
+    for index, (block, page_index) in enumerate(zip(blocks, block_pages)):
+        if index not in duplicates and index not in page_numbers:
+            page_blocks[page_index].append(block)
+    normalized_pages = ["\n\n".join(kept) for kept in page_blocks]
+    
+    original = "\n\n".join(pages)
+    normalized = "\n\n".join(page for page in normalized_pages if page)
+    report = NormalizationReport(
+        original_chars=len(original),
+        normalized_chars=len(normalized),
+        original_tokens=count_tokens(original),
+        normalized_tokens=count_tokens(normalized),
+        page_number_lines=page_number_lines,
+        boilerplate_lines=boilerplate_lines,
+        duplicate_blocks=len(duplicates),
+    )
+    return normalized_pages, report
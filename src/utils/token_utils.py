@@ -0,0 +1,102 @@
+"""Token counting and token-aware text splitting."""
+from typing import List
+
+
+# Rough characters-per-token ratio for English text with GPT tokenizers
+CHARS_PER_TOKEN = 4
+
+_encoding = None
+_encoding_loaded = False
+
+
+def _get_encoding():
+    """Return the shared tiktoken encoding, or None if tiktoken is unavailable.
+    
+    tiktoken is imported on first use so that importing this module stays cheap.
+    """
+    global _encoding, _encoding_loaded
+    if not _encoding_loaded:
+        _encoding_loaded = True
+        try:
+            import tiktoken
+        except ImportError:  # tiktoken is optional; fall back to a character-based estimate
+            return None
+        try:
+            _encoding = tiktoken.get_encoding("o200k_base")
+        except Exception:
+            _encoding = tiktoken.get_encoding("cl100k_base")
+    return _encoding
+
+
+def count_tokens(text: str) -> int:
+    """Count the tokens in text, estimating from its length if tiktoken is not installed."""
+    encoding = _get_encoding()
+    if encoding is not None:
+        return len(encoding.encode(text, disallowed_special=()))
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def _split_oversized_block(block: str, max_tokens: int) -> List[str]:
+    """Split a single block that exceeds the budget on line boundaries, then by length."""
+    pieces = []
+    current = []
+    current_tokens = 0
+    
+    for line in block.split("\n"):
+        line_tokens = count_tokens(line)
+        if line_tokens > max_tokens:
+            # A single huge line (e.g. a flattened table): cut it by characters
+            step = max_tokens * CHARS_PER_TOKEN
+            pieces.extend(line[i:i + step] for i in range(0, len(line), step))
+            continue
+        
+        if current and current_tokens + line_tokens > max_tokens:
+            pieces.append("\n".join(current))
+            current, current_tokens = [], 0
+        current.append(line)
+        current_tokens += line_tokens
+    
+    if current:
+        pieces.append("\n".join(current))
+    return pieces
+
+
+def split_text_into_chunks(text: str, max_tokens: int) -> List[str]:
+    """Split text into chunks of at most ``max_tokens`` tokens.
+    
+    Extractors separate elements and pages with blank lines, so chunks are
+    packed from whole blank-line separated blocks. A block larger than the
+    budget on its own is split on line boundaries.
+    
+    Args:
+        text: Text to split
+        max_tokens: Token budget per chunk
+    
+    Returns:
+        Chunks in document order
+    """
+    chunks = []
+    current = []
+    current_tokens = 0
+    
+    for block in text.split("\n\n"):
+        if not block.strip():
+            continue
+        
+        block_tokens = count_tokens(block)
+        if block_tokens > max_tokens:
+            if current:
+                chunks.append("\n\n".join(current))
+                current, current_tokens = [], 0
+            chunks.extend(_split_oversized_block(block, max_tokens))
+            continue
+        
+        if current and current_tokens + block_tokens > max_tokens:
+            chunks.append("\n\n".join(current))
+            current, current_tokens = [], 0
+        current.append(block)
+        current_tokens += block_tokens
+    
+    if current:
+        chunks.append("\n\n".join(current))
+    return chunks
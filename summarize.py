@@ -5,7 +5,7 @@ from openai import AzureOpenAI
 from unstructured.partition.auto import partition
 
 # OCR imports
-from pdf2image import convert_from_path
+from pdf2image import convert_from_path, pdfinfo_from_path
 import pytesseract
 from PIL import Image
 
@@ -20,17 +20,27 @@ print("AZURE_OPENAI_ENDPOINT:", os.getenv("AZURE_OPENAI_ENDPOINT"))
 print("AZURE_OPENAI_DEPLOYMENT:", os.getenv("AZURE_OPENAI_DEPLOYMENT"))
 print("---------------------------------------------------\n")
 
-def extract_text_with_ocr(file_path):
+def extract_text_with_ocr(file_path, dpi=200, window_size=4):
     """
     Extracts text from each page of a PDF using OCR.
+
+    Pages are rendered a few at a time and released right after OCR,
+    so memory use does not grow with the number of pages.
     """
     print(f"Running OCR on '{file_path}'...")
-    images = convert_from_path(file_path)
+    total_pages = int(pdfinfo_from_path(file_path)["Pages"])
     ocr_text = []
-    for i, img in enumerate(images, start=1):
-        print(f"OCR on page {i}/{len(images)}...")
-        text = pytesseract.image_to_string(img)
-        ocr_text.append(text)
+    for first_page in range(1, total_pages + 1, window_size):
+        last_page = min(first_page + window_size - 1, total_pages)
+        images = convert_from_path(
+            file_path, dpi=dpi, first_page=first_page, last_page=last_page, grayscale=True
+        )
+        for i, img in enumerate(images, start=first_page):
+            print(f"OCR on page {i}/{total_pages}...")
+            text = pytesseract.image_to_string(img)
+            ocr_text.append(text)
+            img.close()
+        del images
     return "\n\n".join(ocr_text)
 
 def extract_text_from_file(file_path):